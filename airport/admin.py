@@ -12,8 +12,11 @@ from airport.models import (
     Airplane,
     Route,
     Flight,
+    FlightSchedule,
     Order,
     Ticket,
+    SeatHold,
+    HeldSeat,
 )
 
 
@@ -37,5 +40,17 @@ admin.site.register(Facility)
 admin.site.register(Airplane)
 admin.site.register(Route)
 admin.site.register(Flight)
+admin.site.register(FlightSchedule)
 # admin.site.register(Order)
 admin.site.register(Ticket)
+
+
+class HeldSeatInline(admin.TabularInline):
+    model = HeldSeat
+    extra = 1
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    inlines = (HeldSeatInline,)
+    list_display = ("id", "flight", "user", "expires_at")
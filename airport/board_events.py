@@ -0,0 +1,109 @@
+import asyncio
+import json
+import threading
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# events kept for a slow client, after that it gets "reset"
+# (the board is to be loaded again)
+MAX_QUEUED_EVENTS = 100
+RESET_EVENT = {"event": "reset"}
+# a comment line is sent to idle streams (proxies close silent ones)
+KEEP_ALIVE_SECONDS = 15
+# reconnection delay of EventSource clients
+RETRY_MILLISECONDS = 3000
+
+
+class BoardEvents:
+    """
+    In-process publish/subscribe of flight changes by airport: a
+    subscriber is a queue of an event loop (a stream of a board),
+    events are published from any thread (signals of saves) and
+    delivered in the loop of the subscriber. Subscribers see changes
+    made by the same process only (ex. one ASGI worker)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    def subscribe(self, airport_id: int) -> asyncio.Queue:
+        """Queue of events of the airport, called in the event loop"""
+        queue = asyncio.Queue(MAX_QUEUED_EVENTS)
+        with self._lock:
+            self._subscribers.setdefault(airport_id, {})[queue] = (
+                asyncio.get_running_loop()
+            )
+        return queue
+
+    def unsubscribe(self, airport_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(airport_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(airport_id, None)
+
+    def subscribers(self, airport_id: int) -> int:
+        with self._lock:
+            return len(self._subscribers.get(airport_id, ()))
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, event: dict) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESET_EVENT)
+
+    def publish(self, airport_ids, event: dict) -> None:
+        """Send the event to subscribers of the airports (no waiting)"""
+        with self._lock:
+            targets = [
+                (queue, loop)
+                for airport_id in set(airport_ids)
+                for queue, loop in self._subscribers.get(
+                    airport_id, {}
+                ).items()
+            ]
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # the loop is closed, its stream is gone
+                pass
+
+
+board_events = BoardEvents()
+
+
+def _message(event: dict) -> str:
+    data = json.dumps(event.get("data", {}), cls=DjangoJSONEncoder)
+    return f"event: {event['event']}\ndata: {data}\n\n"
+
+
+async def event_stream(airport_id: int, until: float):
+    """
+    Server-Sent Events of the airport up to the until timestamp (expiry
+    of the token, the client reconnects with a new one): idle streams
+    wait on their queue & get a keep-alive comment now and then
+    """
+    queue = board_events.subscribe(airport_id)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            remaining = until - time.time()
+            if remaining <= 0:
+                yield _message({"event": "expired"})
+                return
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), min(KEEP_ALIVE_SECONDS, remaining)
+                )
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _message(event)
+    finally:
+        board_events.unsubscribe(airport_id, queue)
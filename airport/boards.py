@@ -0,0 +1,177 @@
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from airport.models import Airport, Flight
+
+# direction -> (airport of the board, local date, time, other airport)
+BOARD_DIRECTIONS = {
+    "departures": ("source", "departure_local_date", "departure_time",
+                   "destination"),
+    "arrivals": ("destination", "arrival_local_date", "arrival_time",
+                 "source"),
+}
+# next flights shown on a board & kept in its cache (flights departed
+# or arrived since the cache was built are dropped when it is read)
+BOARD_SIZE = 20
+BOARD_CACHE_ROWS = 2 * BOARD_SIZE
+
+
+def board_rows(airport_id: int, direction: str, day: date):
+    """
+    Departures or arrivals of the airport on its local day, one query
+    of values: routes of the airport are found first and their flights
+    by the index (route, local date), no time zone arithmetic
+    """
+    side, date_field, time_field, other = BOARD_DIRECTIONS[direction]
+    return Flight.objects.filter(**{
+        f"route__{side}_id": airport_id,
+        date_field: day,
+    }).order_by(time_field, "id").values(
+        "id",
+        "name",
+        "departure_time",
+        "arrival_time",
+        "is_completed",
+        airport=F(f"route__{other}__cod_iata"),
+        city=F(f"route__{other}__closest_big_city__name"),
+        airline_company=F("airplane__airline_company__name"),
+    )
+
+
+def _upcoming_rows(flights, direction: str):
+    """Rows of not completed flights with UTC time of the board"""
+    _, _, time_field, other = BOARD_DIRECTIONS[direction]
+    return flights.filter(is_completed=False).values(
+        "id",
+        "name",
+        "departure_time",
+        "arrival_time",
+        "is_completed",
+        airport=F(f"route__{other}__cod_iata"),
+        city=F(f"route__{other}__closest_big_city__name"),
+        airline_company=F("airplane__airline_company__name"),
+        time_utc=F(f"{time_field}_utc"),
+    )
+
+
+def _sort_key(row) -> tuple:
+    return row["time_utc"], row["id"]
+
+
+class AirportBoards:
+    """
+    Next flights of airports (departures & arrivals) kept in the cache
+    for BOARD_CACHE_SECONDS: a board is built by one query and updated
+    row by row when a flight of the airport is saved or deleted.
+    Changes of other processes are seen with a shared cache (see CACHES);
+    names of airports, cities & companies are refreshed by the timeout
+    """
+
+    @staticmethod
+    def _key(airport_id: int, direction: str) -> str:
+        return f"airport:board:{airport_id}:{direction}"
+
+    def _set(self, airport_id: int, direction: str, board: dict) -> None:
+        cache.set(
+            self._key(airport_id, direction),
+            board,
+            settings.BOARD_CACHE_SECONDS,
+        )
+
+    def _build(self, airport_id: int, direction: str, moment) -> dict:
+        side, _, time_field, _ = BOARD_DIRECTIONS[direction]
+        rows = list(
+            _upcoming_rows(
+                Flight.objects.filter(**{
+                    f"route__{side}_id": airport_id,
+                    f"{time_field}_utc__gte": moment,
+                }),
+                direction,
+            ).order_by(f"{time_field}_utc", "id")[:BOARD_CACHE_ROWS]
+        )
+        return {
+            "airport": None,
+            "rows": rows,
+            # all upcoming flights are in rows
+            "complete": len(rows) < BOARD_CACHE_ROWS,
+        }
+
+    def next_flights(self, airport_id: int, direction: str):
+        """
+        (code IATA of the airport, rows of its next flights), no
+        queries if the board is cached; None if there is no airport
+        """
+        moment = timezone.now()
+        board = cache.get(self._key(airport_id, direction))
+        if board is not None:
+            rows = [row for row in board["rows"] if row["time_utc"] >= moment]
+            if len(rows) >= BOARD_SIZE or board["complete"]:
+                return board["airport"], rows[:BOARD_SIZE]
+
+        cod_iata = Airport.objects.filter(id=airport_id).values_list(
+            "cod_iata", flat=True
+        ).first()
+        if cod_iata is None:
+            return None
+        board = self._build(airport_id, direction, moment)
+        board["airport"] = cod_iata
+        self._set(airport_id, direction, board)
+        return cod_iata, board["rows"][:BOARD_SIZE]
+
+    def _cached_boards(self, airport_ids) -> dict:
+        keys = {
+            self._key(airport_id, direction): (airport_id, direction)
+            for airport_id in airport_ids
+            for direction in BOARD_DIRECTIONS
+        }
+        return {
+            keys[key]: board for key, board in cache.get_many(keys).items()
+        }
+
+    def flight_changed(self, flight_id: int, airport_ids) -> None:
+        """
+        Update cached boards of the airports (of the route of the flight
+        before & after a save) with the flight as it is in the database
+        now (removed if deleted, completed or moved)
+        """
+        moment = timezone.now()
+        for (airport_id, direction), board in self._cached_boards(
+                airport_ids
+        ).items():
+            side, _, time_field, _ = BOARD_DIRECTIONS[direction]
+            rows = [row for row in board["rows"] if row["id"] != flight_id]
+            for row in _upcoming_rows(
+                    Flight.objects.filter(**{
+                        "id": flight_id,
+                        f"route__{side}_id": airport_id,
+                        f"{time_field}_utc__gte": moment,
+                    }),
+                    direction,
+            ):
+                # a flight after the last row of an incomplete board
+                # may have unknown flights before it
+                if board["complete"] or (
+                        rows and _sort_key(row) <= _sort_key(rows[-1])
+                ):
+                    rows.append(row)
+                    rows.sort(key=_sort_key)
+            board["complete"] = (
+                board["complete"] and len(rows) <= BOARD_CACHE_ROWS
+            )
+            board["rows"] = rows[:BOARD_CACHE_ROWS]
+            self._set(airport_id, direction, board)
+
+    def clear(self, airport_ids) -> None:
+        """Drop boards of the airports (times of many flights changed)"""
+        cache.delete_many([
+            self._key(airport_id, direction)
+            for airport_id in airport_ids
+            for direction in BOARD_DIRECTIONS
+        ])
+
+
+airport_boards = AirportBoards()
@@ -0,0 +1,238 @@
+from datetime import timedelta
+
+from django.db import transaction, IntegrityError, OperationalError
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from airport.models import Flight, Ticket, Order, SeatHold, HeldSeat
+
+BOOKING_ATTEMPTS = 3
+
+# serialization_failure, deadlock_detected
+RETRYABLE_PGCODES = ("40001", "40P01")
+
+
+class SeatsUnavailable(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some seats are booked or held by another customer."
+    default_code = "seats_unavailable"
+
+    def __init__(self, seats) -> None:
+        super().__init__()
+        # keep row & flight numeric in the response body
+        self.detail = {
+            "detail": self.default_detail,
+            "seats": [
+                {"flight": flight_id, "row": row, "seat": seat}
+                for flight_id, row, seat in sorted(seats)
+            ],
+        }
+
+
+def check_seats(tickets_data: list, user=None) -> None:
+    """
+    Validate all tickets of an order in one pass: every seat must exist
+    on its airplane, be requested once and not be taken already
+    (one query for booked & one for held seats of the whole order)
+    """
+    errors = [{} for _ in tickets_data]
+    requested = {}
+    for position, ticket_data in enumerate(tickets_data):
+        flight = ticket_data["flight"]
+        row, seat = ticket_data["row"], ticket_data["seat"]
+        try:
+            Ticket.validate_ticket(
+                row,
+                flight.airplane.rows,
+                seat,
+                flight.airplane.seats_in_row,
+                ValidationError,
+            )
+        except ValidationError as error:
+            errors[position] = error.detail
+            continue
+        key = (flight.id, row, seat)
+        if key in requested:
+            errors[position] = {
+                "seat": [f"seat {row}{seat} is requested twice"]
+            }
+            continue
+        requested[key] = position
+
+    for key in held_seats(requested, user):
+        errors[requested[key]] = {
+            "seat": [f"seat {key[1]}{key[2]} is held by another customer"]
+        }
+    for key in taken_seats(requested):
+        errors[requested[key]] = {
+            "seat": [f"seat {key[1]}{key[2]} is already taken"]
+        }
+
+    if any(errors):
+        raise ValidationError(errors)
+
+
+def _filter_seats(queryset, seats):
+    flight_ids, rows, letters = (set(values) for values in zip(*seats))
+    return queryset.filter(
+        flight_id__in=flight_ids, row__in=rows, seat__in=letters
+    ).order_by()
+
+
+def taken_seats(seats) -> list:
+    """Which of (flight_id, row, seat) are already booked"""
+    if not seats:
+        return []
+    booked = _filter_seats(Ticket.objects, seats).values_list(
+        "flight_id", "row", "seat"
+    )
+    return [key for key in booked if key in seats]
+
+
+def held_seats(seats, user=None) -> list:
+    """Which of (flight_id, row, seat) are held now by other customers"""
+    if not seats:
+        return []
+    held = _filter_seats(HeldSeat.objects, seats).filter(
+        hold__expires_at__gt=timezone.now()
+    )
+    if user is not None:
+        held = held.exclude(hold__user=user)
+    return [
+        key for key in held.values_list("flight_id", "row", "seat")
+        if key in seats
+    ]
+
+
+def create_tickets(order: Order, tickets_data: list) -> list:
+    """
+    Write all tickets of an order with one INSERT,
+    seats must be checked beforehand (see check_seats)
+    """
+    return Ticket.objects.bulk_create(
+        [Ticket(order=order, **ticket_data) for ticket_data in tickets_data]
+    )
+
+
+def _locking_flights(flight_ids, write):
+    """
+    Run write() in a transaction holding row locks of the flights
+    (SELECT ... FOR UPDATE, always in id order, so concurrent bookings
+    cannot deadlock each other). Transaction conflicts are retried
+    """
+    for attempt in range(1, BOOKING_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                list(
+                    Flight.objects.select_for_update()
+                    .filter(id__in=sorted(flight_ids))
+                    .order_by("id")
+                    .values_list("id", flat=True)
+                )
+                return write()
+        except IntegrityError:
+            # seat inserted without the flight lock (ex. admin panel),
+            # next attempt reports it as unavailable
+            if attempt == BOOKING_ATTEMPTS:
+                raise
+        except OperationalError as error:
+            pgcode = getattr(error.__cause__, "pgcode", None)
+            if attempt == BOOKING_ATTEMPTS or pgcode not in RETRYABLE_PGCODES:
+                raise
+
+
+def book_order(tickets_data: list, **order_data) -> Order:
+    """
+    Create order with tickets, safe under concurrent booking of the same
+    flights: seats are re-checked under the flight locks, seats taken
+    meanwhile by another customer raise SeatsUnavailable.
+    Seats held by the customer are booked and released from the hold
+    """
+    user = order_data.get("user")
+    seats = {
+        (data["flight"].id, data["row"], data["seat"])
+        for data in tickets_data
+    }
+
+    def write():
+        lost_seats = taken_seats(seats) + held_seats(seats, user)
+        if lost_seats:
+            raise SeatsUnavailable(lost_seats)
+        order = Order.objects.create(**order_data)
+        create_tickets(order, tickets_data)
+        if user is not None:
+            _release_seats(user, seats)
+        return order
+
+    return _locking_flights({flight_id for flight_id, *_ in seats}, write)
+
+
+def _release_seats(user, seats) -> None:
+    held = _filter_seats(HeldSeat.objects, seats).filter(hold__user=user)
+    HeldSeat.objects.filter(id__in=[
+        held_id for held_id, *key in held.values_list(
+            "id", "flight_id", "row", "seat"
+        )
+        if tuple(key) in seats
+    ]).delete()
+
+
+def hold_seats(user, flight: Flight, seats: list, minutes: int) -> SeatHold:
+    """
+    Hold seats [(row, seat), ...] of a flight for the customer during
+    some minutes, expired holds of the flight are purged first
+    """
+    keys = {(flight.id, row, seat) for row, seat in seats}
+
+    def write():
+        SeatHold.objects.filter(
+            flight_id=flight.id, expires_at__lte=timezone.now()
+        ).delete()
+        unavailable = taken_seats(keys) + held_seats(keys)
+        if unavailable:
+            raise SeatsUnavailable(unavailable)
+        hold = SeatHold.objects.create(
+            flight=flight,
+            user=user,
+            expires_at=timezone.now() + timedelta(minutes=minutes),
+        )
+        HeldSeat.objects.bulk_create([
+            HeldSeat(hold=hold, flight=flight, row=row, seat=seat)
+            for row, seat in seats
+        ])
+        return hold
+
+    return _locking_flights({flight.id}, write)
+
+
+def confirm_hold(hold: SeatHold) -> Order:
+    """
+    Convert hold into order: an expired hold is still booked
+    if nobody has taken its seats meanwhile
+    """
+    tickets_data = [
+        {"flight": hold.flight, "row": row, "seat": seat}
+        for row, seat in hold.seats.values_list("row", "seat")
+    ]
+    if not tickets_data:
+        raise ValidationError({"seats": "hold has no seats left"})
+    with transaction.atomic():
+        order = book_order(tickets_data, user=hold.user)
+        hold.delete()
+    return order
+
+
+def release_expired_holds(batch_size: int = 1000) -> int:
+    """Delete expired holds (with their seats) in batches"""
+    released = 0
+    while True:
+        expired_ids = list(
+            SeatHold.objects.filter(expires_at__lte=timezone.now())
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not expired_ids:
+            return released
+        SeatHold.objects.filter(id__in=expired_ids).delete()
+        released += len(expired_ids)
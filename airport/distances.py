@@ -0,0 +1,77 @@
+import threading
+import time as time_module
+
+import numpy as np
+from geographiclib.geodesic import Geodesic
+
+# mean Earth radius (IUGG), haversine error against WGS84 is below 0.5%
+EARTH_RADIUS_KM = 6371.0088
+
+# pairs of airports kept by the Route.save cache
+PAIR_CACHE_SIZE = 100_000
+# coordinates changed by other processes are seen after it
+PAIR_CACHE_TTL = 300
+
+
+def haversine_km(latitude1, longitude1, latitude2, longitude2) -> np.ndarray:
+    """Great-circle distances, all arguments are arrays of degrees"""
+    latitude1, longitude1, latitude2, longitude2 = (
+        np.radians(np.asarray(values, dtype=np.float64))
+        for values in (latitude1, longitude1, latitude2, longitude2)
+    )
+    a = (
+        np.sin((latitude2 - latitude1) / 2) ** 2
+        + np.cos(latitude1) * np.cos(latitude2)
+        * np.sin((longitude2 - longitude1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def geodesic_km(latitude1, longitude1, latitude2, longitude2) -> np.ndarray:
+    """Distances on WGS84 ellipsoid (precise, one pair at a time)"""
+    return np.array([
+        Geodesic.WGS84.Inverse(*coordinates, Geodesic.DISTANCE)["s12"] / 1000
+        for coordinates in zip(latitude1, longitude1, latitude2, longitude2)
+    ])
+
+
+class PairDistanceCache:
+    """
+    Distances (km) between airports by (source_id, destination_id),
+    coordinates of missing pairs are fetched by load(source_id,
+    destination_id) -> (latitude1, longitude1, latitude2, longitude2).
+    Dropped by Airport signals and every PAIR_CACHE_TTL seconds
+    """
+
+    def __init__(self, max_size: int = PAIR_CACHE_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._distances = {}
+        self._loaded_at = time_module.monotonic()
+        self.max_size = max_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._distances.clear()
+            self._loaded_at = time_module.monotonic()
+
+    def get(self, source_id: int, destination_id: int, load):
+        key = (source_id, destination_id)
+        with self._lock:
+            if time_module.monotonic() - self._loaded_at >= PAIR_CACHE_TTL:
+                self._distances.clear()
+                self._loaded_at = time_module.monotonic()
+            if key in self._distances:
+                return self._distances[key]
+        coordinates = load(source_id, destination_id)
+        distance = None
+        if coordinates is not None and None not in coordinates:
+            distance = round(float(geodesic_km(*zip(coordinates))[0]))
+        with self._lock:
+            if len(self._distances) >= self.max_size:
+                self._distances.clear()
+            self._distances[key] = distance
+            self._distances[key[::-1]] = distance
+        return distance
+
+
+airport_distances = PairDistanceCache()
@@ -0,0 +1,152 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+
+from airport.versions import model_versions
+
+
+# Conditional GET of list & retrieve of a viewset: the ETag is a hash
+# of the URL, Accept header & versions of etag_models (the model and
+# models shown with it, ex. country of city), answer to a matching
+# If-None-Match is 304 without database queries & serializers.
+# With cache_responses (and RESPONSE_CACHE_SECONDS setting) rendered
+# JSON bodies are kept in the cache by ETag: a save/delete of any of
+# etag_models changes the version, so old bodies are not used anymore
+# (and expire).
+# Responses of stateless_actions do not depend on the user, their token
+# is verified without loading the user too.
+# (a comment, not a docstring: docstrings of views go to the API docs)
+class ConditionalGetMixin:
+    etag_models = ()
+    etag_actions = ("list", "retrieve")
+    cache_responses = False
+    stateless_actions = ()
+
+    def get_etag(self):
+        """ETag of the current data (None if not a conditional action)"""
+        if not hasattr(self, "_etag"):
+            self._etag = None
+            request = getattr(self, "request", None)
+            action_map = getattr(self, "action_map", None) or {}
+            if (
+                    request is not None
+                    and self.etag_models
+                    and action_map.get(request.method.lower())
+                    in self.etag_actions
+            ):
+                # versions are read before the data, a change in between
+                # gives a new ETag next time
+                parts = [
+                    request.build_absolute_uri(),
+                    request.headers.get("Accept", ""),
+                    *map(str, model_versions(self.etag_models)),
+                ]
+                self._etag = quote_etag(
+                    hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+                )
+        return self._etag
+
+    def etag_matches(self) -> bool:
+        etag = self.get_etag()
+        if etag is None:
+            return False
+        etags = parse_etags(self.request.headers.get("If-None-Match", ""))
+        return etag in etags or "*" in etags
+
+    def _response_cache_key(self):
+        etag = self.get_etag()
+        if (
+                etag is None
+                or not self.cache_responses
+                or not settings.RESPONSE_CACHE_SECONDS
+        ):
+            return None
+        digest = etag.strip('"')
+        return f"airport:response:{digest}"
+
+    def get_cached_response(self):
+        """(content, content type) of the rendered response or None"""
+        if not hasattr(self, "_cached_response"):
+            key = self._response_cache_key()
+            self._cached_response = cache.get(key) if key else None
+        return self._cached_response
+
+    def _is_stateless(self) -> bool:
+        request = getattr(self, "request", None)
+        action_map = getattr(self, "action_map", None) or {}
+        return (
+            request is not None
+            and action_map.get(request.method.lower())
+            in self.stateless_actions
+        )
+
+    def get_authenticators(self):
+        authenticators = super().get_authenticators()
+        if (
+                not self._is_stateless()
+                and not self.etag_matches()
+                and self.get_cached_response() is None
+        ):
+            return authenticators
+        # the token is verified without loading the user
+        return [
+            JWTStatelessUserAuthentication()
+            if type(authenticator) is JWTAuthentication
+            else authenticator
+            for authenticator in authenticators
+        ]
+
+    def _cache_response(self, request, response) -> None:
+        """Rendered JSON (other renderers may show the user) is cached"""
+        renderer = request.accepted_renderer
+        if renderer.format != "json":
+            return
+        content = renderer.render(
+            response.data,
+            request.accepted_media_type,
+            self.get_renderer_context(),
+        )
+        content_type = request.accepted_media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        cache.set(
+            self._response_cache_key(),
+            (content, content_type),
+            settings.RESPONSE_CACHE_SECONDS,
+        )
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        etag = self.get_etag()
+        if self.etag_matches():
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        cached = self.get_cached_response()
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+        else:
+            response = handler(request, *args, **kwargs)
+            if (
+                    response.status_code == status.HTTP_200_OK
+                    and self._response_cache_key()
+            ):
+                self._cache_response(request, response)
+        if response.status_code == status.HTTP_200_OK and etag:
+            response["ETag"] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
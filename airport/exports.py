@@ -0,0 +1,78 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# rows fetched from the database at once (server-side cursor on PostgreSQL)
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_OUTPUTS = ("ndjson", "csv")
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# column -> lookup of values(), one row per flight (no crew, no joins
+# multiplying rows)
+FLIGHT_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "airline_company": "airplane__airline_company__name",
+    "airplane": "airplane__name",
+    "route": "route_id",
+    "source": "route__source__cod_iata",
+    "destination": "route__destination__cod_iata",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+    "departure_time_utc": "departure_time_utc",
+    "arrival_time_utc": "arrival_time_utc",
+    "is_completed": "is_completed",
+}
+
+
+class _Echo:
+    """File-like object of csv.writer returning the written line"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+_encoder = DjangoJSONEncoder()
+
+
+def _json_value(value):
+    """Datetimes as in API responses (ISO 8601, "Z" for UTC)"""
+    if hasattr(value, "isoformat"):
+        return _encoder.default(value)
+    return value
+
+
+def export_rows(queryset, columns: dict, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Tuples of the columns, fetched with values_list() in chunks:
+    no model instances & serializers, memory does not grow with rows
+    """
+    return queryset.values_list(*columns.values()).iterator(
+        chunk_size=chunk_size
+    )
+
+
+def ndjson_lines(rows, columns: dict):
+    names = list(columns)
+    for row in rows:
+        yield json.dumps(
+            dict(zip(names, map(_json_value, row)))
+        ) + "\n"
+
+
+def csv_lines(rows, columns: dict):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(list(columns))
+    for row in rows:
+        yield writer.writerow(map(_json_value, row))
+
+
+def export_lines(output: str, rows, columns: dict):
+    """Lines of the output ("ndjson" or "csv") for StreamingHttpResponse"""
+    if output == "csv":
+        return csv_lines(rows, columns)
+    return ndjson_lines(rows, columns)
@@ -0,0 +1,94 @@
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import connections
+from django.db.models import (
+    DurationField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Value,
+)
+from django.db.models.functions import Concat
+from rest_framework import serializers
+
+from airport.models import Crew, format_duration
+
+# fields of FlightListSerializer -> expressions of values(),
+# plain model fields are selected by name
+FLIGHT_ROW_EXPRESSIONS = {
+    "airline_company": F("airplane__airline_company__name"),
+    "source": F("route__source__closest_big_city__name"),
+    "destination": F("route__destination__closest_big_city__name"),
+    "airplane_name": F("airplane__name"),
+    "duration": ExpressionWrapper(
+        F("arrival_time_utc") - F("departure_time_utc"),
+        output_field=DurationField(),
+    ),
+    # Crew.full_name, a subquery per row: no GROUP BY of the whole
+    # list, so the page is read by the index of the ordering
+    "crew_members": ArraySubquery(
+        Crew.objects.filter(flights=OuterRef("pk")).order_by("id").values(
+            full_name=Concat(
+                "first_name",
+                Value(" "),
+                "last_name",
+                Value(": "),
+                "role__name",
+            )
+        )
+    ),
+}
+# keys of the cursor pagination, selected even if not in the response
+FLIGHT_ROW_KEYS = ("id", "is_completed", "departure_time")
+
+_datetime_field = serializers.DateTimeField()
+
+
+def flight_rows_supported(queryset) -> bool:
+    """Crew names are collected with ArraySubquery (PostgreSQL only)"""
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def _row_key(field: str) -> str:
+    # names of model fields can not be used for annotations
+    return f"row_{field}" if field in FLIGHT_ROW_EXPRESSIONS else field
+
+
+def flight_rows(queryset, fields):
+    """
+    One query of dicts with the fields of FlightListSerializer:
+    names are joined, crew names collected & duration computed
+    by the database, no model instances are created
+    """
+    plain = [
+        field for field in (*FLIGHT_ROW_KEYS, *fields)
+        if field not in FLIGHT_ROW_EXPRESSIONS
+    ]
+    return queryset.select_related(None).prefetch_related(None).values(
+        *dict.fromkeys(plain),
+        **{
+            _row_key(field): FLIGHT_ROW_EXPRESSIONS[field]
+            for field in fields
+            if field in FLIGHT_ROW_EXPRESSIONS
+        },
+    ).order_by(*dict.fromkeys((
+        *(queryset.query.order_by or queryset.model._meta.ordering), "id"
+    )))
+
+
+def flight_row_data(rows, fields) -> list:
+    """Rows of flight_rows() as FlightListSerializer represents them"""
+    data = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            value = row[_row_key(field)]
+            if field == "duration":
+                value = (
+                    format_duration(value) if value is not None
+                    else "Duration not available"
+                )
+            elif field in ("departure_time", "arrival_time"):
+                value = _datetime_field.to_representation(value)
+            item[field] = value
+        data.append(item)
+    return data
@@ -0,0 +1,115 @@
+from datetime import timezone
+
+import pytz
+from django.db.models import F, Max, Min
+from django.utils.timezone import now
+
+from airport.boards import airport_boards
+from airport.itineraries import flight_index
+from airport.models import Airport, Flight, Route
+from airport.route_planner import route_graph
+from airport.time_zones import offset_intervals
+
+# "departure_time" of flights from the airport,
+# "arrival_time" of flights to the airport
+AIRPORT_TIMES = (
+    ("departure_time", "source_id"),
+    ("arrival_time", "destination_id"),
+)
+
+
+def _recompute_times(flights, field: str, zone, batch_size: int) -> int:
+    bounds = flights.aggregate(start=Min(field), end=Max(field))
+    if bounds["start"] is None:
+        return 0
+    intervals = offset_intervals(
+        zone,
+        bounds["start"].replace(tzinfo=None),
+        bounds["end"].replace(tzinfo=None),
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(
+            flights.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return updated
+        chunk = flights.filter(id__gte=ids[0], id__lte=ids[-1])
+        for since, until, offset in intervals:
+            in_interval = chunk
+            if since is not None:
+                in_interval = in_interval.filter(**{
+                    f"{field}__gte": since.replace(tzinfo=timezone.utc)
+                })
+            if until is not None:
+                in_interval = in_interval.filter(**{
+                    f"{field}__lt": until.replace(tzinfo=timezone.utc)
+                })
+            updated += in_interval.update(**{
+                f"{field}_utc": F(field) - offset
+            })
+        last_id = ids[-1]
+
+
+def recompute_flight_times(airport_ids, batch_size: int = 5000) -> int:
+    """
+    Recompute departure_time_utc & arrival_time_utc of flights from/to
+    the airports after their time zone changed, without save():
+    flights are taken in id chunks and every chunk is updated with one
+    UPDATE per UTC offset interval of the zone (ex. summer & winter time).
+    Returns number of updated times
+    """
+    updated = 0
+    changed_route_ids = set()
+    for airport_id, name in Airport.objects.filter(
+            id__in=airport_ids
+    ).values_list("id", "time_zone__name"):
+        zone = pytz.timezone(name)
+        for field, route_field in AIRPORT_TIMES:
+            route_ids = list(
+                Route.objects.filter(**{route_field: airport_id})
+                .values_list("id", flat=True)
+            )
+            if route_ids:
+                changed_route_ids.update(route_ids)
+                updated += _recompute_times(
+                    Flight.objects.filter(route_id__in=route_ids),
+                    field,
+                    zone,
+                    batch_size,
+                )
+    if updated:
+        flight_index.clear()
+        route_graph.forget_durations(changed_route_ids)
+        airport_boards.clear(airport_ids)
+    return updated
+
+
+def complete_flights(batch_size: int = 5000) -> int:
+    """
+    Mark flights which arrived (arrival_time_utc in the past) completed,
+    ids of a batch are found by the upcoming flights index, then
+    updated by primary key (the completed history is never read)
+    """
+    moment = now()
+    completed = 0
+    while True:
+        ids = list(
+            Flight.objects.filter(
+                is_completed=False,
+                # departed before arrival, the condition of the index
+                departure_time_utc__lt=moment,
+                arrival_time_utc__lte=moment,
+            ).order_by("departure_time_utc").values_list(
+                "id", flat=True
+            )[:batch_size]
+        )
+        if not ids:
+            return completed
+        completed += Flight.objects.filter(id__in=ids).update(
+            is_completed=True
+        )
@@ -0,0 +1,356 @@
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from airport.distances import airport_distances
+from airport.flight_times import recompute_flight_times
+from airport.models import (
+    Country,
+    City,
+    AirportTimeZone,
+    Airport,
+    AirlineCompany,
+    AirplaneType,
+    Airplane,
+)
+from airport.route_planner import route_graph
+from airport.time_zones import (
+    flight_zones,
+    is_time_zone_name,
+    time_zone_name,
+)
+from airport.versions import bump_versions
+
+CHUNK_SIZE = 1000
+FORMATS = ("csv", "jsonl")
+
+# kind of data -> required columns
+KINDS = {
+    "countries": ("name",),
+    "time_zones": ("name",),
+    "cities": ("name", "country"),
+    "airports": ("cod_iata", "name", "city", "country"),
+    "airline_companies": ("name", "country"),
+    "airplanes": (
+        "name", "airline_company", "airplane_type", "rows", "seats_in_row",
+    ),
+}
+
+
+class ImportDataError(ValueError):
+    pass
+
+
+def read_rows(stream, data_format: str):
+    """Rows (dicts) of CSV with header or of JSON lines, one by one"""
+    if data_format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ImportDataError(f"line {line_number}: {error}")
+
+
+class ReferenceImporter:
+    """
+    Create or update reference data by natural keys (country name,
+    city & country names, cod_iata, ...) in chunks of rows.
+    Natural key -> id maps are loaded once per model (one query each)
+    and kept for the whole import, so rows do not need get-or-create
+    queries. Missing countries, cities, time zones & airplane types
+    are created on the way
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.updated = 0
+        self.changed_time_zone_airport_ids = set()
+        self._ids = {}
+
+    @staticmethod
+    def _country_keys():
+        return Country.objects.values_list("name", "id")
+
+    @staticmethod
+    def _time_zone_keys():
+        # the oldest one of duplicated names wins
+        return AirportTimeZone.objects.order_by("-id").values_list(
+            "name", "id"
+        )
+
+    @staticmethod
+    def _city_keys():
+        for name, country, city_id in City.objects.order_by(
+                "-id"
+        ).values_list("name", "country__name", "id"):
+            yield (name, country), city_id
+
+    @staticmethod
+    def _airplane_type_keys():
+        return AirplaneType.objects.values_list("name", "id")
+
+    @staticmethod
+    def _airline_company_keys():
+        return AirlineCompany.objects.order_by("-id").values_list(
+            "name", "id"
+        )
+
+    @staticmethod
+    def _airplane_keys():
+        for company, name, airplane_id in Airplane.objects.order_by(
+                "-id"
+        ).values_list("airline_company__name", "name", "id"):
+            yield (company, name), airplane_id
+
+    @staticmethod
+    def _airport_keys():
+        for code, airport_id, time_zone_id in Airport.objects.values_list(
+                "cod_iata", "id", "time_zone_id"
+        ):
+            yield code, (airport_id, time_zone_id)
+
+    def ids(self, name: str) -> dict:
+        if name not in self._ids:
+            self._ids[name] = dict(getattr(self, f"_{name}_keys")())
+        return self._ids[name]
+
+    def _create_missing(self, name: str, model, keys, make) -> dict:
+        """Insert rows of keys missing in the map with one query"""
+        ids = self.ids(name)
+        missing = sorted(set(keys) - ids.keys())
+        if missing:
+            instances = model.objects.bulk_create(
+                [make(key) for key in missing]
+            )
+            for key, instance in zip(missing, instances):
+                ids[key] = instance.id
+            self.created += len(missing)
+        return ids
+
+    def _countries(self, names) -> dict:
+        return self._create_missing(
+            "country", Country, names, lambda name: Country(name=name)
+        )
+
+    def _time_zones(self, names) -> dict:
+        return self._create_missing(
+            "time_zone",
+            AirportTimeZone,
+            names,
+            lambda name: AirportTimeZone(name=name),
+        )
+
+    def _cities(self, keys) -> dict:
+        country_ids = self._countries({country for _, country in keys})
+        return self._create_missing(
+            "city",
+            City,
+            keys,
+            lambda key: City(name=key[0], country_id=country_ids[key[1]]),
+        )
+
+    def _upsert(self, model, instances: list, update_fields: list) -> None:
+        """
+        Insert new & update existing (with id from the map) instances
+        with one INSERT ... ON CONFLICT (id) DO UPDATE
+        """
+        self.updated += sum(instance.id is not None for instance in instances)
+        self.created += sum(instance.id is None for instance in instances)
+        model.objects.bulk_create(
+            instances,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=update_fields,
+        )
+
+    def import_countries(self, rows: list) -> None:
+        self._countries({row["name"] for _, row in rows})
+
+    def import_time_zones(self, rows: list) -> None:
+        self._time_zones(
+            {_time_zone(line, row["name"]) for line, row in rows}
+        )
+
+    def import_cities(self, rows: list) -> None:
+        self._cities({(row["name"], row["country"]) for _, row in rows})
+
+    def import_airports(self, rows: list) -> None:
+        code_field = Airport._meta.get_field("cod_iata")
+        airports = {}
+        for line, row in rows:
+            code = row["cod_iata"].upper()
+            latitude = _float(line, row, "latitude")
+            longitude = _float(line, row, "longitude")
+            time_zone = row.get("time_zone")
+            if not time_zone and None not in (latitude, longitude):
+                time_zone = time_zone_name(latitude, longitude)
+            if not time_zone:
+                raise ImportDataError(
+                    f"row {line}: time_zone or coordinates are required"
+                )
+            _time_zone(line, time_zone)
+            try:
+                code_field.run_validators(code)
+            except ValidationError as error:
+                raise ImportDataError(f"row {line}: {error.messages[0]}")
+            airports[code] = (row, time_zone, latitude, longitude)
+
+        city_ids = self._cities(
+            {(row["city"], row["country"]) for row, *_ in airports.values()}
+        )
+        time_zone_ids = self._time_zones(
+            {time_zone for _, time_zone, *_ in airports.values()}
+        )
+        known = self.ids("airport")
+        instances = []
+        for code, (row, time_zone, latitude, longitude) in airports.items():
+            airport_id, old_time_zone_id = known.get(code, (None, None))
+            instance = Airport(
+                id=airport_id,
+                cod_iata=code,
+                name=row["name"],
+                closest_big_city_id=city_ids[(row["city"], row["country"])],
+                time_zone_id=time_zone_ids[time_zone],
+                latitude=latitude,
+                longitude=longitude,
+            )
+            if airport_id and old_time_zone_id != instance.time_zone_id:
+                self.changed_time_zone_airport_ids.add(airport_id)
+            instances.append(instance)
+
+        self._upsert(
+            Airport,
+            instances,
+            ["name", "closest_big_city", "time_zone", "latitude", "longitude"],
+        )
+        for instance in instances:
+            known[instance.cod_iata] = (instance.id, instance.time_zone_id)
+
+    def import_airline_companies(self, rows: list) -> None:
+        companies = {row["name"]: row for _, row in rows}
+        country_ids = self._countries(
+            {row["country"] for row in companies.values()}
+        )
+        known = self.ids("airline_company")
+        instances = [
+            AirlineCompany(
+                id=known.get(name),
+                name=name,
+                registration_country_id=country_ids[row["country"]],
+            )
+            for name, row in companies.items()
+        ]
+        self._upsert(AirlineCompany, instances, ["registration_country"])
+        for instance in instances:
+            known[instance.name] = instance.id
+
+    def import_airplanes(self, rows: list) -> None:
+        company_ids = self.ids("airline_company")
+        airplanes = {}
+        for line, row in rows:
+            if row["airline_company"] not in company_ids:
+                raise ImportDataError(
+                    f"row {line}: unknown airline company "
+                    f"{row['airline_company']}"
+                )
+            airplanes[(row["airline_company"], row["name"])] = (
+                row, _int(line, row, "rows"), _int(line, row, "seats_in_row")
+            )
+        type_ids = self._create_missing(
+            "airplane_type",
+            AirplaneType,
+            {row["airplane_type"] for row, *_ in airplanes.values()},
+            lambda name: AirplaneType(name=name),
+        )
+        known = self.ids("airplane")
+        instances = [
+            Airplane(
+                id=known.get(key),
+                name=key[1],
+                airline_company_id=company_ids[key[0]],
+                airplane_type_id=type_ids[row["airplane_type"]],
+                rows=rows_count,
+                seats_in_row=seats_in_row,
+            )
+            for key, (row, rows_count, seats_in_row) in airplanes.items()
+        ]
+        self._upsert(
+            Airplane, instances, ["airplane_type", "rows", "seats_in_row"]
+        )
+        for key, instance in zip(airplanes, instances):
+            known[key] = instance.id
+
+    def import_rows(self, kind: str, rows) -> None:
+        """Import rows of the kind (ex. "airports") chunk by chunk"""
+        if kind not in KINDS:
+            raise ImportDataError(f"unknown kind of data: {kind}")
+        import_chunk = getattr(self, f"import_{kind}")
+        chunk = []
+        for line, row in enumerate(rows, 1):
+            missing = [
+                column for column in KINDS[kind] if not row.get(column)
+            ]
+            if missing:
+                raise ImportDataError(
+                    f"row {line}: {', '.join(missing)} required"
+                )
+            chunk.append((line, row))
+            if len(chunk) == self.chunk_size:
+                import_chunk(chunk)
+                chunk = []
+        if chunk:
+            import_chunk(chunk)
+
+
+def _float(line: int, row: dict, column: str):
+    if row.get(column) in (None, ""):
+        return None
+    try:
+        return float(row[column])
+    except (TypeError, ValueError):
+        raise ImportDataError(f"row {line}: {column} must be a number")
+
+
+def _time_zone(line: int, name: str) -> str:
+    # flight times are computed in the zone, a bad name breaks them
+    if not is_time_zone_name(name):
+        raise ImportDataError(f"row {line}: unknown time zone {name}")
+    return name
+
+
+def _int(line: int, row: dict, column: str) -> int:
+    try:
+        return int(row[column])
+    except (TypeError, ValueError):
+        raise ImportDataError(f"row {line}: {column} must be an integer")
+
+
+def import_reference_data(
+        kind: str,
+        stream,
+        data_format: str,
+        chunk_size: int = CHUNK_SIZE,
+) -> ReferenceImporter:
+    """
+    Import CSV / JSON lines of reference data in one transaction,
+    flights of airports with a new time zone get UTC times recomputed
+    """
+    importer = ReferenceImporter(chunk_size)
+    with transaction.atomic():
+        importer.import_rows(kind, read_rows(stream, data_format))
+        if importer.changed_time_zone_airport_ids:
+            recompute_flight_times(importer.changed_time_zone_airport_ids)
+        # signals are not sent by bulk queries
+        transaction.on_commit(route_graph.clear)
+        transaction.on_commit(airport_distances.clear)
+        transaction.on_commit(flight_zones.clear)
+        transaction.on_commit(lambda: bump_versions(
+            Country, City, AirportTimeZone, Airport, AirplaneType
+        ))
+    return importer
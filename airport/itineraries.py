@@ -0,0 +1,208 @@
+import threading
+import time as time_module
+from bisect import bisect_left
+from collections import OrderedDict, namedtuple
+from datetime import datetime, date, time, timedelta, timezone
+
+from airport.models import Flight, format_duration
+from airport.route_planner import route_graph
+
+# how long a loaded day is trusted without signals from this process
+# (changes made by other processes are seen after it)
+DAY_TTL = 300
+# loaded days kept per process, least recently used ones are evicted
+# (clients may step through any dates)
+MAX_DAYS = 31
+MAX_CONNECTION = timedelta(hours=24)
+
+FlightLeg = namedtuple(
+    "FlightLeg",
+    "id name route_id source_id destination_id departure arrival",
+)
+
+
+class Itinerary:
+    def __init__(self, legs: tuple) -> None:
+        self.legs = legs
+
+    @property
+    def departure(self) -> datetime:
+        return self.legs[0].departure
+
+    @property
+    def arrival(self) -> datetime:
+        return self.legs[-1].arrival
+
+    @property
+    def stops(self) -> int:
+        return len(self.legs) - 1
+
+    @property
+    def duration(self) -> str:
+        return format_duration(self.arrival - self.departure)
+
+
+class FlightIndex:
+    """
+    In-process adjacency index of flights: UTC departure day ->
+    source airport -> legs sorted by departure. Days are loaded on demand
+    with one query (up to MAX_DAYS of them, least recently used days are
+    evicted) and kept up to date by Flight/Route signals
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._days = OrderedDict()
+        self._loaded_at = {}
+        self._flight_days = {}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._days.clear()
+            self._loaded_at.clear()
+            self._flight_days.clear()
+
+    def _load_day(self, day: date) -> dict:
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        rows = Flight.objects.filter(
+            departure_time_utc__gte=start,
+            departure_time_utc__lt=start + timedelta(days=1),
+        ).order_by("departure_time_utc").values_list(
+            "id",
+            "name",
+            "route_id",
+            "route__source_id",
+            "route__destination_id",
+            "departure_time_utc",
+            "arrival_time_utc",
+        )
+        by_source = {}
+        for row in rows:
+            leg = FlightLeg(*row)
+            by_source.setdefault(leg.source_id, []).append(leg)
+            self._flight_days[leg.id] = day
+        return by_source
+
+    def _evict(self, day: date) -> None:
+        for legs in self._days.pop(day).values():
+            for leg in legs:
+                if self._flight_days.get(leg.id) == day:
+                    del self._flight_days[leg.id]
+        del self._loaded_at[day]
+
+    def day(self, day: date) -> dict:
+        with self._lock:
+            loaded_at = self._loaded_at.get(day, -DAY_TTL)
+            if time_module.monotonic() - loaded_at >= DAY_TTL:
+                if day in self._days:
+                    self._evict(day)
+                self._days[day] = self._load_day(day)
+                self._loaded_at[day] = time_module.monotonic()
+                while len(self._days) > MAX_DAYS:
+                    self._evict(next(iter(self._days)))
+            self._days.move_to_end(day)
+            return self._days[day]
+
+    def departures(self, source_id: int, after: datetime, before: datetime):
+        """Legs from airport departing in [after, before]"""
+        day = after.astimezone(timezone.utc).date()
+        while day <= before.astimezone(timezone.utc).date():
+            legs = self.day(day).get(source_id, [])
+            departures = [leg.departure for leg in legs]
+            for leg in legs[bisect_left(departures, after):]:
+                if leg.departure > before:
+                    break
+                yield leg
+            day += timedelta(days=1)
+
+    def _remove(self, flight_id: int) -> None:
+        day = self._flight_days.pop(flight_id, None)
+        if day not in self._days:
+            return
+        for legs in self._days[day].values():
+            for position, leg in enumerate(legs):
+                if leg.id == flight_id:
+                    del legs[position]
+                    return
+
+    def flight_saved(self, flight: Flight) -> None:
+        with self._lock:
+            self._remove(flight.id)
+            day = flight.departure_time_utc.astimezone(timezone.utc).date()
+            if day not in self._days:
+                return
+            leg = FlightLeg(
+                flight.id,
+                flight.name,
+                flight.route_id,
+                flight.route.source_id,
+                flight.route.destination_id,
+                flight.departure_time_utc,
+                flight.arrival_time_utc,
+            )
+            legs = self._days[day].setdefault(leg.source_id, [])
+            departures = [other.departure for other in legs]
+            legs.insert(bisect_left(departures, leg.departure), leg)
+            self._flight_days[leg.id] = day
+
+    def flight_deleted(self, flight_id: int) -> None:
+        with self._lock:
+            self._remove(flight_id)
+
+    def find_itineraries(
+            self,
+            source_id: int,
+            destination_id: int,
+            day: date,
+            min_connection: timedelta,
+            max_stops: int = 2,
+    ) -> list:
+        """
+        Direct flights and connections (up to max_stops) departing on the
+        UTC day, each connection at least min_connection long
+        (and at most MAX_CONNECTION), sorted by total duration.
+        Only legs to airports from which the destination can be reached
+        by routes within the remaining stops are followed
+        """
+        start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        itineraries = []
+        hops = route_graph.hops_to(destination_id, max_stops + 1)
+        if source_id not in hops:
+            return itineraries
+
+        def reachable(leg: FlightLeg, legs_left: int) -> bool:
+            return hops.get(leg.destination_id, legs_left + 1) <= legs_left
+
+        def extend(legs: tuple, visited: set) -> None:
+            last = legs[-1]
+            if last.destination_id == destination_id:
+                itineraries.append(Itinerary(legs))
+                return
+            legs_left = max_stops - len(legs)
+            if legs_left < 0:
+                return
+            for leg in self.departures(
+                    last.destination_id,
+                    last.arrival + min_connection,
+                    last.arrival + MAX_CONNECTION,
+            ):
+                if (
+                        leg.destination_id not in visited
+                        and reachable(leg, legs_left)
+                ):
+                    extend(legs + (leg,), visited | {leg.destination_id})
+
+        first_legs = self.departures(
+            source_id, start, start + timedelta(days=1, microseconds=-1)
+        )
+        for leg in list(first_legs):
+            if leg.destination_id != source_id and reachable(leg, max_stops):
+                extend((leg,), {source_id, leg.destination_id})
+
+        itineraries.sort(key=lambda itinerary: (
+            itinerary.arrival - itinerary.departure, itinerary.departure
+        ))
+        return itineraries
+
+
+flight_index = FlightIndex()
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+
+from airport.flight_times import recompute_flight_times
+from airport.models import Airport, AirportTimeZone
+from airport.time_zones import time_zone_name
+from airport.versions import bump_versions
+
+
+class Command(BaseCommand):
+    """
+    Django command to set time zones of airports
+    found by their coordinates (UTC times of their flights are recomputed)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Airports resolved & updated per batch",
+        )
+
+    def handle(self, *args, **options):
+        airports = Airport.objects.filter(
+            latitude__isnull=False, longitude__isnull=False
+        ).order_by("id")
+        updated = 0
+        not_found = 0
+        last_id = 0
+        while True:
+            rows = list(
+                airports.filter(id__gt=last_id).values_list(
+                    "id", "latitude", "longitude", "time_zone__name"
+                )[:options["batch_size"]]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            names = {}
+            for airport_id, latitude, longitude, current_name in rows:
+                name = time_zone_name(latitude, longitude)
+                if name is None:
+                    not_found += 1
+                elif name != current_name:
+                    names[airport_id] = name
+            if not names:
+                continue
+            time_zone_ids = AirportTimeZone.ids_by_name(names.values())
+            Airport.objects.bulk_update(
+                [
+                    Airport(id=airport_id, time_zone_id=time_zone_ids[name])
+                    for airport_id, name in names.items()
+                ],
+                ["time_zone"],
+            )
+            recompute_flight_times(list(names))
+            updated += len(names)
+        if updated:
+            # bulk_update sends no signals
+            bump_versions(Airport)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated time zones of {updated} airports")
+        )
+        if not_found:
+            self.stdout.write(
+                self.style.WARNING(f"No time zone found for {not_found}")
+            )
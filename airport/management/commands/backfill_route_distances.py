@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from airport.distances import haversine_km, geodesic_km
+from airport.models import Route
+from airport.versions import bump_versions
+
+METHODS = {"haversine": haversine_km, "geodesic": geodesic_km}
+
+
+class Command(BaseCommand):
+    """
+    Django command to compute distances of routes
+    from coordinates of their airports
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--method",
+            choices=METHODS,
+            default="haversine",
+            help="haversine (fast, vectorized) or geodesic (WGS84, precise)",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute routes with distance too",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Routes computed & updated per batch",
+        )
+
+    def handle(self, *args, **options):
+        distance_km = METHODS[options["method"]]
+        routes = Route.objects.exclude(
+            Q(source__latitude__isnull=True)
+            | Q(source__longitude__isnull=True)
+            | Q(destination__latitude__isnull=True)
+            | Q(destination__longitude__isnull=True)
+        ).order_by("id")
+        if not options["all"]:
+            routes = routes.filter(distance__isnull=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            rows = list(
+                routes.filter(id__gt=last_id).values_list(
+                    "id",
+                    "source__latitude",
+                    "source__longitude",
+                    "destination__latitude",
+                    "destination__longitude",
+                )[:options["batch_size"]]
+            )
+            if not rows:
+                break
+            route_ids, *coordinates = zip(*rows)
+            distances = distance_km(*coordinates).round().astype(int)
+            Route.objects.bulk_update(
+                [
+                    Route(id=route_id, distance=distance)
+                    for route_id, distance in zip(
+                        route_ids, distances.tolist()
+                    )
+                ],
+                ["distance"],
+                batch_size=options["batch_size"],
+            )
+            updated += len(rows)
+            last_id = route_ids[-1]
+
+        if updated:
+            # bulk_update sends no signals, graphs of the route planner
+            # are rebuilt by the version
+            bump_versions(Route)
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated distances of {updated} routes")
+        )
@@ -0,0 +1,169 @@
+import statistics
+import time as time_module
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Concat
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from airport.flight_rows import FLIGHT_ROW_EXPRESSIONS
+from airport.models import Airplane, Flight, Route
+from airport.views import FlightViewSet
+
+# crew names of the list before: aggregated with GROUP BY of all flights
+OLD_CREW_MEMBERS = ArrayAgg(
+    Concat(
+        "crew_members__first_name",
+        Value(" "),
+        "crew_members__last_name",
+        Value(": "),
+        "crew_members__role__name",
+    ),
+    filter=Q(crew_members__isnull=False),
+    ordering="crew_members__id",
+    default=Value([]),
+)
+
+
+@contextmanager
+def old_crew_members():
+    current = FLIGHT_ROW_EXPRESSIONS["crew_members"]
+    FLIGHT_ROW_EXPRESSIONS["crew_members"] = OLD_CREW_MEMBERS
+    try:
+        yield
+    finally:
+        FLIGHT_ROW_EXPRESSIONS["crew_members"] = current
+
+
+class CurrentFlightViewSet(FlightViewSet):
+    """The list now (measured without throttling)"""
+
+    throttle_classes = ()
+
+
+class OldFlightViewSet(CurrentFlightViewSet):
+    """The list before: crew names by ArrayAgg & DISTINCT"""
+
+    def get_queryset(self):
+        return super().get_queryset().distinct()
+
+    def list(self, request, *args, **kwargs):
+        with old_crew_members():
+            return super().list(request, *args, **kwargs)
+
+
+VARIANTS = (
+    ("old", OldFlightViewSet),
+    ("current", CurrentFlightViewSet),
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command to measure latency of the flight list
+    (the old ArrayAgg & DISTINCT query & the current one) on existing flights
+    or with generated ones (removed at the end, nothing is saved)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flights",
+            type=int,
+            default=0,
+            help="Flights to generate (existing routes & airplanes)",
+        )
+        parser.add_argument(
+            "--companies",
+            default="",
+            help="Airline company ids of the filter (ex. 1,3)",
+        )
+        parser.add_argument(
+            "--offsets",
+            default="0,1000",
+            help="Offsets of the pages measured",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Requests per measurement (median is reported)",
+        )
+
+    def _generate(self, count: int, batch_size: int = 10000) -> None:
+        route_ids = list(Route.objects.values_list("id", flat=True))
+        airplane_ids = list(Airplane.objects.values_list("id", flat=True))
+        if not route_ids or not airplane_ids:
+            raise CommandError("Routes & airplanes are required")
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for first in range(0, count, batch_size):
+            flights = []
+            for number in range(first, min(first + batch_size, count)):
+                departure = start + timedelta(minutes=7 * number)
+                flights.append(Flight(
+                    name=f"BM - {number}",
+                    route_id=route_ids[number % len(route_ids)],
+                    airplane_id=airplane_ids[number % len(airplane_ids)],
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=2),
+                    departure_time_utc=departure,
+                    arrival_time_utc=departure + timedelta(hours=2),
+                    departure_local_date=departure.date(),
+                    arrival_local_date=(departure + timedelta(hours=2)).date(),
+                    is_completed=number % 10 == 0,
+                ))
+            Flight.objects.bulk_create(flights)
+        if connection.vendor == "postgresql":
+            # statistics of the new rows for the planner
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Flight._meta.db_table}")
+        self.stdout.write(f"Generated {count} flights")
+
+    def _measure(self, view, params: dict, repeat: int) -> float:
+        factory = APIRequestFactory()
+        user = get_user_model()(email="benchmark@example.com", is_staff=True)
+        timings = []
+        for _ in range(repeat):
+            request = factory.get(
+                "/api/airport/flights/", params, HTTP_HOST="localhost"
+            )
+            force_authenticate(request, user=user)
+            started = time_module.perf_counter()
+            response = view(request)
+            response.render()
+            timings.append(time_module.perf_counter() - started)
+            if response.status_code != status.HTTP_200_OK:
+                raise CommandError(
+                    f"Flight list answered {response.status_code}"
+                )
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, **options):
+        offsets = [int(offset) for offset in options["offsets"].split(",")]
+        with transaction.atomic():
+            if options["flights"]:
+                self._generate(options["flights"])
+            self.stdout.write(
+                f"{Flight.objects.count()} flights, "
+                f"median of {options['repeat']} requests (ms)"
+            )
+            for offset in offsets:
+                params = {"offset": offset}
+                if options["companies"]:
+                    params["companies"] = options["companies"]
+                timings = []
+                for name, view_set in VARIANTS:
+                    milliseconds = self._measure(
+                        view_set.as_view({"get": "list"}),
+                        params,
+                        options["repeat"],
+                    )
+                    timings.append(f"{name}: {milliseconds:.1f}")
+                self.stdout.write(f"{params} - {', '.join(timings)}")
+            # generated flights are not kept
+            transaction.set_rollback(True)
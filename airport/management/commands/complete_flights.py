@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from airport.flight_times import complete_flights
+
+
+class Command(BaseCommand):
+    """
+    Django command to mark arrived flights completed,
+    run it periodically (ex. by cron every 5 minutes)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Flights updated per query",
+        )
+
+    def handle(self, *args, **options):
+        completed = complete_flights(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Completed {completed} flights")
+        )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from airport.models import FlightSchedule
+from airport.schedules import expand_schedule
+
+
+class Command(BaseCommand):
+    """
+    Django command to create flights of schedules
+    (all schedules valid today or later if ids are not given)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "schedules",
+            nargs="*",
+            type=int,
+            help="Ids of schedules",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Flights inserted per query",
+        )
+
+    def handle(self, *args, **options):
+        schedules = FlightSchedule.objects.all()
+        if options["schedules"]:
+            schedules = schedules.filter(id__in=options["schedules"])
+        else:
+            schedules = schedules.filter(
+                valid_until__gte=timezone.now().date()
+            )
+        created = 0
+        for schedule in schedules:
+            created += expand_schedule(schedule, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Created {created} flights"))
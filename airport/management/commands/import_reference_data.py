@@ -0,0 +1,54 @@
+import pathlib
+
+from django.core.management.base import BaseCommand, CommandError
+
+from airport.importer import (
+    CHUNK_SIZE,
+    FORMATS,
+    KINDS,
+    ImportDataError,
+    import_reference_data,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django command to create or update countries, cities, time zones,
+    airports, airline companies & airplanes from CSV or JSON lines file
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("path", help="CSV (with header) or JSONL file")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Format of the file (by extension if not given)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Rows written per query",
+        )
+
+    def handle(self, *args, **options):
+        path = pathlib.Path(options["path"])
+        data_format = options["format"] or path.suffix.lstrip(".").lower()
+        if data_format not in FORMATS:
+            raise CommandError(f"Unknown format of {path}, use --format")
+        try:
+            with path.open(encoding="utf-8", newline="") as stream:
+                importer = import_reference_data(
+                    options["kind"],
+                    stream,
+                    data_format,
+                    options["chunk_size"],
+                )
+        except ImportDataError as error:
+            raise CommandError(str(error))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {importer.created}, updated {importer.updated}"
+            )
+        )
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from airport.flight_times import recompute_flight_times
+from airport.models import Airport
+
+
+class Command(BaseCommand):
+    """
+    Django command to recompute UTC departure & arrival times
+    of flights from time zones of their airports
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "airports",
+            nargs="*",
+            help="Codes IATA of airports (all airports if not given)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Flights updated per chunk",
+        )
+
+    def handle(self, *args, **options):
+        airports = Airport.objects.all()
+        if options["airports"]:
+            airports = airports.filter(
+                cod_iata__in=[code.upper() for code in options["airports"]]
+            )
+        updated = recompute_flight_times(
+            list(airports.values_list("id", flat=True)),
+            options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Recomputed {updated} flight times")
+        )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from airport.booking import release_expired_holds
+
+
+class Command(BaseCommand):
+    """
+    Django command to release expired seat holds,
+    run it periodically (ex. by cron every minute)
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Holds deleted per query",
+        )
+
+    def handle(self, *args, **options):
+        released = release_expired_holds(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired holds")
+        )
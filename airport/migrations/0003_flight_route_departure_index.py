@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0002_seathold_heldseat"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_time_utc"],
+                name="airport_fli_route_i_6a86fe_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0004_airport_coordinates"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="airport",
+            name="time_zone",
+            field=models.ForeignKey(
+                blank=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="airports",
+                to="airport.airporttimezone",
+            ),
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:39
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0005_airport_time_zone_blank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlightSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=24)),
+                (
+                    "weekdays",
+                    models.CharField(
+                        max_length=7,
+                        validators=[
+                            django.core.validators.RegexValidator(
+                                code="invalid_weekdays",
+                                message="Weekdays must be ascending digits 1 (Monday) to 7 (Sunday)",
+                                regex="^1?2?3?4?5?6?7?$",
+                            )
+                        ],
+                    ),
+                ),
+                ("departure_time", models.TimeField()),
+                ("arrival_time", models.TimeField()),
+                (
+                    "arrival_day_offset",
+                    models.PositiveSmallIntegerField(
+                        default=0,
+                        validators=[django.core.validators.MaxValueValidator(2)],
+                    ),
+                ),
+                ("valid_from", models.DateField()),
+                ("valid_until", models.DateField()),
+                (
+                    "airplane",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedules",
+                        to="airport.airplane",
+                    ),
+                ),
+                (
+                    "crew_members",
+                    models.ManyToManyField(
+                        blank=True, related_name="flight_schedules", to="airport.crew"
+                    ),
+                ),
+                (
+                    "route",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="schedules",
+                        to="airport.route",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["valid_from", "departure_time"],
+            },
+        ),
+        migrations.AddField(
+            model_name="flight",
+            name="schedule",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="flights",
+                to="airport.flightschedule",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="flight",
+            constraint=models.UniqueConstraint(
+                fields=("schedule", "departure_time"), name="unique_schedule_departure"
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 05:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0006_flightschedule"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["is_completed", "departure_time", "id"],
+                name="airport_fli_is_comp_9b22a7_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="airport_ord_user_id_c9f8f3_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0007_cursor_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["departure_time_utc", "id"],
+                name="flight_upcoming_departure_idx",
+            ),
+        ),
+    ]
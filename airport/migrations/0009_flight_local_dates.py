@@ -0,0 +1,60 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:33
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+def fill_local_dates(apps, schema_editor):
+    # digits of departure_time & arrival_time are local time
+    Flight = apps.get_model("airport", "Flight")
+    Flight.objects.update(
+        departure_local_date=TruncDate("departure_time", tzinfo=timezone.utc),
+        arrival_local_date=TruncDate("arrival_time", tzinfo=timezone.utc),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("airport", "0008_flight_upcoming_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="departure_local_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="flight",
+            name="arrival_local_date",
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_local_dates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="flight",
+            name="departure_local_date",
+            field=models.DateField(editable=False),
+        ),
+        migrations.AlterField(
+            model_name="flight",
+            name="arrival_local_date",
+            field=models.DateField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "departure_local_date"],
+                name="airport_fli_route_i_c7e7be_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["route", "arrival_local_date"],
+                name="airport_fli_route_i_c8259b_idx",
+            ),
+        ),
+    ]
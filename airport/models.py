@@ -1,13 +1,36 @@
 import pathlib
 import uuid
-
-import pytz
-from django.core.validators import RegexValidator
-from django.db import models
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.core.validators import (
+    RegexValidator,
+    MinValueValidator,
+    MaxValueValidator,
+)
+from django.db import models, transaction
 from django.utils.text import slugify
 
+from airport.distances import airport_distances
+from airport.time_zones import (
+    flight_zones,
+    is_time_zone_name,
+    time_zone_name,
+)
+from airport.versions import bump_versions
 from app import settings
 
+# Modern airplanes can have no more than 10 seats in a row,
+# designated by the appropriate letters:
+SEAT_LETTERS = ("A", "B", "C", "D", "E", "F", "G", "H", "J", "K")
+
+
+def format_duration(duration: timedelta) -> str:
+    hours, remainder = divmod(duration.total_seconds(), 3600)
+    minutes, _ = divmod(remainder, 60)
+
+    return f"{int(hours)}h {int(minutes)}m"
+
 
 class Country(models.Model):
     name = models.CharField(max_length=63, unique=True)
@@ -41,6 +64,31 @@ class AirportTimeZone(models.Model):
     def __str__(self) -> str:
         return self.name
 
+    def clean(self) -> None:
+        if not is_time_zone_name(self.name):
+            raise ValidationError(
+                {"name": f"unknown time zone: {self.name}"}
+            )
+
+    @classmethod
+    def ids_by_name(cls, names) -> dict:
+        """Ids of time zones by name, missing time zones are created"""
+        names = set(names)
+        ids = {}
+        for time_zone_id, name in cls.objects.filter(
+                name__in=names
+        ).order_by("-id").values_list("id", "name"):
+            ids[name] = time_zone_id
+        missing = names - ids.keys()
+        if missing:
+            for time_zone in cls.objects.bulk_create(
+                    [cls(name=name) for name in sorted(missing)]
+            ):
+                ids[time_zone.name] = time_zone.id
+            # bulk_create sends no signals
+            transaction.on_commit(lambda: bump_versions(cls))
+        return ids
+
 
 class Airport(models.Model):
     name = models.CharField(max_length=100)
@@ -59,9 +107,46 @@ class Airport(models.Model):
     closest_big_city = models.ForeignKey(
         City, on_delete=models.CASCADE, related_name="airports"
     )
+    # found by coordinates if not given
     time_zone = models.ForeignKey(
-        AirportTimeZone, on_delete=models.CASCADE, related_name="airports"
+        AirportTimeZone,
+        on_delete=models.CASCADE,
+        related_name="airports",
+        blank=True,
+    )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
     )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+
+    def save(self, *args, **kwargs):
+        if (
+                self.time_zone_id is None
+                and self.latitude is not None
+                and self.longitude is not None
+        ):
+            name = time_zone_name(self.latitude, self.longitude)
+            if name:
+                self.time_zone_id = AirportTimeZone.ids_by_name([name])[name]
+        super().save(*args, **kwargs)
+
+    def clean(self) -> None:
+        # time_zone is blank in forms, but it is found on save
+        # by coordinates only
+        if self.time_zone_id is None and (
+                self.latitude is None
+                or self.longitude is None
+                or time_zone_name(self.latitude, self.longitude) is None
+        ):
+            raise ValidationError(
+                {"time_zone": "time zone or coordinates are required"}
+            )
 
     def __str__(self) -> str:
         return self.cod_iata
@@ -177,10 +262,79 @@ class Route(models.Model):
             ),
         ]
 
+    @staticmethod
+    def _airports_coordinates(source_id: int, destination_id: int):
+        coordinates = {
+            airport_id: (latitude, longitude)
+            for airport_id, latitude, longitude in Airport.objects.filter(
+                id__in=(source_id, destination_id)
+            ).values_list("id", "latitude", "longitude")
+        }
+        if len(coordinates) < len({source_id, destination_id}):
+            return None
+        return coordinates[source_id] + coordinates[destination_id]
+
+    def save(self, *args, **kwargs):
+        if self.distance is None:
+            self.distance = airport_distances.get(
+                self.source_id, self.destination_id, self._airports_coordinates
+            )
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.source} - {self.destination}"
 
 
+class FlightSchedule(models.Model):
+    """
+    Recurring flight (ex. Mon, Wed & Fri at 07:40 local time
+    from March to October), expanded into flights
+    """
+    name = models.CharField(max_length=24)
+    route = models.ForeignKey(
+        Route, on_delete=models.CASCADE, related_name="schedules"
+    )
+    airplane = models.ForeignKey(
+        Airplane, on_delete=models.CASCADE, related_name="schedules"
+    )
+    # ISO weekdays: 1 - Monday ... 7 - Sunday (ex. "135")
+    weekdays = models.CharField(
+        max_length=7,
+        validators=[
+            RegexValidator(
+                regex="^1?2?3?4?5?6?7?$",
+                message="Weekdays must be ascending digits 1 (Monday) "
+                        "to 7 (Sunday)",
+                code="invalid_weekdays",
+            )
+        ],
+    )
+    # local times of source & destination airports
+    departure_time = models.TimeField()
+    arrival_time = models.TimeField()
+    arrival_day_offset = models.PositiveSmallIntegerField(
+        default=0, validators=[MaxValueValidator(2)]
+    )
+    valid_from = models.DateField()
+    valid_until = models.DateField()
+    crew_members = models.ManyToManyField(
+        Crew, related_name="flight_schedules", blank=True
+    )
+
+    class Meta:
+        ordering = ["valid_from", "departure_time"]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.route}, {self.weekdays})"
+
+    def departure_dates(self):
+        day = self.valid_from
+        while day <= self.valid_until:
+            if str(day.isoweekday()) in self.weekdays:
+                yield day
+            day += timedelta(days=1)
+
+
 class Flight(models.Model):
     name = models.CharField(max_length=24)
     route = models.ForeignKey(
@@ -194,31 +348,84 @@ class Flight(models.Model):
     crew_members = models.ManyToManyField(Crew, related_name="flights")
     departure_time_utc = models.DateTimeField(editable=False)
     arrival_time_utc = models.DateTimeField(editable=False)
+    # local dates (of the airports) of departure & arrival
+    departure_local_date = models.DateField(editable=False)
+    arrival_local_date = models.DateField(editable=False)
     is_completed = models.BooleanField(default=False)
+    schedule = models.ForeignKey(
+        FlightSchedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="flights",
+    )
 
     class Meta:
         ordering = ["is_completed", "departure_time"]
+        indexes = [
+            models.Index(
+                fields=[
+                    "route",
+                    "departure_time_utc",
+                ]
+            ),
+            # ordering of the list & its cursor pagination
+            models.Index(
+                fields=[
+                    "is_completed",
+                    "departure_time",
+                    "id",
+                ]
+            ),
+            # boards of airports: departures & arrivals of a local day
+            models.Index(
+                fields=[
+                    "route",
+                    "departure_local_date",
+                ]
+            ),
+            models.Index(
+                fields=[
+                    "route",
+                    "arrival_local_date",
+                ]
+            ),
+            # upcoming flights only, completed history is not indexed
+            models.Index(
+                fields=[
+                    "departure_time_utc",
+                    "id",
+                ],
+                condition=models.Q(is_completed=False),
+                name="flight_upcoming_departure_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["schedule", "departure_time"],
+                name="unique_schedule_departure",
+            ),
+        ]
 
-    def save(self, *args, **kwargs):
-        departure_time_utc = self.departure_time.replace(
-            tzinfo=pytz.timezone(self.route.source.time_zone.name)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        flight = super().from_db(db, field_names, values)
+        # route as loaded: boards of its airports drop a moved flight
+        flight._loaded_route_id = dict(zip(field_names, values)).get(
+            "route_id"
         )
-        arrival_time_utc = self.arrival_time.replace(
-            tzinfo=pytz.timezone(self.route.destination.time_zone.name)
-        )
-        self.departure_time_utc = departure_time_utc.astimezone(pytz.utc)
-        self.arrival_time_utc = arrival_time_utc.astimezone(pytz.utc)
+        return flight
+
+    def save(self, *args, **kwargs):
+        flight_zones.set_times_utc([self])
         super().save(*args, **kwargs)
 
     @property
     def duration(self) -> str:
         if self.departure_time_utc and self.arrival_time_utc:
-            duration = self.arrival_time_utc - self.departure_time_utc
-
-            hours, remainder = divmod(duration.total_seconds(), 3600)
-            minutes, _ = divmod(remainder, 60)
-
-            return f"{int(hours)}h {int(minutes)}m"
+            return format_duration(
+                self.arrival_time_utc - self.departure_time_utc
+            )
         return "Duration not available"
 
     def __str__(self) -> str:
@@ -251,10 +458,7 @@ class Ticket(models.Model):
             seat: str, num_seats: int,
             error_to_raise
     ):
-        # Modern airplanes can have no more than 10 seats in a row,
-        # designated by the appropriate letters:
-        seats_set = ["A", "B", "C", "D", "E", "F", "G", "H", "J", "K"]
-        seats_set = seats_set[:num_seats]
+        seats_set = list(SEAT_LETTERS[:num_seats])
         if not (seat in seats_set):
             raise error_to_raise(
                 {
@@ -293,6 +497,48 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # orders of the user & their cursor pagination
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
 
     def __str__(self) -> str:
         return str(self.created_at)
+
+
+class SeatHold(models.Model):
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="seat_holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.flight_id} (until {self.expires_at})"
+
+
+class HeldSeat(models.Model):
+    hold = models.ForeignKey(
+        SeatHold, on_delete=models.CASCADE, related_name="seats"
+    )
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="held_seats"
+    )
+    row = models.IntegerField()
+    seat = models.CharField(max_length=1)
+
+    class Meta:
+        # one hold per seat, expired holds are purged before a new hold
+        unique_together = (
+            ("flight", "row", "seat"),
+        )
+        ordering = ("row", "seat", )
+
+    def __str__(self) -> str:
+        return f"{self.flight_id} (row: {self.row}, seat: {self.seat})"
@@ -0,0 +1,202 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import models
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_MAX_PAGE_SIZE = 100
+
+
+class _Row(models.Func):
+    """(a, b, c) - row value, compared element by element"""
+
+    function = ""
+    output_field = models.Field()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination by the whole ordering (its last field must be
+    unique, ex. id): the cursor keeps values of the last/first row
+    of the page and the next page is taken by row comparison
+    "(a, b, id) > (x, y, z)" served by an index of the same columns,
+    so every page costs the same, no OFFSET & COUNT(*).
+    All ordering fields must have the same direction
+    """
+
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    max_page_size = CURSOR_MAX_PAGE_SIZE
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return min(api_settings.PAGE_SIZE, self.max_page_size)
+
+    @property
+    def _fields(self) -> list:
+        return [field.lstrip("-") for field in self.ordering]
+
+    @property
+    def _descending(self) -> bool:
+        return self.ordering[0].startswith("-")
+
+    def _encode_cursor(self, row, reverse: bool) -> str:
+        # model instances or dicts of values()
+        values = (
+            row[field] if isinstance(row, dict) else getattr(row, field)
+            for field in self._fields
+        )
+        position = [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        ]
+        data = json.dumps({"p": position, "r": int(reverse)})
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(data.encode()).decode(),
+        )
+
+    def _decode_cursor(self, model, encoded: str):
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self._fields, data["p"], strict=True)
+            ]
+            return position, bool(data["r"])
+        except (
+                binascii.Error,
+                ValueError,
+                TypeError,
+                KeyError,
+                FieldDoesNotExist,
+                ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        encoded = request.query_params.get(self.cursor_query_param)
+        position, reverse = None, False
+        if encoded:
+            position, reverse = self._decode_cursor(queryset.model, encoded)
+
+        # rows after the position in the ordering (before it if reverse)
+        forward = reverse == self._descending
+        ordering = [
+            field if forward else f"-{field}" for field in self._fields
+        ]
+        if position is not None:
+            lookup = "gt" if forward else "lt"
+            queryset = queryset.alias(
+                _keyset=_Row(*self._fields)
+            ).filter(**{
+                f"_keyset__{lookup}": _Row(
+                    *(models.Value(value) for value in position)
+                )
+            })
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # going forward the page came after a position, going back
+        # (reverse) there is a page after it
+        has_next, has_previous = has_more, position is not None
+        if reverse:
+            has_next, has_previous = has_previous, has_next
+        self.next_link = self.previous_link = None
+        if rows and has_next:
+            self.next_link = self._encode_cursor(rows[-1], False)
+        if rows and has_previous:
+            self.previous_link = self._encode_cursor(rows[0], True)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.next_link,
+            "previous": self.previous_link,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string", "nullable": True, "format": "uri"
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page "
+                               f"(up to {self.max_page_size}).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class FlightCursorPagination(KeysetPagination):
+    ordering = ("is_completed", "departure_time", "id")
+
+
+class OrderCursorPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+# List of a viewset is paginated by cursor_pagination_class when
+# the client asks for it (?pagination=cursor, next pages have ?cursor=),
+# by the default pagination (limit & offset) otherwise.
+# (a comment, not a docstring: docstrings of views go to the API docs)
+class CursorPaginationMixin:
+    cursor_pagination_class = None
+
+    def uses_cursor_pagination(self) -> bool:
+        request = getattr(self, "request", None)
+        if request is None or self.cursor_pagination_class is None:
+            return False
+        params = request.query_params
+        return (
+            params.get("pagination") == "cursor"
+            or self.cursor_pagination_class.cursor_query_param in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.uses_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
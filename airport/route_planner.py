@@ -0,0 +1,215 @@
+import heapq
+import threading
+import time as time_module
+from collections import deque, namedtuple
+from datetime import timedelta
+
+from django.db.models import Avg, DurationField, ExpressionWrapper, F
+
+from airport.models import Airport, Route, format_duration
+from airport.versions import model_versions
+
+WEIGHTS = ("distance", "duration")
+# the graph is rebuilt when versions of these models change (in any
+# process, versions are kept in the shared cache)
+GRAPH_MODELS = (Airport, Route)
+# durations changed by flights of other processes are seen after it
+DURATION_TTL = 300
+
+Edge = namedtuple("Edge", "route_id destination_id distance")
+
+
+class RoutePlan:
+    def __init__(
+            self,
+            weight: str,
+            airports: list,
+            route_ids: list,
+            distance,
+            duration,
+    ) -> None:
+        self.weight = weight
+        self.airports = airports
+        self.route_ids = route_ids
+        self.distance = distance
+        self.duration = duration
+
+    @property
+    def stops(self) -> int:
+        return len(self.route_ids) - 1
+
+
+class RouteGraph:
+    """
+    In-process graph of the route network: airports are nodes,
+    routes are edges weighted by distance or by average scheduled
+    duration of their flights. Built on first use (one query for airports
+    & routes, one for durations) and rebuilt when airports or routes
+    change (versions of GRAPH_MODELS); durations of routes of saved
+    flights are recomputed route by route, all of them every DURATION_TTL
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._graph = None
+        self._graph_versions = None
+        self._durations = None
+        self._durations_loaded_at = 0
+        self._changed_routes = set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graph = None
+            self._durations = None
+            self._changed_routes.clear()
+
+    def forget_durations(self, route_ids) -> None:
+        """Durations of the routes are recomputed on next use"""
+        with self._lock:
+            self._changed_routes.update(route_ids)
+
+    @staticmethod
+    def _route_durations(routes) -> dict:
+        return {
+            route_id: duration.total_seconds()
+            for route_id, duration in routes.annotate(
+                duration=Avg(ExpressionWrapper(
+                    F("flights__arrival_time_utc")
+                    - F("flights__departure_time_utc"),
+                    output_field=DurationField(),
+                ))
+            ).filter(duration__isnull=False).values_list("id", "duration")
+        }
+
+    def _load_graph(self) -> tuple:
+        """(airport ids by code, codes by id, edges, sources by airport)"""
+        # versions are read before the data, a change in between
+        # rebuilds the graph next time
+        versions = model_versions(GRAPH_MODELS)
+        with self._lock:
+            if self._graph is None or self._graph_versions != versions:
+                codes = dict(Airport.objects.values_list("cod_iata", "id"))
+                edges = {}
+                sources = {}
+                for route_id, source_id, destination_id, distance in (
+                        Route.objects.values_list(
+                            "id", "source_id", "destination_id", "distance"
+                        )
+                ):
+                    edges.setdefault(source_id, []).append(
+                        Edge(route_id, destination_id, distance)
+                    )
+                    sources.setdefault(destination_id, set()).add(source_id)
+                self._graph = (codes, {
+                    airport_id: code for code, airport_id in codes.items()
+                }, edges, sources)
+                self._graph_versions = versions
+            return self._graph
+
+    def _load(self) -> tuple:
+        graph = self._load_graph()
+        with self._lock:
+            if (
+                    self._durations is None
+                    or time_module.monotonic() - self._durations_loaded_at
+                    >= DURATION_TTL
+            ):
+                self._durations = self._route_durations(Route.objects.all())
+                self._durations_loaded_at = time_module.monotonic()
+                self._changed_routes.clear()
+            elif self._changed_routes:
+                # a new dict, returned ones may be in use
+                changed = set(self._changed_routes)
+                self._durations = {
+                    **{
+                        route_id: seconds
+                        for route_id, seconds in self._durations.items()
+                        if route_id not in changed
+                    },
+                    **self._route_durations(
+                        Route.objects.filter(id__in=changed)
+                    ),
+                }
+                self._changed_routes.clear()
+            return graph + (self._durations,)
+
+    def airport_id(self, code: str):
+        return self._load()[0].get(code)
+
+    def hops_to(self, destination_id: int, max_hops: int) -> dict:
+        """
+        Fewest routes from airports to the destination (breadth-first
+        over routes backwards), airports farther than max_hops are absent
+        """
+        sources = self._load_graph()[3]
+        hops = {destination_id: 0}
+        queue = deque([destination_id])
+        while queue:
+            airport_id = queue.popleft()
+            if hops[airport_id] == max_hops:
+                continue
+            for source_id in sources.get(airport_id, ()):
+                if source_id not in hops:
+                    hops[source_id] = hops[airport_id] + 1
+                    queue.append(source_id)
+        return hops
+
+    def shortest_path(
+            self,
+            source_id: int,
+            destination_id: int,
+            weight: str = "distance",
+    ):
+        """
+        Dijkstra over the routes, routes without distance
+        (or without flights for "duration") are not used.
+        None if destination cannot be reached
+        """
+        _, airport_codes, edges, _, durations = self._load()
+        best = {source_id: 0}
+        previous = {}
+        queue = [(0, source_id)]
+        while queue:
+            cost, airport_id = heapq.heappop(queue)
+            if airport_id == destination_id:
+                break
+            if cost > best[airport_id]:
+                continue
+            for edge in edges.get(airport_id, ()):
+                if weight == "distance":
+                    edge_cost = edge.distance
+                else:
+                    edge_cost = durations.get(edge.route_id)
+                if edge_cost is None:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost < best.get(edge.destination_id, new_cost + 1):
+                    best[edge.destination_id] = new_cost
+                    previous[edge.destination_id] = (airport_id, edge)
+                    heapq.heappush(queue, (new_cost, edge.destination_id))
+        else:
+            return None
+
+        path = []
+        airport_id = destination_id
+        while airport_id != source_id:
+            airport_id, edge = previous[airport_id]
+            path.append(edge)
+        path.reverse()
+
+        distances = [edge.distance for edge in path]
+        seconds = [durations.get(edge.route_id) for edge in path]
+        return RoutePlan(
+            weight=weight,
+            airports=[airport_codes[source_id]] + [
+                airport_codes[edge.destination_id] for edge in path
+            ],
+            route_ids=[edge.route_id for edge in path],
+            distance=None if None in distances else sum(distances),
+            duration=None if None in seconds else format_duration(
+                timedelta(seconds=sum(seconds))
+            ),
+        )
+
+
+route_graph = RouteGraph()
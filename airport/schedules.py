@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import transaction
+
+from airport.boards import airport_boards
+from airport.itineraries import flight_index
+from airport.models import Flight, FlightSchedule
+from airport.route_planner import route_graph
+from airport.time_zones import flight_zones
+
+FlightCrew = Flight.crew_members.through
+
+
+def schedule_flights(schedule: FlightSchedule, existing=()) -> list:
+    """
+    Unsaved flights of the schedule, departures in existing are skipped
+    (local times are kept as digits, the same as flights from the API)
+    """
+    arrival_offset = timedelta(days=schedule.arrival_day_offset)
+    flights = []
+    for day in schedule.departure_dates():
+        departure = datetime.combine(
+            day, schedule.departure_time, tzinfo=timezone.utc
+        )
+        if departure in existing:
+            continue
+        flights.append(Flight(
+            name=schedule.name,
+            route_id=schedule.route_id,
+            airplane_id=schedule.airplane_id,
+            schedule=schedule,
+            departure_time=departure,
+            arrival_time=datetime.combine(
+                day + arrival_offset,
+                schedule.arrival_time,
+                tzinfo=timezone.utc,
+            ),
+        ))
+    return flights
+
+
+def expand_schedule(schedule: FlightSchedule, batch_size: int = 5000) -> int:
+    """
+    Create missing flights of the schedule with crew of the schedule:
+    UTC times are computed for all flights at once (see flight_zones),
+    flights & crew rows are inserted with bulk_create in batches,
+    save() & signals are skipped. Returns number of created flights
+    """
+    existing = set(
+        schedule.flights.order_by().values_list("departure_time", flat=True)
+    )
+    flights = schedule_flights(schedule, existing)
+    crew_ids = list(schedule.crew_members.values_list("id", flat=True))
+
+    with transaction.atomic():
+        for start in range(0, len(flights), batch_size):
+            batch = flight_zones.set_times_utc(
+                flights[start:start + batch_size]
+            )
+            Flight.objects.bulk_create(batch)
+            FlightCrew.objects.bulk_create([
+                FlightCrew(flight_id=flight.id, crew_id=crew_id)
+                for flight in batch
+                for crew_id in crew_ids
+            ])
+        if flights:
+            transaction.on_commit(flight_index.clear)
+            route_ids = [schedule.route_id]
+            transaction.on_commit(
+                lambda: route_graph.forget_durations(route_ids)
+            )
+            airport_ids = (
+                schedule.route.source_id, schedule.route.destination_id
+            )
+            transaction.on_commit(lambda: airport_boards.clear(airport_ids))
+    return len(flights)
@@ -0,0 +1,103 @@
+from django.utils import timezone
+
+from airport.models import SEAT_LETTERS, Flight, Ticket, HeldSeat
+
+
+class SeatMap:
+    """
+    Occupancy of a flight as bitmaps of airplane rows x seats_in_row,
+    one bit per seat in row-major order: booked seats & seats held now
+    """
+
+    def __init__(self, flight_id: int, rows: int, seats_in_row: int) -> None:
+        self.flight_id = flight_id
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.letters = SEAT_LETTERS[:seats_in_row]
+        self.bitmap = bytearray((rows * seats_in_row + 7) // 8)
+        self.held_bitmap = bytearray(len(self.bitmap))
+
+    @classmethod
+    def for_flight(cls, flight: Flight) -> "SeatMap":
+        seat_map = cls(
+            flight.id, flight.airplane.rows, flight.airplane.seats_in_row
+        )
+        taken_seats = Ticket.objects.filter(
+            flight_id=flight.id
+        ).order_by().values_list("row", "seat")
+        for row, seat in taken_seats:
+            seat_map.mark(row, seat)
+        held_seats = HeldSeat.objects.filter(
+            flight_id=flight.id, hold__expires_at__gt=timezone.now()
+        ).order_by().values_list("row", "seat")
+        for row, seat in held_seats:
+            seat_map.mark(row, seat, held=True)
+        return seat_map
+
+    @property
+    def capacity(self) -> int:
+        return self.rows * self.seats_in_row
+
+    def _position(self, row: int, seat: str) -> int | None:
+        if not (1 <= row <= self.rows) or seat not in self.letters:
+            return None
+        return (row - 1) * self.seats_in_row + self.letters.index(seat)
+
+    def mark(self, row: int, seat: str, held: bool = False) -> None:
+        position = self._position(row, seat)
+        if position is not None:
+            bitmap = self.held_bitmap if held else self.bitmap
+            bitmap[position >> 3] |= 1 << (position & 7)
+
+    def _is_set(self, bitmap: bytearray, row: int, seat: str) -> bool:
+        position = self._position(row, seat)
+        if position is None:
+            return False
+        return bool(bitmap[position >> 3] & (1 << (position & 7)))
+
+    def is_taken(self, row: int, seat: str) -> bool:
+        return self._is_set(self.bitmap, row, seat)
+
+    def is_held(self, row: int, seat: str) -> bool:
+        return (
+            self._is_set(self.held_bitmap, row, seat)
+            and not self.is_taken(row, seat)
+        )
+
+    @property
+    def taken(self) -> int:
+        return int.from_bytes(self.bitmap, "little").bit_count()
+
+    @property
+    def held(self) -> int:
+        taken = int.from_bytes(self.bitmap, "little")
+        held = int.from_bytes(self.held_bitmap, "little")
+        return (held & ~taken).bit_count()
+
+    @property
+    def available(self) -> int:
+        return self.capacity - self.taken - self.held
+
+    def to_hex(self) -> str:
+        return self.bitmap.hex()
+
+    def held_to_hex(self) -> str:
+        return self.held_bitmap.hex()
+
+    def to_rows(self) -> list:
+        """
+        One string per row: seat letter if free,
+        "X" if taken, "H" if held by a customer
+        """
+        taken = int.from_bytes(self.bitmap, "little")
+        held = int.from_bytes(self.held_bitmap, "little")
+        seat_rows = []
+        for row in range(self.rows):
+            offset = row * self.seats_in_row
+            seat_rows.append("".join(
+                "X" if taken >> (offset + index) & 1
+                else "H" if held >> (offset + index) & 1
+                else letter
+                for index, letter in enumerate(self.letters)
+            ))
+        return seat_rows
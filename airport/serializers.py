@@ -1,8 +1,8 @@
-from django.db import transaction
-
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from airport.booking import check_seats, book_order, hold_seats
+from airport.time_zones import is_time_zone_name, time_zone_name
 from airport.models import (
     Country,
     City,
@@ -15,10 +15,52 @@ from airport.models import (
     Airplane,
     Route,
     Flight,
+    FlightSchedule,
     Ticket,
     Order,
     AirportTimeZone,
+    SeatHold,
+    HeldSeat,
 )
+from app import settings
+
+
+def sparse_fields(query_params, names) -> list:
+    """
+    Names of fields kept by ?fields=id,name (only the listed ones)
+    and ?omit=crew_members (all but the listed ones)
+    """
+    selected = list(names)
+    for param in ("fields", "omit"):
+        if not query_params.get(param):
+            continue
+        requested = {
+            name.strip() for name in query_params[param].split(",")
+            if name.strip()
+        }
+        unknown = requested - set(names)
+        if unknown:
+            raise ValidationError(
+                {param: f"unknown fields: {', '.join(sorted(unknown))}"}
+            )
+        selected = [
+            name for name in selected
+            if (name in requested) == (param == "fields")
+        ]
+    return selected
+
+
+class SparseFieldsMixin:
+    """Fields of the response are selected by ?fields= & ?omit="""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is not None:
+            kept = set(sparse_fields(request.query_params, self.fields))
+            for name in list(self.fields):
+                if name not in kept:
+                    self.fields.pop(name)
 
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -48,13 +90,41 @@ class AirportTimeZoneSerializer(serializers.ModelSerializer):
         model = AirportTimeZone
         fields = ("id", "name", )
 
+    def validate_name(self, value):
+        # flight times are computed in the zone, a bad name breaks them
+        if not is_time_zone_name(value):
+            raise ValidationError(f"unknown time zone: {value}")
+        return value
+
 
 class AirportSerializer(serializers.ModelSerializer):
     time_zone = AirportTimeZoneSerializer
 
     class Meta:
         model = Airport
-        fields = ("id", "name", "cod_iata", "closest_big_city", "time_zone", )
+        fields = (
+            "id",
+            "name",
+            "cod_iata",
+            "closest_big_city",
+            "time_zone",
+            "latitude",
+            "longitude",
+        )
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if self.instance is None and not data.get("time_zone"):
+            latitude, longitude = data.get("latitude"), data.get("longitude")
+            if (
+                    latitude is None
+                    or longitude is None
+                    or time_zone_name(latitude, longitude) is None
+            ):
+                raise ValidationError(
+                    {"time_zone": "time zone or coordinates are required"}
+                )
+        return data
 
 
 class AirportListSerializer(serializers.ModelSerializer):
@@ -77,6 +147,8 @@ class AirportListSerializer(serializers.ModelSerializer):
             "closest_big_city",
             "country",
             "time_zone",
+            "latitude",
+            "longitude",
         )
 
 
@@ -218,7 +290,41 @@ class FlightSerializer(serializers.ModelSerializer):
         )
 
 
-class FlightListSerializer(serializers.ModelSerializer):
+class FlightScheduleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FlightSchedule
+        fields = (
+            "id",
+            "name",
+            "route",
+            "airplane",
+            "weekdays",
+            "departure_time",
+            "arrival_time",
+            "arrival_day_offset",
+            "valid_from",
+            "valid_until",
+            "crew_members",
+        )
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        valid_from = data.get("valid_from", getattr(
+            self.instance, "valid_from", None
+        ))
+        valid_until = data.get("valid_until", getattr(
+            self.instance, "valid_until", None
+        ))
+        if valid_from and valid_until and valid_from > valid_until:
+            raise ValidationError(
+                {"valid_until": "must not be before valid_from"}
+            )
+        if "weekdays" in data and not data["weekdays"]:
+            raise ValidationError({"weekdays": "at least one weekday"})
+        return data
+
+
+class FlightListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     source = serializers.CharField(
         source="route.source.closest_big_city", read_only=True
     )
@@ -273,23 +379,111 @@ class FlightRetrieveSerializer(FlightListSerializer):
         )
 
 
+class FlightSeatMapSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(source="flight_id", read_only=True)
+    rows = serializers.IntegerField(read_only=True)
+    seats_in_row = serializers.IntegerField(read_only=True)
+    seat_letters = serializers.ListField(
+        source="letters", child=serializers.CharField(), read_only=True
+    )
+    capacity = serializers.IntegerField(read_only=True)
+    taken = serializers.IntegerField(read_only=True)
+    held = serializers.IntegerField(read_only=True)
+    available = serializers.IntegerField(read_only=True)
+    bitmap = serializers.CharField(source="to_hex", read_only=True)
+    held_bitmap = serializers.CharField(source="held_to_hex", read_only=True)
+    seat_map = serializers.ListField(
+        source="to_rows", child=serializers.CharField(), read_only=True
+    )
+
+
+class ItineraryLegSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    route = serializers.IntegerField(source="route_id", read_only=True)
+    source = serializers.SerializerMethodField()
+    destination = serializers.SerializerMethodField()
+    departure_time_utc = serializers.DateTimeField(
+        source="departure", read_only=True
+    )
+    arrival_time_utc = serializers.DateTimeField(
+        source="arrival", read_only=True
+    )
+
+    def get_source(self, leg) -> str:
+        return self.context["airport_codes"].get(leg.source_id)
+
+    def get_destination(self, leg) -> str:
+        return self.context["airport_codes"].get(leg.destination_id)
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time_utc = serializers.DateTimeField(
+        source="departure", read_only=True
+    )
+    arrival_time_utc = serializers.DateTimeField(
+        source="arrival", read_only=True
+    )
+    duration = serializers.CharField(read_only=True)
+    stops = serializers.IntegerField(read_only=True)
+    flights = ItineraryLegSerializer(source="legs", many=True, read_only=True)
+
+
+class BoardFlightSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    airport = serializers.CharField(read_only=True)
+    city = serializers.CharField(read_only=True)
+    airline_company = serializers.CharField(read_only=True)
+    departure_time = serializers.DateTimeField(read_only=True)
+    arrival_time = serializers.DateTimeField(read_only=True)
+    is_completed = serializers.BooleanField(read_only=True)
+
+
+class AirportBoardSerializer(serializers.Serializer):
+    airport = serializers.CharField(read_only=True)
+    direction = serializers.CharField(read_only=True)
+    date = serializers.DateField(read_only=True, allow_null=True)
+    flights = BoardFlightSerializer(many=True, read_only=True)
+
+
+class RoutePlanSerializer(serializers.Serializer):
+    weight = serializers.CharField(read_only=True)
+    airports = serializers.ListField(
+        child=serializers.CharField(), read_only=True
+    )
+    routes = serializers.ListField(
+        source="route_ids", child=serializers.IntegerField(), read_only=True
+    )
+    stops = serializers.IntegerField(read_only=True)
+    distance = serializers.IntegerField(read_only=True)
+    duration = serializers.CharField(read_only=True)
+
+
+class TicketFlightField(serializers.PrimaryKeyRelatedField):
+    """
+    Nested ticket serializer is shared by all tickets of an order,
+    so every distinct flight (with airplane) is fetched once per order
+    """
+
+    def get_queryset(self):
+        return Flight.objects.select_related("airplane")
+
+    def to_internal_value(self, data):
+        flights = self.__dict__.setdefault("_flights", {})
+        if str(data) not in flights:
+            flights[str(data)] = super().to_internal_value(data)
+        return flights[str(data)]
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = TicketFlightField(queryset=Flight.objects.all())
 
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight", )
-
-    def validate(self, attrs):
-        print(f"{attrs=}")
-        data = super(TicketSerializer, self).validate(attrs=attrs)
-        Ticket.validate_ticket(
-            attrs["row"],
-            attrs["flight"].airplane.rows,
-            attrs["seat"],
-            attrs["flight"].airplane.seats_in_row,
-            ValidationError,
-        )
-        return data
+        # seats of all tickets are validated at once on order level
+        validators = []
 
 
 class OrderSerializer(serializers.ModelSerializer):
@@ -299,13 +493,14 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ("id", "created_at", "tickets")
 
+    def validate_tickets(self, tickets):
+        request = self.context.get("request")
+        check_seats(tickets, request.user if request else None)
+        return tickets
+
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+        tickets_data = validated_data.pop("tickets")
+        return book_order(tickets_data, **validated_data)
 
 
 class FlightTicketSerializer(FlightSerializer):
@@ -341,3 +536,53 @@ class OrderListSerializer(OrderSerializer):
 
 class OrderRetrieveSerializer(OrderSerializer):
     tickets = TicketRetrieveSerializer(many=True, read_only=True)
+
+
+class HeldSeatSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = HeldSeat
+        fields = ("row", "seat", )
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    flight = TicketFlightField(queryset=Flight.objects.all())
+    seats = HeldSeatSerializer(many=True, allow_empty=False)
+    minutes = serializers.IntegerField(
+        write_only=True,
+        min_value=1,
+        max_value=settings.SEAT_HOLD_MAX_MINUTES,
+        default=settings.SEAT_HOLD_MINUTES,
+    )
+
+    class Meta:
+        model = SeatHold
+        fields = (
+            "id", "flight", "seats", "minutes", "created_at", "expires_at",
+        )
+        read_only_fields = ("expires_at", )
+
+    def validate(self, attrs):
+        request = self.context.get("request")
+        try:
+            check_seats(
+                [
+                    {"flight": attrs["flight"], **seat_data}
+                    for seat_data in attrs["seats"]
+                ],
+                request.user if request else None,
+            )
+        except ValidationError as error:
+            raise ValidationError({"seats": error.detail})
+        return attrs
+
+    def create(self, validated_data):
+        return hold_seats(
+            validated_data["user"],
+            validated_data["flight"],
+            [
+                (seat_data["row"], seat_data["seat"])
+                for seat_data in validated_data["seats"]
+            ],
+            validated_data["minutes"],
+        )
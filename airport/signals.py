@@ -0,0 +1,167 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from airport.board_events import board_events
+from airport.boards import airport_boards
+from airport.distances import airport_distances
+from airport.flight_times import recompute_flight_times
+from airport.itineraries import flight_index
+from airport.models import (
+    Airport,
+    AirplaneType,
+    AirportTimeZone,
+    City,
+    Country,
+    Facility,
+    Flight,
+    Role,
+    Route,
+)
+from airport.route_planner import route_graph
+from airport.time_zones import flight_zones
+from airport.versions import bump_versions
+
+# models of the conditional GET (ETag) viewsets
+VERSIONED_MODELS = (
+    Country,
+    City,
+    AirportTimeZone,
+    Airport,
+    Role,
+    AirplaneType,
+    Facility,
+)
+
+
+def flight_changed(flight_id: int, route_ids, data: dict) -> None:
+    """Boards of airports of the routes: cached ones & live streams"""
+    routes = {
+        route_id: airports
+        for route_id, *airports in Route.objects.filter(
+            id__in=route_ids
+        ).values_list("id", "source_id", "destination_id")
+    }
+    airport_ids = {
+        airport_id for airports in routes.values() for airport_id in airports
+    }
+    airport_boards.flight_changed(flight_id, airport_ids)
+    if "route" in data:
+        # airports of the board of the flight now (a moved flight
+        # leaves boards of the others)
+        source, destination = routes.get(data["route"], (None, None))
+        data = {**data, "source": source, "destination": destination}
+    board_events.publish(airport_ids, {"event": "flight", "data": data})
+
+
+@receiver(post_save, sender=Flight)
+def flight_saved(sender, instance, **kwargs):
+    flight_id = instance.id
+    # the route before the save too, the flight may be moved
+    route_ids = {
+        instance.route_id, getattr(instance, "_loaded_route_id", None)
+    }
+    route_ids.discard(None)
+    # values of the save, the instance may change before the commit
+    data = {
+        "id": flight_id,
+        "name": instance.name,
+        "route": instance.route_id,
+        "departure_time": instance.departure_time,
+        "arrival_time": instance.arrival_time,
+        "departure_time_utc": instance.departure_time_utc,
+        "arrival_time_utc": instance.arrival_time_utc,
+        "is_completed": instance.is_completed,
+    }
+    transaction.on_commit(lambda: flight_index.flight_saved(instance))
+    transaction.on_commit(lambda: route_graph.forget_durations(route_ids))
+    transaction.on_commit(
+        lambda: flight_changed(flight_id, route_ids, data)
+    )
+    instance._loaded_route_id = instance.route_id
+
+
+@receiver(post_delete, sender=Flight)
+def flight_deleted(sender, instance, **kwargs):
+    flight_id = instance.id
+    route_ids = {instance.route_id}
+    data = {"id": flight_id, "deleted": True}
+    transaction.on_commit(lambda: flight_index.flight_deleted(flight_id))
+    transaction.on_commit(lambda: route_graph.forget_durations(route_ids))
+    transaction.on_commit(
+        lambda: flight_changed(flight_id, route_ids, data)
+    )
+
+
+@receiver(post_save, sender=Route)
+def route_saved(sender, instance, created, **kwargs):
+    # source or destination of flights may change (rarely),
+    # loaded days are reloaded on demand
+    if created:
+        # ids of rolled back rows may be reused
+        flight_zones.forget(route_id=instance.id)
+    else:
+        transaction.on_commit(flight_index.clear)
+        transaction.on_commit(flight_zones.clear)
+    transaction.on_commit(route_graph.clear)
+    # graphs of other processes (airports are versioned as reference data)
+    transaction.on_commit(lambda: bump_versions(Route))
+
+
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def route_network_changed(sender, **kwargs):
+    transaction.on_commit(route_graph.clear)
+    if sender is Route:
+        transaction.on_commit(lambda: bump_versions(Route))
+
+
+@receiver(pre_save, sender=Airport)
+def airport_saving(sender, instance, **kwargs):
+    instance._time_zone_changed = (
+        instance.pk is not None
+        and Airport.objects.filter(pk=instance.pk)
+        .exclude(time_zone_id=instance.time_zone_id)
+        .exists()
+    )
+
+
+@receiver(post_save, sender=Airport)
+def airport_saved(sender, instance, **kwargs):
+    # coordinates & time zone may change
+    transaction.on_commit(airport_distances.clear)
+    transaction.on_commit(flight_zones.clear)
+    if instance._time_zone_changed:
+        airport_ids = [instance.id]
+        transaction.on_commit(lambda: recompute_flight_times(airport_ids))
+
+
+@receiver(pre_save, sender=AirportTimeZone)
+def time_zone_saving(sender, instance, **kwargs):
+    instance._name_changed = (
+        instance.pk is not None
+        and AirportTimeZone.objects.filter(pk=instance.pk)
+        .exclude(name=instance.name)
+        .exists()
+    )
+
+
+@receiver(post_save, sender=AirportTimeZone)
+def time_zone_saved(sender, instance, created, **kwargs):
+    if created:
+        flight_zones.forget(time_zone_id=instance.id)
+    else:
+        transaction.on_commit(flight_zones.clear)
+    if instance._name_changed:
+        airport_ids = list(instance.airports.values_list("id", flat=True))
+        transaction.on_commit(lambda: recompute_flight_times(airport_ids))
+
+
+def reference_data_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_versions(sender))
+
+
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(reference_data_changed, sender=versioned_model)
+    post_delete.connect(reference_data_changed, sender=versioned_model)
@@ -123,7 +123,7 @@ class AdminApiTests(TestCase):
 
     def test_create_time_zone(self):
         payload = {
-            "name": "Spain/Madrid",
+            "name": "Europe/Madrid",
         }
         self.create_instance(TIMEZONE_URL, payload, AirportTimeZone)
 
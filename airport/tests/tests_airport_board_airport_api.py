@@ -0,0 +1,427 @@
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from unittest import skipUnless
+
+import pytz
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.boards import BOARD_CACHE_ROWS, BOARD_SIZE, board_rows
+from airport.models import (
+    AirportTimeZone,
+    City,
+    Country,
+    Flight,
+    FlightSchedule,
+    Route,
+)
+from airport.schedules import expand_schedule
+from airport.tests.urls_and_sample_functions import (
+    AIRPORT_URL,
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+)
+from airport.time_zones import flight_zones
+
+
+def board_url(airport_id):
+    return reverse("airport:airport-board", args=[airport_id])
+
+
+class AirportBoardTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        self.kyiv = sample_airport(
+            name="Boryspil",
+            cod_iata="KBP",
+            closest_big_city=City.objects.create(
+                name="Kyiv", country=Country.objects.create(name="Ukraine")
+            ),
+            time_zone=AirportTimeZone.objects.create(name="Europe/Kyiv"),
+        )
+        self.warsaw = sample_airport(
+            name="Chopin",
+            cod_iata="WAW",
+            closest_big_city=City.objects.create(
+                name="Warsaw", country=Country.objects.create(name="Poland")
+            ),
+            time_zone=AirportTimeZone.objects.create(name="Europe/Warsaw"),
+        )
+        airplane = sample_airplane()
+        to_warsaw = Route.objects.create(
+            source=self.kyiv, destination=self.warsaw
+        )
+        to_kyiv = Route.objects.create(
+            source=self.warsaw, destination=self.kyiv
+        )
+
+        # 2025-01-07 22:30 UTC, after midnight in Kyiv & Warsaw
+        self.after_midnight = sample_flight(
+            name="PS - 001",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 1, 8, 0, 30),
+            arrival_time=datetime(2025, 1, 8, 0, 40),
+        )
+        self.morning = sample_flight(
+            name="PS - 003",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 1, 8, 7, 40),
+            arrival_time=datetime(2025, 1, 8, 7, 50),
+        )
+        self.day_before = sample_flight(
+            name="PS - 005",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 1, 7, 20, 0),
+            arrival_time=datetime(2025, 1, 7, 20, 10),
+        )
+        self.back = sample_flight(
+            name="PS - 002",
+            route=to_kyiv,
+            airplane=airplane,
+            departure_time=datetime(2025, 1, 8, 10, 0),
+            arrival_time=datetime(2025, 1, 8, 13, 10),
+        )
+
+    def board(self, airport, **params):
+        response = self.client.get(board_url(airport.id), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_local_dates_on_save(self):
+        self.assertEqual(
+            self.after_midnight.departure_time_utc,
+            datetime(2025, 1, 7, 22, 30, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(
+            self.after_midnight.departure_local_date, date(2025, 1, 8)
+        )
+        self.assertEqual(
+            self.after_midnight.arrival_local_date, date(2025, 1, 8)
+        )
+
+        self.day_before.arrival_time = datetime(2025, 1, 8, 0, 10)
+        self.day_before.save()
+        self.day_before.refresh_from_db()
+        self.assertEqual(
+            self.day_before.departure_local_date, date(2025, 1, 7)
+        )
+        self.assertEqual(
+            self.day_before.arrival_local_date, date(2025, 1, 8)
+        )
+
+    def test_departures_of_local_day(self):
+        with self.assertNumQueries(2):
+            board = self.board(self.kyiv, date="2025-01-08")
+
+        self.assertEqual(board["airport"], "KBP")
+        self.assertEqual(board["direction"], "departures")
+        self.assertEqual(board["date"], "2025-01-08")
+        self.assertEqual(
+            [flight["id"] for flight in board["flights"]],
+            [self.after_midnight.id, self.morning.id],
+        )
+        self.assertEqual(board["flights"][0]["airport"], "WAW")
+        self.assertEqual(board["flights"][0]["city"], "Warsaw")
+        self.assertEqual(
+            board["flights"][0]["airline_company"], "Aerolineas Argentinas"
+        )
+
+    def test_arrivals_of_local_day(self):
+        board = self.board(self.kyiv, direction="arrivals", date="2025-01-08")
+
+        self.assertEqual(
+            [flight["id"] for flight in board["flights"]], [self.back.id]
+        )
+        self.assertEqual(board["flights"][0]["airport"], "WAW")
+
+        board = self.board(
+            self.warsaw, direction="arrivals", date="2025-01-07"
+        )
+        self.assertEqual(
+            [flight["id"] for flight in board["flights"]],
+            [self.day_before.id],
+        )
+
+    def test_invalid_params(self):
+        for params in (
+                {"direction": "transfers"},
+                {"direction": "transfers", "date": "2025-01-08"},
+                {"date": "2025-13-01"},
+                {"date": "tomorrow"},
+        ):
+            response = self.client.get(board_url(self.kyiv.id), params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn(next(iter(params)), response.data)
+
+
+def local_hours_from_now(zone: str, hours: int) -> datetime:
+    """Wall-clock time of the zone (digits of local time of flights)"""
+    return (
+        datetime.now(pytz.timezone(zone)) + timedelta(hours=hours)
+    ).replace(tzinfo=None, microsecond=0)
+
+
+class NextFlightsBoardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        flight_zones.clear()
+
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        self.source = self.route.source
+        self.destination = self.route.destination
+        self.departed = self.sample_flight(-2, name="AR - 001")
+        self.later = self.sample_flight(5, name="AR - 005")
+        self.next = self.sample_flight(3, name="AR - 003")
+        self.completed = self.sample_flight(4, name="AR - 004")
+        Flight.objects.filter(id=self.completed.id).update(is_completed=True)
+
+    def sample_flight(self, hours: int, route=None, **params):
+        route = route or self.route
+        return sample_flight(
+            route=route,
+            airplane=self.airplane,
+            departure_time=local_hours_from_now(
+                route.source.time_zone.name, hours
+            ),
+            arrival_time=local_hours_from_now(
+                route.destination.time_zone.name, hours + 12
+            ),
+            **params,
+        )
+
+    def next_flights(self, airport, **params):
+        response = self.client.get(board_url(airport.id), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in response.data["flights"]]
+
+    def test_next_flights(self):
+        response = self.client.get(board_url(self.source.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["airport"], "EZE")
+        self.assertEqual(response.data["direction"], "departures")
+        self.assertIsNone(response.data["date"])
+        self.assertEqual(
+            [flight["id"] for flight in response.data["flights"]],
+            [self.next.id, self.later.id],
+        )
+        self.assertEqual(response.data["flights"][0]["airport"], "BCN")
+        self.assertEqual(
+            self.next_flights(self.destination, direction="arrivals"),
+            [self.departed.id, self.next.id, self.later.id],
+        )
+
+    def test_cached_without_queries(self):
+        self.next_flights(self.source)
+
+        with self.assertNumQueries(0):
+            flights = self.next_flights(self.source)
+
+        self.assertEqual(flights, [self.next.id, self.later.id])
+
+    def test_updated_on_save_without_rebuild(self):
+        self.next_flights(self.source)
+        self.next_flights(self.destination, direction="arrivals")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.sample_flight(1, name="AR - 000")
+            self.later.departure_time = local_hours_from_now(
+                self.source.time_zone.name, 2
+            )
+            self.later.save()
+            self.next.delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                self.next_flights(self.source), [first.id, self.later.id]
+            )
+            self.assertEqual(
+                self.next_flights(self.destination, direction="arrivals"),
+                [self.departed.id, first.id, self.later.id],
+            )
+
+    def test_moved_and_completed_flights_leave_boards(self):
+        self.next_flights(self.source)
+        other_route = sample_route(
+            source=self.destination, destination=self.source
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = Flight.objects.get(id=self.next.id)
+            flight.route = other_route
+            flight.departure_time = local_hours_from_now(
+                other_route.source.time_zone.name, 3
+            )
+            flight.save()
+            later = Flight.objects.get(id=self.later.id)
+            later.is_completed = True
+            later.save()
+
+        self.assertEqual(self.next_flights(self.source), [])
+        self.assertEqual(self.next_flights(self.destination), [self.next.id])
+
+    def test_flights_after_a_full_board(self):
+        flights = flight_zones.set_times_utc([
+            Flight(
+                name=f"AR - {100 + hours}",
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=local_hours_from_now(
+                    self.source.time_zone.name, 10 + hours
+                ),
+                arrival_time=local_hours_from_now(
+                    self.destination.time_zone.name, 22 + hours
+                ),
+            )
+            for hours in range(BOARD_CACHE_ROWS)
+        ])
+        Flight.objects.bulk_create(flights)
+        shown = self.next_flights(self.source)
+        self.assertEqual(len(shown), BOARD_SIZE)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # beyond the cached rows: not known flights may be before it
+            self.sample_flight(10 + BOARD_CACHE_ROWS + 5, name="AR - 999")
+            first = self.sample_flight(1, name="AR - 000")
+
+        with self.assertNumQueries(0):
+            flights = self.next_flights(self.source)
+        self.assertEqual(flights, [first.id, *shown[:BOARD_SIZE - 1]])
+
+    def test_schedule_expansion_clears_boards(self):
+        self.next_flights(self.source)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule = FlightSchedule.objects.create(
+                name="AR - 1133",
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=time(6, 0),
+                arrival_time=time(14, 0),
+                weekdays="1234567",
+                valid_from=date.today() + timedelta(days=2),
+                valid_until=date.today() + timedelta(days=2),
+            )
+            expand_schedule(schedule)
+
+        self.assertEqual(len(self.next_flights(self.source)), 3)
+
+    def test_unknown_airport(self):
+        for airport_id in (0, "abc"):
+            response = self.client.get(
+                reverse("airport:airport-board", args=[airport_id])
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_token_required(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+
+        response = self.client.get(board_url(self.source.id))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_polls_throttled_by_board_rate(self):
+        # more polls than the daily rate of other endpoints
+        for _ in range(60):
+            self.next_flights(self.source)
+
+        response = self.client.get(board_url(self.source.id))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(
+            self.client.get(AIRPORT_URL).status_code, status.HTTP_200_OK
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL query plans")
+class AirportBoardQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        time_zone = AirportTimeZone.objects.create(name="Europe/Kyiv")
+        city = City.objects.create(
+            name="Kyiv", country=Country.objects.create(name="Ukraine")
+        )
+        cls.airports = [
+            sample_airport(
+                name=f"Airport {code}",
+                cod_iata=code,
+                closest_big_city=city,
+                time_zone=time_zone,
+            )
+            for code in ("KBP", "WAW", "LHR", "CDG", "FRA", "AMS", "IST",
+                         "MAD", "BCN", "FCO", "VIE", "PRG", "BUD", "OSL")
+        ]
+        routes = Route.objects.bulk_create([
+            Route(source=source, destination=destination)
+            for source in cls.airports
+            for destination in cls.airports
+            if source != destination
+        ])
+        airplane = sample_airplane()
+        start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        flights = []
+        for number in range(20000):
+            departure = start + timedelta(hours=number)
+            arrival = departure + timedelta(hours=2)
+            flights.append(Flight(
+                name=f"PS - {number}",
+                route=routes[number % len(routes)],
+                airplane=airplane,
+                departure_time=departure,
+                arrival_time=arrival,
+                departure_time_utc=departure,
+                arrival_time_utc=arrival,
+                departure_local_date=departure.date(),
+                arrival_local_date=arrival.date(),
+            ))
+        Flight.objects.bulk_create(flights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE airport_airport, airport_route, airport_flight"
+            )
+
+    def test_board_uses_local_date_indexes(self):
+        for direction, field in (
+                ("departures", "departure_local_date"),
+                ("arrivals", "arrival_local_date"),
+        ):
+            index = next(
+                index for index in Flight._meta.indexes
+                if index.fields == ["route", field]
+            )
+            plan = board_rows(
+                self.airports[0].id, direction, date(2025, 3, 10)
+            ).explain()
+
+            self.assertIn(index.name, plan)
+            self.assertNotIn("Seq Scan on airport_flight", plan)
@@ -445,7 +445,7 @@ class AuthenticatedApiTests(TestCase):
         )
 
         serializer = FlightListSerializer(flight)
-        self.assertEqual(serializer.data["duration"], "20h 21m")
+        self.assertEqual(serializer.data["duration"], "20h 0m")
         self.assertEqual(serializer.data["crew_members"][0], crew1.full_name)
 
     #  update forbidden
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from contextlib import suppress
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.board_events import board_events
+from airport.models import Flight
+from airport.tests.urls_and_sample_functions import (
+    sample_airplane,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+
+def events_url(airport_id):
+    return reverse("airport:airport-board-events", args=[airport_id])
+
+
+async def close_stream(stream) -> None:
+    """Disconnect: the server cancels the task waiting for the stream"""
+    reading = asyncio.create_task(anext(stream))
+    await asyncio.sleep(0)
+    reading.cancel()
+    with suppress(asyncio.CancelledError):
+        await reading
+
+
+async def next_message(stream) -> str:
+    return (await anext(stream)).decode()
+
+
+async def next_event(stream) -> tuple:
+    message = await next_message(stream)
+    lines = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return lines["event"], json.loads(lines["data"])
+
+
+class BoardEventsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.token = str(AccessToken.for_user(self.user))
+        flight_zones.clear()
+        self.route = sample_route()
+        self.flight = sample_flight(
+            route=self.route, airplane=sample_airplane()
+        )
+
+    async def open_stream(self, airport_id, **params):
+        response = await self.async_client.get(
+            events_url(airport_id),
+            params,
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await next_message(stream), "retry: 3000\n\n")
+        return stream
+
+    @sync_to_async
+    def save_flight(self, **changes):
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = Flight.objects.get(id=self.flight.id)
+            for name, value in changes.items():
+                setattr(flight, name, value)
+            flight.save()
+        return flight
+
+    async def test_flight_changes_of_airport(self):
+        source = await self.open_stream(self.route.source_id)
+        destination = await self.open_stream(self.route.destination_id)
+
+        await self.save_flight(
+            departure_time=utc(2025, 1, 7, 21, 25), is_completed=True
+        )
+
+        for stream in (source, destination):
+            event, data = await next_event(stream)
+            self.assertEqual(event, "flight")
+            self.assertEqual(data["id"], self.flight.id)
+            self.assertEqual(data["departure_time"], "2025-01-07T21:25:00Z")
+            self.assertEqual(
+                data["departure_time_utc"], "2025-01-08T00:25:00Z"
+            )
+            self.assertTrue(data["is_completed"])
+            self.assertEqual(data["source"], self.route.source_id)
+            await close_stream(stream)
+
+    async def test_deleted_flight(self):
+        stream = await self.open_stream(self.route.source_id)
+
+        @sync_to_async
+        def delete_flight():
+            with self.captureOnCommitCallbacks(execute=True):
+                Flight.objects.get(id=self.flight.id).delete()
+
+        await delete_flight()
+
+        self.assertEqual(
+            await next_event(stream),
+            ("flight", {"id": self.flight.id, "deleted": True}),
+        )
+        await close_stream(stream)
+
+    async def test_keep_alive_and_unsubscribe(self):
+        with mock.patch("airport.board_events.KEEP_ALIVE_SECONDS", 0.01):
+            stream = await self.open_stream(self.route.source_id)
+
+            self.assertEqual(await next_message(stream), ": keep-alive\n\n")
+
+        self.assertEqual(board_events.subscribers(self.route.source_id), 1)
+        await close_stream(stream)
+        self.assertEqual(board_events.subscribers(self.route.source_id), 0)
+
+    async def test_slow_client_is_reset(self):
+        stream = await self.open_stream(self.route.source_id)
+
+        with mock.patch("airport.board_events.MAX_QUEUED_EVENTS", 2):
+            slow = await self.open_stream(self.route.destination_id)
+        for _ in range(3):
+            await self.save_flight(is_completed=True)
+
+        self.assertEqual((await next_event(slow))[0], "reset")
+        self.assertEqual((await next_event(stream))[0], "flight")
+        await close_stream(stream)
+        await close_stream(slow)
+
+    async def test_token_in_query_string(self):
+        response = await self.async_client.get(
+            events_url(self.route.source_id), {"token": self.token}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        await close_stream(aiter(response.streaming_content))
+
+    async def test_token_and_airport_required(self):
+        for headers, airport_id, code in (
+                ({}, self.route.source_id, status.HTTP_401_UNAUTHORIZED),
+                (
+                    {"Authorization": "Bearer invalid"},
+                    self.route.source_id,
+                    status.HTTP_401_UNAUTHORIZED,
+                ),
+                (
+                    {"Authorization": f"Bearer {self.token}"},
+                    0,
+                    status.HTTP_404_NOT_FOUND,
+                ),
+        ):
+            response = await self.async_client.get(
+                events_url(airport_id), headers=headers
+            )
+            self.assertEqual(response.status_code, code)
+
+    async def test_stream_ends_with_token(self):
+        with mock.patch("airport.board_events.time.time", return_value=2e10):
+            stream = await self.open_stream(self.route.source_id)
+
+            self.assertEqual(await next_event(stream), ("expired", {}))
+            with self.assertRaises(StopAsyncIteration):
+                await anext(stream)
+        self.assertEqual(board_events.subscribers(self.route.source_id), 0)
@@ -0,0 +1,243 @@
+import random
+import threading
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.booking import book_order, SeatsUnavailable
+from airport.models import Order, Ticket, SEAT_LETTERS
+from airport.serializers import OrderSerializer
+from airport.tests.urls_and_sample_functions import (
+    ORDER_URL,
+    sample_airplane,
+    sample_flight,
+    sample_route,
+)
+
+
+class BookingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def post_order(self, tickets):
+        return self.client.post(
+            ORDER_URL, {"tickets": tickets}, format="json"
+        )
+
+    def group_booking(self, flight, size):
+        return [
+            {"row": row, "seat": seat, "flight": flight.id}
+            for row in range(1, size // 6 + 2)
+            for seat in SEAT_LETTERS[:6]
+        ][:size]
+
+    def test_group_booking_creates_all_tickets(self):
+        response = self.post_order(self.group_booking(self.flight, 40))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.tickets.count(), 40)
+        self.assertEqual(len(response.data["tickets"]), 40)
+
+    def test_group_booking_queries_do_not_grow_with_tickets(self):
+        other_flight = sample_flight(
+            name="AB - 008",
+            route=self.flight.route,
+            airplane=sample_airplane(name="Boeing 737"),
+        )
+        counts = []
+        for flight in (self.flight, other_flight):
+            size = 2 if flight == self.flight else 50
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post_order(self.group_booking(flight, size))
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_flight_is_fetched_once_per_order(self):
+        other_flight = sample_flight(
+            name="AB - 008", route=sample_route(
+                source=self.flight.route.destination,
+                destination=self.flight.route.source,
+            )
+        )
+        tickets = (
+            self.group_booking(self.flight, 10)
+            + self.group_booking(other_flight, 10)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_order(tickets)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        flight_queries = [
+            query for query in queries
+            if query["sql"].startswith('SELECT "airport_flight"."id"')
+            and '"airport_airplane"' in query["sql"]
+        ]
+        self.assertEqual(len(flight_queries), 2)
+
+    def test_seat_out_of_range(self):
+        response = self.post_order([
+            {"row": 1, "seat": "A", "flight": self.flight.id},
+            {"row": 1, "seat": "K", "flight": self.flight.id},
+            {"row": 25, "seat": "A", "flight": self.flight.id},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["tickets"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("seat", errors[1])
+        self.assertIn("row", errors[2])
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_seat_requested_twice(self):
+        response = self.post_order([
+            {"row": 1, "seat": "A", "flight": self.flight.id},
+            {"row": 1, "seat": "A", "flight": self.flight.id},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat", response.data["tickets"][1])
+
+    def test_seat_already_taken(self):
+        Ticket.objects.create(
+            row=3,
+            seat="C",
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+        response = self.post_order([
+            {"row": 3, "seat": "B", "flight": self.flight.id},
+            {"row": 3, "seat": "C", "flight": self.flight.id},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["tickets"][0], {})
+        self.assertIn("seat", response.data["tickets"][1])
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_seats_lost_to_concurrent_order(self):
+        serializer = OrderSerializer(data={"tickets": [
+            {"row": 5, "seat": "A", "flight": self.flight.id},
+            {"row": 5, "seat": "B", "flight": self.flight.id},
+        ]})
+        self.assertTrue(serializer.is_valid())
+        # another order takes the seat after validation
+        Ticket.objects.create(
+            row=5,
+            seat="B",
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+
+        with self.assertRaises(SeatsUnavailable) as error:
+            serializer.save(user=self.user)
+
+        self.assertEqual(
+            error.exception.detail["seats"],
+            [{"flight": self.flight.id, "row": 5, "seat": "B"}],
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_order_conflict_response(self):
+        Ticket.objects.create(
+            row=7,
+            seat="F",
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+        with mock.patch("airport.serializers.check_seats"):
+            response = self.post_order([
+                {"row": 7, "seat": "F", "flight": self.flight.id},
+            ])
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"],
+            [{"flight": self.flight.id, "row": 7, "seat": "F"}],
+        )
+
+
+@skipUnless(
+    connection.features.has_select_for_update,
+    "row-level locks are required",
+)
+class ConcurrentBookingTests(TransactionTestCase):
+    threads = 8
+    orders_per_thread = 15
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.flight = sample_flight(
+            airplane=sample_airplane(rows=20, seats_in_row=6)
+        )
+
+    def book_randomly(self, results, seed):
+        rng = random.Random(seed)
+        seats = [
+            (row, seat)
+            for row in range(1, 21)
+            for seat in SEAT_LETTERS[:6]
+        ]
+        try:
+            for _ in range(self.orders_per_thread):
+                tickets_data = [
+                    {"row": row, "seat": seat, "flight": self.flight}
+                    for row, seat in rng.sample(seats, 3)
+                ]
+                try:
+                    order = book_order(tickets_data, user=self.user)
+                except SeatsUnavailable as error:
+                    results["lost"].append(error.detail["seats"])
+                else:
+                    results["booked"].append((order.id, tickets_data))
+        finally:
+            connections.close_all()
+
+    def test_no_lost_or_duplicate_seats_under_contention(self):
+        results = {"booked": [], "lost": []}
+        workers = [
+            threading.Thread(target=self.book_randomly, args=(results, seed))
+            for seed in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        attempts = self.threads * self.orders_per_thread
+        self.assertEqual(
+            len(results["booked"]) + len(results["lost"]), attempts
+        )
+        booked_seats = [
+            (ticket["row"], ticket["seat"])
+            for _, tickets_data in results["booked"]
+            for ticket in tickets_data
+        ]
+        stored_seats = list(
+            Ticket.objects.filter(flight=self.flight)
+            .values_list("row", "seat")
+        )
+        # every confirmed seat is stored once, nothing else is stored
+        self.assertEqual(len(booked_seats), len(set(booked_seats)))
+        self.assertEqual(sorted(booked_seats), sorted(stored_seats))
+        self.assertEqual(Order.objects.count(), len(results["booked"]))
+        # seats reported as lost are really taken by other orders
+        for lost_seats in results["lost"]:
+            for seat in lost_seats:
+                self.assertIn((seat["row"], seat["seat"]), stored_seats)
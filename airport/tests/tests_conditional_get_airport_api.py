@@ -0,0 +1,192 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from airport.importer import import_reference_data
+from airport.models import City, Country
+from airport.tests.urls_and_sample_functions import (
+    AIRPORT_URL,
+    CITY_URL,
+    COUNTRY_URL,
+    FLIGHT_URL,
+    TIMEZONE_URL,
+    sample_airport,
+)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.country = Country.objects.create(name="Ukraine")
+        self.city = City.objects.create(name="Kyiv", country=self.country)
+
+    def get_etag(self, url, params=None) -> str:
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def test_not_modified_without_queries(self):
+        etag = self.get_etag(COUNTRY_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_changes_on_save_and_delete(self):
+        etag = self.get_etag(COUNTRY_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.create(name="Poland")
+        response = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Country.objects.get(name="Poland").delete()
+        self.assertNotEqual(self.get_etag(COUNTRY_URL), etag)
+
+    def test_etag_changes_with_shown_models(self):
+        city_etag = self.get_etag(CITY_URL)
+        airport_etag = self.get_etag(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.country.name = "Ukraina"
+            self.country.save()
+
+        self.assertNotEqual(self.get_etag(CITY_URL), city_etag)
+        self.assertNotEqual(self.get_etag(AIRPORT_URL), airport_etag)
+
+    def test_etag_of_url(self):
+        detail_url = reverse("airport:country-detail", args=[self.country.id])
+
+        etags = {
+            self.get_etag(COUNTRY_URL),
+            self.get_etag(COUNTRY_URL, {"limit": 1}),
+            self.get_etag(detail_url),
+        }
+
+        self.assertEqual(len(etags), 3)
+        response = self.client.get(
+            detail_url, HTTP_IF_NONE_MATCH=self.get_etag(detail_url)
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bulk_import_changes_etag(self):
+        etag = self.get_etag(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            import_reference_data(
+                "countries", io.StringIO("name\nSpain\n"), "csv"
+            )
+
+        self.assertNotEqual(self.get_etag(AIRPORT_URL), etag)
+
+    def test_airport_created_by_admin_changes_etag(self):
+        etag = self.get_etag(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_airport(closest_big_city=self.city)
+
+        self.assertNotEqual(self.get_etag(AIRPORT_URL), etag)
+
+    def test_token_required_for_not_modified(self):
+        etag = self.get_etag(COUNTRY_URL)
+
+        for authorization in ("", "Bearer invalid"):
+            self.client.credentials(HTTP_AUTHORIZATION=authorization)
+            response = self.client.get(COUNTRY_URL, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+    def test_no_etag_of_other_endpoints(self):
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertNotIn("ETag", response)
+
+
+@override_settings(RESPONSE_CACHE_SECONDS=60)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        self.country = Country.objects.create(name="Ukraine")
+        self.city = City.objects.create(name="Kyiv", country=self.country)
+        sample_airport(cod_iata="KBP", closest_big_city=self.city)
+
+    def test_cached_without_queries(self):
+        response = self.client.get(CITY_URL)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(CITY_URL)
+
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached["Content-Type"], response["Content-Type"])
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_parent_change_evicts_lists(self):
+        self.client.get(CITY_URL)
+        self.client.get(AIRPORT_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.country.name = "Ukraina"
+            self.country.save()
+
+        cities = self.client.get(CITY_URL).json()["results"]
+        airports = self.client.get(AIRPORT_URL).json()["results"]
+        self.assertEqual(cities[0]["country"], "Ukraina")
+        self.assertEqual(airports[0]["country"], "Ukraina")
+
+    def test_per_query_string(self):
+        self.client.get(CITY_URL, {"limit": 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            City.objects.create(name="Lviv", country=self.country)
+
+        self.assertEqual(self.client.get(CITY_URL).json()["count"], 2)
+
+    def test_only_opted_in_viewsets(self):
+        self.client.get(TIMEZONE_URL)
+
+        with self.assertNumQueries(3):
+            self.client.get(TIMEZONE_URL)
+
+    def test_browsable_api_not_cached(self):
+        self.client.get(CITY_URL, HTTP_ACCEPT="text/html")
+
+        response = self.client.get(CITY_URL, HTTP_ACCEPT="text/html")
+
+        self.assertTrue(hasattr(response, "data"))
+
+    @override_settings(RESPONSE_CACHE_SECONDS=0)
+    def test_disabled(self):
+        self.client.get(CITY_URL)
+
+        response = self.client.get(CITY_URL)
+
+        self.assertTrue(hasattr(response, "data"))
@@ -0,0 +1,161 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from airport.models import Flight, Order
+from airport.pagination import CURSOR_MAX_PAGE_SIZE, FlightCursorPagination
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    ORDER_URL,
+    sample_airplane,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        route = sample_route()
+        airplane = sample_airplane()
+        # equal departure times are ordered by id
+        for day, hour in ((9, 8), (7, 8), (7, 8), (8, 6), (7, 8), (9, 8)):
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=utc(2025, 1, day, hour, 0),
+                arrival_time=utc(2025, 1, day, hour + 5, 0),
+            )
+        Flight.objects.filter(
+            id=Flight.objects.order_by("id").values("id")[:1]
+        ).update(is_completed=True)
+        self.ordered_ids = list(
+            Flight.objects.order_by(
+                "is_completed", "departure_time", "id"
+            ).values_list("id", flat=True)
+        )
+
+    def walk(self, url, params=None):
+        """Ids of results of all pages & responses"""
+        ids, responses = [], []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            responses.append(response)
+            ids += [item["id"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return ids, responses
+            response = self.client.get(response.data["next"])
+
+    def test_flights_pages(self):
+        ids, responses = self.walk(
+            FLIGHT_URL, {"pagination": "cursor", "page_size": 2}
+        )
+
+        self.assertEqual(ids, self.ordered_ids)
+        self.assertEqual(len(responses), 3)
+        self.assertNotIn("count", responses[0].data)
+        self.assertIsNone(responses[0].data["previous"])
+
+    def test_flights_previous_page(self):
+        _, responses = self.walk(
+            FLIGHT_URL, {"pagination": "cursor", "page_size": 2}
+        )
+
+        response = self.client.get(responses[2].data["previous"])
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            self.ordered_ids[2:4],
+        )
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            self.ordered_ids[:2],
+        )
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_flights_filters_are_kept(self):
+        ids, _ = self.walk(FLIGHT_URL, {
+            "pagination": "cursor",
+            "page_size": 1,
+            "date": "2025-01-07",
+        })
+
+        self.assertEqual(ids, self.ordered_ids[:3])
+
+    def test_pages_cost_the_same(self):
+        sqls = []
+        url, params = FLIGHT_URL, {"pagination": "cursor", "page_size": 1}
+        for _ in range(3):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, params)
+            url, params = response.data["next"], None
+            sqls.append([query["sql"] for query in queries.captured_queries])
+
+        self.assertEqual(len(sqls[0]), len(sqls[2]))
+        for sql in sqls[0] + sqls[2]:
+            self.assertNotIn("COUNT(", sql)
+            self.assertNotIn("OFFSET", sql)
+
+    def test_page_size_is_capped(self):
+        factory = APIRequestFactory()
+        paginator = FlightCursorPagination()
+
+        for page_size, expected in (
+                ("1000", CURSOR_MAX_PAGE_SIZE), ("5", 5), ("x", 3)
+        ):
+            request = Request(factory.get("/", {"page_size": page_size}))
+            self.assertEqual(paginator.get_page_size(request), expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(FLIGHT_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_limit_offset_by_default(self):
+        response = self.client.get(FLIGHT_URL)
+
+        self.assertEqual(response.data["count"], 6)
+
+    def test_orders_pages(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="test12345",
+        )
+        Order.objects.create(user=other_user)
+        orders = [Order.objects.create(user=self.user) for _ in range(5)]
+        # the same created_at for some orders, the newest first & by id
+        created_at = utc(2025, 1, 1, 12, 0)
+        for order, shift in zip(orders, (0, 1, 1, 2, 1)):
+            Order.objects.filter(id=order.id).update(
+                created_at=created_at + timedelta(minutes=shift)
+            )
+        expected = list(
+            Order.objects.filter(user=self.user)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        ids, responses = self.walk(
+            ORDER_URL, {"pagination": "cursor", "page_size": 2}
+        )
+
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(responses), 3)
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.flight_times import complete_flights
+from airport.models import Flight
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airplane,
+    sample_flight,
+    sample_route,
+)
+from airport.time_zones import flight_zones
+from airport.views import FlightViewSet
+
+
+def local_days_from_now(days: int) -> datetime:
+    # local time of the airport, days are far beyond its UTC offset
+    return (datetime.now() + timedelta(days=days)).replace(microsecond=0)
+
+
+class FlightCompletionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        route = sample_route()
+        airplane = sample_airplane()
+        self.arrived = [
+            sample_flight(name="AR - 001", route=route, airplane=airplane),
+            sample_flight(
+                name="AR - 003",
+                route=route,
+                airplane=airplane,
+                departure_time=datetime(2025, 1, 9, 20, 55),
+                arrival_time=datetime(2025, 1, 10, 19, 45),
+            ),
+        ]
+        self.in_the_air = sample_flight(
+            name="AR - 005",
+            route=route,
+            airplane=airplane,
+            departure_time=local_days_from_now(-1),
+            arrival_time=local_days_from_now(1),
+        )
+        self.later = sample_flight(
+            name="AR - 009",
+            route=route,
+            airplane=airplane,
+            departure_time=local_days_from_now(5),
+            arrival_time=local_days_from_now(6),
+        )
+        self.next = sample_flight(
+            name="AR - 007",
+            route=route,
+            airplane=airplane,
+            departure_time=local_days_from_now(2),
+            arrival_time=local_days_from_now(3),
+        )
+
+    def test_complete_flights_command(self):
+        out = StringIO()
+
+        call_command("complete_flights", "--batch-size", "1", stdout=out)
+
+        self.assertIn("Completed 2 flights", out.getvalue())
+        self.assertEqual(
+            set(
+                Flight.objects.filter(is_completed=True)
+                .values_list("id", flat=True)
+            ),
+            {flight.id for flight in self.arrived},
+        )
+        out = StringIO()
+        call_command("complete_flights", stdout=out)
+        self.assertIn("Completed 0 flights", out.getvalue())
+
+    def test_upcoming_flights(self):
+        response = self.client.get(FLIGHT_URL, {"upcoming": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.next.id, self.later.id],
+        )
+
+        Flight.objects.filter(id=self.next.id).update(is_completed=True)
+        response = self.client.get(FLIGHT_URL, {"upcoming": "1"})
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.later.id],
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL query plans")
+class UpcomingFlightsQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        route = sample_route()
+        airplane = sample_airplane()
+        start = datetime.now(dt_timezone.utc) - timedelta(hours=19500)
+        flights = []
+        for number in range(20000):
+            departure = start + timedelta(hours=number)
+            flights.append(Flight(
+                name=f"AR - {number}",
+                route=route,
+                airplane=airplane,
+                departure_time=departure,
+                arrival_time=departure + timedelta(hours=2),
+                departure_time_utc=departure,
+                arrival_time_utc=departure + timedelta(hours=2),
+                departure_local_date=departure.date(),
+                arrival_local_date=(departure + timedelta(hours=2)).date(),
+                # 95% of flights are history
+                is_completed=number < 19000,
+            ))
+        Flight.objects.bulk_create(flights)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE airport_flight")
+
+    def test_upcoming_uses_partial_index(self):
+        plan = FlightViewSet._upcoming(Flight.objects.all())[:10].explain()
+
+        self.assertIn("flight_upcoming_departure_idx", plan)
+        self.assertNotIn("Seq Scan on airport_flight", plan)
+
+    def test_complete_flights_reads_no_history(self):
+        with transaction.atomic():
+            # a batch is a small part of the table, as 5000 flights
+            # of a production one
+            with CaptureQueriesContext(connection) as queries:
+                completed = complete_flights(batch_size=100)
+
+            self.assertGreater(completed, 400)
+            self.assertFalse(
+                Flight.objects.filter(
+                    is_completed=False,
+                    arrival_time_utc__lte=datetime.now(dt_timezone.utc),
+                ).exists()
+            )
+            # queries are explained with the flights they ran on
+            transaction.set_rollback(True)
+
+        # ids & UPDATE of each batch, ids of the last one (nothing left)
+        self.assertEqual(len(queries), 2 * -(-completed // 100) + 1)
+        plans = []
+        for query in queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN {query['sql']}")
+                plans.append("\n".join(row[0] for row in cursor.fetchall()))
+            self.assertNotIn("Seq Scan on airport_flight", plans[-1])
+        self.assertIn("flight_upcoming_departure_idx", plans[0])
@@ -0,0 +1,121 @@
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.tests.urls_and_sample_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+EXPORT_URL = reverse("airport:flight-export")
+
+
+def streamed(response) -> str:
+    return b"".join(response.streaming_content).decode()
+
+
+class UnauthenticatedFlightExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_auth_required(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class FlightExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        self.route = sample_route()
+        self.airplane = sample_airplane()
+        self.flight = sample_flight(route=self.route, airplane=self.airplane)
+        self.other_flight = sample_flight(
+            name="KBP - 1",
+            route=sample_route(
+                source=sample_airport(name="Boryspil", cod_iata="KBP"),
+                destination=self.route.destination,
+            ),
+            airplane=self.airplane,
+            departure_time=utc(2025, 1, 9, 8, 0),
+            arrival_time=utc(2025, 1, 9, 16, 30),
+        )
+
+    def test_export_ndjson(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn("flights.ndjson", response["Content-Disposition"])
+        rows = [json.loads(line) for line in streamed(response).splitlines()]
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [self.flight.id, self.other_flight.id],
+        )
+        self.assertEqual(rows[0], {
+            "id": self.flight.id,
+            "name": "AB - 007",
+            "airline_company": "Aerolineas Argentinas",
+            "airplane": "Boeing 747",
+            "route": self.route.id,
+            "source": "EZE",
+            "destination": "BCN",
+            "departure_time": "2025-01-07T20:55:00Z",
+            "arrival_time": "2025-01-08T19:45:00Z",
+            "departure_time_utc": "2025-01-07T23:55:00Z",
+            "arrival_time_utc": "2025-01-08T18:45:00Z",
+            "is_completed": False,
+        })
+
+    def test_export_csv(self):
+        response = self.client.get(EXPORT_URL, {"output": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(streamed(response).splitlines()))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]["name"], "KBP - 1")
+        self.assertEqual(rows[1]["source"], "KBP")
+        self.assertEqual(rows[1]["departure_time"], "2025-01-09T08:00:00Z")
+
+    def test_export_filtered_as_list(self):
+        response = self.client.get(EXPORT_URL, {"source": "kbp"})
+
+        rows = [json.loads(line) for line in streamed(response).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.other_flight.id])
+
+    def test_export_invalid_output(self):
+        response = self.client.get(EXPORT_URL, {"output": "xml"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("output", response.data)
+
+    def test_export_one_query_for_all_rows(self):
+        for day in range(10, 20):
+            sample_flight(
+                route=self.route,
+                airplane=self.airplane,
+                departure_time=utc(2025, 1, day, 8, 0),
+                arrival_time=utc(2025, 1, day, 20, 0),
+            )
+
+        with self.assertNumQueries(1):
+            lines = streamed(self.client.get(EXPORT_URL)).splitlines()
+
+        self.assertEqual(len(lines), 12)
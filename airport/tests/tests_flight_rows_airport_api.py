@@ -0,0 +1,93 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from airport.models import Crew, Flight, Role
+from airport.serializers import FlightListSerializer
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airplane,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+
+@skipUnless(connection.vendor == "postgresql", "ArrayAgg of PostgreSQL")
+class FlightRowsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        pilot = Role.objects.create(name="Pilot")
+        attendant = Role.objects.create(name="Flight Attendant")
+        self.crew = [
+            Crew.objects.create(first_name="Ann", last_name="Lee", role=pilot),
+            Crew.objects.create(
+                first_name="Bob", last_name="Ray", role=attendant
+            ),
+        ]
+        route = sample_route()
+        airplane = sample_airplane()
+        for day in range(7, 12):
+            flight = sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=utc(2025, 1, day, 20, 55),
+                arrival_time=utc(2025, 1, day + 1, 19, 45),
+            )
+            flight.crew_members.add(*self.crew[:day % 3])
+
+    def test_same_data_as_serializer(self):
+        response = self.client.get(FLIGHT_URL, {"limit": 10})
+
+        flights = Flight.objects.order_by("is_completed", "departure_time")
+        self.assertEqual(
+            response.data["results"],
+            FlightListSerializer(flights, many=True).data,
+        )
+        self.assertEqual(
+            response.data["results"][1]["crew_members"],
+            ["Ann Lee: Pilot", "Bob Ray: Flight Attendant"],
+        )
+        self.assertEqual(response.data["results"][2]["crew_members"], [])
+
+    def test_queries_do_not_depend_on_rows(self):
+        # count & page, without crew queries
+        with self.assertNumQueries(2):
+            self.client.get(FLIGHT_URL, {"limit": 10})
+
+    def test_sparse_fields(self):
+        response = self.client.get(
+            FLIGHT_URL, {"limit": 1, "fields": "id,duration,crew_members"}
+        )
+
+        flight = Flight.objects.order_by("departure_time").first()
+        self.assertEqual(response.data["results"], [{
+            "id": flight.id,
+            "duration": "18h 50m",
+            "crew_members": ["Ann Lee: Pilot"],
+        }])
+
+    def test_cursor_pagination(self):
+        sizes = []
+        response = self.client.get(
+            FLIGHT_URL,
+            {"pagination": "cursor", "page_size": 2, "fields": "name"},
+        )
+        while True:
+            sizes.append(len(response.data["results"]))
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(sizes, [2, 2, 1])
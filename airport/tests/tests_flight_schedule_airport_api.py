@@ -0,0 +1,174 @@
+from datetime import date, time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import (
+    AirportTimeZone,
+    Crew,
+    Flight,
+    FlightSchedule,
+    Role,
+)
+from airport.schedules import expand_schedule
+from airport.tests.urls_and_sample_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+SCHEDULE_URL = reverse("airport:flightschedule-list")
+
+
+def expand_url(schedule_id):
+    return reverse("airport:flightschedule-expand", args=[schedule_id])
+
+
+class FlightScheduleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        self.route = sample_route(
+            source=sample_airport(
+                name="Boryspil",
+                cod_iata="KBP",
+                time_zone=AirportTimeZone.objects.create(name="Europe/Kyiv"),
+            ),
+            destination=sample_airport(
+                name="Humberto Delgado",
+                cod_iata="LIS",
+                time_zone=AirportTimeZone.objects.create(
+                    name="Europe/Lisbon"
+                ),
+            ),
+        )
+        self.airplane = sample_airplane()
+        role = Role.objects.create(name="Pilot")
+        self.crew = [
+            Crew.objects.create(first_name="Ann", last_name="Lee", role=role),
+            Crew.objects.create(first_name="Bob", last_name="Ray", role=role),
+        ]
+
+    def sample_schedule(self, **params):
+        defaults = {
+            "name": "PS - 101",
+            "route": self.route,
+            "airplane": self.airplane,
+            "weekdays": "135",
+            "departure_time": time(7, 40),
+            "arrival_time": time(9, 50),
+            "valid_from": date(2025, 3, 24),
+            "valid_until": date(2025, 4, 6),
+        }
+        defaults.update(params)
+        schedule = FlightSchedule.objects.create(**defaults)
+        schedule.crew_members.set(self.crew)
+        return schedule
+
+    def test_expand_schedule(self):
+        schedule = self.sample_schedule()
+
+        # existing flights, crew, route zones, flights & crew rows
+        # (+ savepoint & its release)
+        with self.assertNumQueries(5 + 2):
+            created = expand_schedule(schedule)
+
+        self.assertEqual(created, 6)
+        flights = Flight.objects.order_by("departure_time")
+        self.assertEqual(
+            [flight.departure_time.date() for flight in flights],
+            [date(2025, 3, 24), date(2025, 3, 26), date(2025, 3, 28),
+             date(2025, 3, 31), date(2025, 4, 2), date(2025, 4, 4)],
+        )
+        # Kyiv & Lisbon move clocks forward on 2025-03-30
+        self.assertEqual(
+            (flights[2].departure_time_utc, flights[2].arrival_time_utc),
+            (utc(2025, 3, 28, 5, 40), utc(2025, 3, 28, 9, 50)),
+        )
+        self.assertEqual(
+            (flights[3].departure_time_utc, flights[3].arrival_time_utc),
+            (utc(2025, 3, 31, 4, 40), utc(2025, 3, 31, 8, 50)),
+        )
+        self.assertEqual(
+            Flight.crew_members.through.objects.count(), 2 * created
+        )
+        self.assertEqual(list(flights[0].crew_members.all()), self.crew)
+        self.assertEqual(flights[0].schedule, schedule)
+
+    def test_expand_schedule_twice(self):
+        schedule = self.sample_schedule(arrival_day_offset=1)
+        expand_schedule(schedule)
+        schedule.valid_until = date(2025, 4, 13)
+        schedule.save()
+
+        self.assertEqual(expand_schedule(schedule, batch_size=2), 3)
+        self.assertEqual(schedule.flights.count(), 9)
+        self.assertEqual(
+            schedule.flights.order_by("departure_time").first().arrival_time,
+            utc(2025, 3, 25, 9, 50),
+        )
+
+    def test_create_and_expand_through_api(self):
+        response = self.client.post(
+            SCHEDULE_URL,
+            {
+                "name": "PS - 101",
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "weekdays": "7",
+                "departure_time": "07:40",
+                "arrival_time": "09:50",
+                "valid_from": "2025-03-24",
+                "valid_until": "2025-04-06",
+                "crew_members": [crew.id for crew in self.crew],
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(expand_url(response.data["id"]))
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {"created": 2})
+
+    def test_invalid_schedule(self):
+        for weekdays, valid_until in (("31", "2025-04-06"),
+                                      ("135", "2025-03-01"),
+                                      ("", "2025-04-06")):
+            response = self.client.post(
+                SCHEDULE_URL,
+                {
+                    "name": "PS - 101",
+                    "route": self.route.id,
+                    "airplane": self.airplane.id,
+                    "weekdays": weekdays,
+                    "departure_time": "07:40",
+                    "arrival_time": "09:50",
+                    "valid_from": "2025-03-24",
+                    "valid_until": valid_until,
+                },
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_expand_schedules_command(self):
+        schedule = self.sample_schedule()
+        self.sample_schedule(name="PS - 103", weekdays="2")
+
+        out = StringIO()
+        call_command("expand_schedules", schedule.id, stdout=out)
+
+        self.assertIn("Created 6 flights", out.getvalue())
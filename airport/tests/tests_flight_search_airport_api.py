@@ -0,0 +1,229 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import (
+    AirlineCompany,
+    AirportTimeZone,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Route,
+)
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airport,
+    sample_airplane,
+    sample_flight,
+    sample_role,
+)
+from airport.views import FlightViewSet
+
+
+class FlightSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        kyiv = sample_airport(
+            name="Boryspil",
+            cod_iata="KBP",
+            closest_big_city=City.objects.create(
+                name="Kyiv", country=Country.objects.create(name="Ukraine")
+            ),
+            time_zone=AirportTimeZone.objects.create(name="Europe/Kyiv"),
+        )
+        warsaw = sample_airport(
+            name="Chopin",
+            cod_iata="WAW",
+            closest_big_city=City.objects.create(
+                name="Warsaw", country=Country.objects.create(name="Poland")
+            ),
+            time_zone=AirportTimeZone.objects.create(name="Europe/Warsaw"),
+        )
+        airplane = sample_airplane()
+        to_warsaw = Route.objects.create(source=kyiv, destination=warsaw)
+        to_kyiv = Route.objects.create(source=warsaw, destination=kyiv)
+
+        self.morning = sample_flight(
+            name="PS - 001",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 3, 10, 7, 40),
+            arrival_time=datetime(2025, 3, 10, 8, 50),
+        )
+        self.evening = sample_flight(
+            name="PS - 003",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 3, 10, 21, 10),
+            arrival_time=datetime(2025, 3, 10, 22, 20),
+        )
+        self.next_day = sample_flight(
+            name="PS - 005",
+            route=to_warsaw,
+            airplane=airplane,
+            departure_time=datetime(2025, 3, 11, 7, 40),
+            arrival_time=datetime(2025, 3, 11, 8, 50),
+        )
+        self.back = sample_flight(
+            name="PS - 002",
+            route=to_kyiv,
+            airplane=airplane,
+            departure_time=datetime(2025, 3, 10, 10, 0),
+            arrival_time=datetime(2025, 3, 10, 13, 10),
+        )
+
+    def search(self, **params):
+        response = self.client.get(FLIGHT_URL, {"limit": 10, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in response.data["results"]]
+
+    def test_search_by_airports(self):
+        self.assertEqual(
+            self.search(source="KBP", destination="waw"),
+            [self.morning.id, self.evening.id, self.next_day.id],
+        )
+        self.assertEqual(self.search(source="WAW"), [self.back.id])
+
+    def test_search_by_date(self):
+        # 2025-03-10 21:10 in Kyiv (UTC+2) departs 19:10 UTC
+        self.assertEqual(
+            self.search(source="KBP", destination="WAW", date="2025-03-10"),
+            [self.morning.id, self.evening.id],
+        )
+
+    def test_search_by_departure_window(self):
+        self.assertEqual(
+            self.search(
+                source="KBP",
+                departure_after="2025-03-10T12:00",
+                departure_before="2025-03-11T05:00:00Z",
+            ),
+            [self.evening.id],
+        )
+        self.assertEqual(
+            self.search(departure_after="2025-03-10T22:00:00+02:00"),
+            [self.next_day.id],
+        )
+
+    def test_filter_by_companies_without_distinct(self):
+        role = sample_role()
+        self.morning.crew_members.add(
+            Crew.objects.create(
+                first_name="Olena", last_name="Koval", role=role
+            ),
+            Crew.objects.create(
+                first_name="Ivan", last_name="Bondar", role=role
+            ),
+        )
+        other = AirlineCompany.objects.create(
+            name="LOT", registration_country=Country.objects.get(name="Poland")
+        )
+        other_flight = sample_flight(
+            name="LO - 752",
+            route=self.back.route,
+            airplane=sample_airplane(
+                name="Embraer 195", airline_company=other
+            ),
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            flights = self.search(
+                companies=str(self.morning.airplane.airline_company_id)
+            )
+
+        self.assertEqual(
+            flights,
+            [self.morning.id, self.back.id, self.evening.id, self.next_day.id],
+        )
+        self.assertEqual(
+            self.search(companies=str(other.id)), [other_flight.id]
+        )
+        self.assertFalse(
+            any("DISTINCT" in query["sql"] for query in queries)
+        )
+
+    def test_search_invalid_date(self):
+        response = self.client.get(FLIGHT_URL, {"date": "2025-13-01"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date", response.data)
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL query plans")
+class FlightSearchQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        time_zone = AirportTimeZone.objects.create(name="Europe/Kyiv")
+        city = City.objects.create(
+            name="Kyiv", country=Country.objects.create(name="Ukraine")
+        )
+        airports = [
+            sample_airport(
+                name=f"Airport {code}",
+                cod_iata=code,
+                closest_big_city=city,
+                time_zone=time_zone,
+            )
+            for code in ("KBP", "WAW", "LHR", "CDG", "FRA", "AMS", "IST",
+                         "MAD", "BCN", "FCO", "VIE", "PRG", "BUD", "OSL")
+        ]
+        routes = Route.objects.bulk_create([
+            Route(source=source, destination=destination)
+            for source in airports
+            for destination in airports
+            if source != destination
+        ])
+        airplane = sample_airplane()
+        start = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+        Flight.objects.bulk_create([
+            Flight(
+                name=f"PS - {number}",
+                route=routes[number % len(routes)],
+                airplane=airplane,
+                departure_time=start + timedelta(hours=number),
+                arrival_time=start + timedelta(hours=number + 2),
+                departure_time_utc=start + timedelta(hours=number),
+                arrival_time_utc=start + timedelta(hours=number + 2),
+                departure_local_date=(start + timedelta(hours=number)).date(),
+                arrival_local_date=(
+                    start + timedelta(hours=number + 2)
+                ).date(),
+            )
+            for number in range(20000)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "ANALYZE airport_airport, airport_route, airport_flight"
+            )
+
+    def test_search_uses_indexes(self):
+        queryset = FlightViewSet._search(
+            Flight.objects.all(),
+            {"source": "KBP", "destination": "WAW", "date": "2025-03-10"},
+        )
+        plan = queryset.explain()
+
+        # flights are reached by (route, departure_time_utc) index only,
+        # small airport & route tables may be scanned
+        self.assertIn(
+            f"Index Scan using {Flight._meta.indexes[0].name}", plan
+        )
+        self.assertIn(
+            "Index Cond: ((route_id = airport_route.id) "
+            "AND (departure_time_utc >= ",
+            plan,
+        )
+        self.assertNotIn("Seq Scan on airport_flight", plan)
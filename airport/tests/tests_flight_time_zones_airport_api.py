@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pytz
+from django.test import TestCase
+
+from airport.models import AirportTimeZone, Flight
+from airport.tests.urls_and_sample_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones, to_utc
+
+
+class ToUtcTests(TestCase):
+    def test_dst_offsets(self):
+        madrid = pytz.timezone("Europe/Madrid")
+
+        self.assertEqual(to_utc(datetime(2025, 1, 7, 20, 55), madrid),
+                         utc(2025, 1, 7, 19, 55))
+        self.assertEqual(to_utc(datetime(2025, 7, 7, 20, 55), madrid),
+                         utc(2025, 7, 7, 18, 55))
+        # tzinfo is ignored, digits are local time
+        self.assertEqual(to_utc(utc(2025, 7, 7, 20, 55), madrid),
+                         utc(2025, 7, 7, 18, 55))
+
+    def test_dst_transitions(self):
+        madrid = pytz.timezone("Europe/Madrid")
+
+        # 02:30 does not exist on 2025-03-30, 02:30 twice on 2025-10-26
+        self.assertEqual(to_utc(datetime(2025, 3, 30, 2, 30), madrid),
+                         utc(2025, 3, 30, 1, 30))
+        self.assertEqual(to_utc(datetime(2025, 10, 26, 2, 30), madrid),
+                         utc(2025, 10, 26, 1, 30))
+
+
+class FlightTimesUtcTests(TestCase):
+    def setUp(self):
+        flight_zones.clear()
+        self.route = sample_route(
+            source=sample_airport(
+                name="Boryspil",
+                cod_iata="KBP",
+                time_zone=AirportTimeZone.objects.create(name="Europe/Kyiv"),
+            ),
+            destination=sample_airport(
+                name="Humberto Delgado",
+                cod_iata="LIS",
+                time_zone=AirportTimeZone.objects.create(
+                    name="Europe/Lisbon"
+                ),
+            ),
+        )
+        self.airplane = sample_airplane()
+
+    def test_flight_save(self):
+        flight = sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=datetime(2025, 7, 1, 7, 0),
+            arrival_time=datetime(2025, 7, 1, 9, 30),
+        )
+
+        self.assertEqual(flight.departure_time_utc, utc(2025, 7, 1, 4, 0))
+        self.assertEqual(flight.arrival_time_utc, utc(2025, 7, 1, 8, 30))
+        self.assertEqual(flight.duration, "4h 30m")
+
+        # zones of the route are cached
+        flight = Flight.objects.get(id=flight.id)
+        with self.assertNumQueries(1):
+            flight.save()
+
+    def test_bulk_path(self):
+        other_route = sample_route(
+            source=self.route.destination, destination=self.route.source
+        )
+        flights = [
+            Flight(
+                name=f"PS - {number}",
+                route=route,
+                airplane=self.airplane,
+                departure_time=datetime(2025, month, 1, 7, 0),
+                arrival_time=datetime(2025, month, 1, 12, 0),
+            )
+            for number, (route, month) in enumerate(
+                [(self.route, 1), (self.route, 7), (other_route, 7)]
+            )
+        ]
+
+        with self.assertNumQueries(1):
+            flight_zones.set_times_utc(flights)
+        Flight.objects.bulk_create(flights)
+
+        self.assertEqual(
+            [(flight.departure_time_utc, flight.arrival_time_utc)
+             for flight in Flight.objects.order_by("id")],
+            [
+                (utc(2025, 1, 1, 5, 0), utc(2025, 1, 1, 12, 0)),
+                (utc(2025, 7, 1, 4, 0), utc(2025, 7, 1, 11, 0)),
+                (utc(2025, 7, 1, 6, 0), utc(2025, 7, 1, 9, 0)),
+            ],
+        )
+
+    def test_zone_change_drops_cache(self):
+        flight_zones.set_times_utc([
+            Flight(route=self.route, departure_time=datetime(2025, 7, 1),
+                   arrival_time=datetime(2025, 7, 1))
+        ])
+        time_zone = self.route.source.time_zone
+
+        with self.captureOnCommitCallbacks(execute=True):
+            time_zone.name = "Europe/Warsaw"
+            time_zone.save()
+
+        flight = sample_flight(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=datetime(2025, 7, 1, 7, 0),
+            arrival_time=datetime(2025, 7, 1, 9, 30),
+        )
+        self.assertEqual(flight.departure_time_utc, utc(2025, 7, 1, 5, 0))
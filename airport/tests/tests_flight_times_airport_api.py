@@ -0,0 +1,159 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
+import pytz
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.flight_times import recompute_flight_times
+from airport.models import AirportTimeZone, Flight
+from airport.tests.urls_and_sample_functions import (
+    TIMEZONE_URL,
+    sample_airplane,
+    sample_airport,
+    sample_route,
+)
+from airport.time_zones import offset_intervals, to_utc, flight_zones
+
+
+PAST = datetime(2000, 1, 1, tzinfo=pytz.utc)
+
+
+class OffsetIntervalsTests(TestCase):
+    def test_intervals_agree_with_to_utc(self):
+        start, end = datetime(2024, 12, 1), datetime(2026, 2, 1)
+        for name in ("Europe/Madrid", "Australia/Sydney", "UTC",
+                     "Etc/GMT+2", "America/Argentina/Buenos_Aires"):
+            zone = pytz.timezone(name)
+            intervals = offset_intervals(zone, start, end)
+            wall_clock = start
+            while wall_clock < end:
+                offset = next(
+                    offset for since, until, offset in intervals
+                    if (since is None or since <= wall_clock)
+                    and (until is None or wall_clock < until)
+                )
+                self.assertEqual(
+                    (wall_clock - offset).replace(tzinfo=pytz.utc),
+                    to_utc(wall_clock, zone),
+                    f"{name} {wall_clock}",
+                )
+                wall_clock += timedelta(minutes=30)
+
+
+class RecomputeFlightTimesTests(TestCase):
+    def setUp(self):
+        flight_zones.clear()
+        self.kyiv_zone = AirportTimeZone.objects.create(name="Europe/Kyiv")
+        self.lisbon_zone = AirportTimeZone.objects.create(
+            name="Europe/Lisbon"
+        )
+        self.kyiv = sample_airport(
+            name="Boryspil", cod_iata="KBP", time_zone=self.kyiv_zone
+        )
+        self.lisbon = sample_airport(
+            name="Humberto Delgado", cod_iata="LIS", time_zone=self.kyiv_zone
+        )
+        airplane = sample_airplane()
+        to_lisbon = sample_route(source=self.kyiv, destination=self.lisbon)
+        to_kyiv = sample_route(source=self.lisbon, destination=self.kyiv)
+        for day in range(0, 360, 3):
+            departure = datetime(2025, 1, 1, 6, 0) + timedelta(days=day)
+            for route in (to_lisbon, to_kyiv):
+                Flight.objects.create(
+                    name=f"TP - {day}",
+                    route=route,
+                    airplane=airplane,
+                    departure_time=departure,
+                    arrival_time=departure + timedelta(hours=5),
+                )
+
+    def assert_times_utc(self):
+        for flight in Flight.objects.select_related(
+                "route__source__time_zone", "route__destination__time_zone"
+        ):
+            self.assertEqual(
+                flight.departure_time_utc,
+                to_utc(
+                    flight.departure_time,
+                    pytz.timezone(flight.route.source.time_zone.name),
+                ),
+            )
+            self.assertEqual(
+                flight.arrival_time_utc,
+                to_utc(
+                    flight.arrival_time,
+                    pytz.timezone(flight.route.destination.time_zone.name),
+                ),
+            )
+
+    def test_airport_time_zone_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lisbon.time_zone = self.lisbon_zone
+            self.lisbon.save()
+
+        self.assert_times_utc()
+        flight = Flight.objects.filter(route__source=self.lisbon).first()
+        self.assertEqual(flight.duration, "3h 0m")
+
+    def test_time_zone_name_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kyiv_zone.name = "Europe/Warsaw"
+            self.kyiv_zone.save()
+
+        self.assert_times_utc()
+        flight = Flight.objects.filter(route__source=self.kyiv).first()
+        self.assertEqual(flight.departure_time_utc.hour, 5)
+
+    def test_unknown_time_zone_name_rejected(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="admin@test.com", password="test12345", is_staff=True
+            )
+        )
+
+        response = client.patch(
+            f"{TIMEZONE_URL}{self.kyiv_zone.id}/",
+            {"name": "Europe/Kyiw"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("name", response.data)
+        self.kyiv_zone.refresh_from_db()
+        self.assertEqual(self.kyiv_zone.name, "Europe/Kyiv")
+        with self.assertRaises(ValidationError):
+            AirportTimeZone(name="Europe/Kyiw").full_clean()
+
+    def test_set_based_updates_in_chunks(self):
+        Flight.objects.update(departure_time_utc=PAST)
+        Flight.objects.update(arrival_time_utc=PAST)
+
+        # airports, then per airport & time: routes, bounds,
+        # 3 id chunks + 1 empty, 3 offset intervals (2024-25 winter,
+        # summer, 2025-26 winter) updated per chunk
+        with self.assertNumQueries(1 + 2 * 2 * (2 + 4 + 3 * 3)):
+            updated = recompute_flight_times(
+                [self.kyiv.id, self.lisbon.id], batch_size=50
+            )
+
+        self.assertEqual(updated, 4 * 120)
+        self.assert_times_utc()
+
+    def test_recompute_command(self):
+        Flight.objects.update(departure_time_utc=PAST)
+
+        out = StringIO()
+        call_command("recompute_flight_times", "kbp", stdout=out)
+
+        self.assertIn("Recomputed 240 flight times", out.getvalue())
+        self.assertFalse(
+            Flight.objects.filter(
+                route__source=self.kyiv,
+                departure_time_utc__year=2000,
+            ).exists()
+        )
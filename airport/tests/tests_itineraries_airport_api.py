@@ -0,0 +1,210 @@
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.itineraries import flight_index
+from airport.route_planner import route_graph
+from airport.models import AirportTimeZone, Flight, Route
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+)
+
+ITINERARIES_URL = FLIGHT_URL + "itineraries/"
+
+
+class ItineraryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_index.clear()
+        route_graph.clear()
+
+        time_zone = AirportTimeZone.objects.create(name="UTC")
+        self.airports = {
+            code: sample_airport(
+                name=f"Airport {code}", cod_iata=code, time_zone=time_zone
+            )
+            for code in ("KBP", "WAW", "FRA", "LIS", "OPO")
+        }
+        self.airplane = sample_airplane()
+        self.flights = {}
+        for name, source, destination, departure, arrival in (
+            ("direct", "KBP", "LIS", (10, 0), (14, 30)),
+            ("kbp-waw", "KBP", "WAW", (6, 0), (7, 30)),
+            ("waw-lis short", "WAW", "LIS", (7, 50), (11, 0)),
+            ("waw-lis", "WAW", "LIS", (8, 30), (12, 0)),
+            ("waw-lis late", "WAW", "LIS", (10, 30), (14, 0)),
+            ("kbp-fra", "KBP", "FRA", (5, 0), (7, 0)),
+            ("fra-lis", "FRA", "LIS", (9, 0), (11, 30)),
+            ("fra-waw", "FRA", "WAW", (8, 0), (9, 30)),
+        ):
+            self.flights[name] = self.add_flight(
+                name, source, destination, departure, arrival
+            )
+
+    def add_flight(self, name, source, destination, departure, arrival):
+        route = Route.objects.get_or_create(
+            source=self.airports[source],
+            destination=self.airports[destination],
+        )[0]
+        return sample_flight(
+            name=name,
+            route=route,
+            airplane=self.airplane,
+            departure_time=datetime(2025, 3, 10, *departure),
+            arrival_time=datetime(2025, 3, 10, *arrival),
+        )
+
+    def search(self, **params):
+        response = self.client.get(
+            ITINERARIES_URL,
+            {"source": "KBP", "destination": "LIS", "date": "2025-03-10",
+             **params},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            [flight["name"] for flight in itinerary["flights"]]
+            for itinerary in response.data
+        ]
+
+    def test_itineraries_ordered_by_duration(self):
+        self.assertEqual(
+            self.search(),
+            [
+                ["direct"],
+                ["kbp-waw", "waw-lis"],
+                ["kbp-fra", "fra-lis"],
+                ["kbp-waw", "waw-lis late"],
+                ["kbp-fra", "fra-waw", "waw-lis late"],
+            ],
+        )
+
+    def test_itinerary_details(self):
+        response = self.client.get(
+            ITINERARIES_URL,
+            {"source": "kbp", "destination": "lis", "date": "2025-03-10",
+             "max_stops": 1},
+        )
+        itinerary = response.data[1]
+
+        self.assertEqual(itinerary["stops"], 1)
+        self.assertEqual(itinerary["duration"], "6h 0m")
+        self.assertEqual(
+            itinerary["departure_time_utc"], "2025-03-10T06:00:00Z"
+        )
+        self.assertEqual(itinerary["arrival_time_utc"], "2025-03-10T12:00:00Z")
+        self.assertEqual(itinerary["flights"][0]["source"], "KBP")
+        self.assertEqual(itinerary["flights"][0]["destination"], "WAW")
+        self.assertEqual(
+            itinerary["flights"][1]["id"], self.flights["waw-lis"].id
+        )
+
+    def test_min_connection_and_max_stops(self):
+        self.assertEqual(
+            self.search(min_connection=15, max_stops=1)[:2],
+            [["direct"], ["kbp-waw", "waw-lis short"]],
+        )
+        self.assertEqual(self.search(max_stops=0), [["direct"]])
+
+    def test_airports_not_leading_to_destination_are_skipped(self):
+        self.add_flight("kbp-opo", "KBP", "OPO", (5, 0), (9, 0))
+        self.add_flight("opo-waw", "OPO", "WAW", (10, 0), (14, 0))
+
+        with mock.patch.object(
+                flight_index, "departures", wraps=flight_index.departures
+        ) as departures:
+            itineraries = self.search(max_stops=1)
+
+        self.assertNotIn(["kbp-opo", "opo-waw"], itineraries)
+        # LIS is 2 routes away from OPO, 1 stop is left after KBP
+        self.assertNotIn(
+            self.airports["OPO"].id,
+            [call.args[0] for call in departures.call_args_list],
+        )
+
+    def test_unreachable_destination(self):
+        # codes of the search, airports & routes of the graph, no flights
+        with self.assertNumQueries(3):
+            self.assertEqual(self.search(destination="OPO"), [])
+
+    def test_negative_min_connection(self):
+        self.add_flight("waw-lis early", "WAW", "LIS", (7, 0), (10, 0))
+
+        itineraries = self.search(min_connection=-60)
+
+        self.assertEqual(itineraries, self.search(min_connection=0))
+        self.assertNotIn(["kbp-waw", "waw-lis early"], itineraries)
+
+    def test_not_integer_params(self):
+        for name in ("min_connection", "max_stops"):
+            response = self.client.get(
+                ITINERARIES_URL,
+                {"source": "KBP", "destination": "LIS",
+                 "date": "2025-03-10", name: "many"},
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn(name, response.data)
+
+    @mock.patch("airport.itineraries.MAX_DAYS", 2)
+    def test_least_recently_used_days_evicted(self):
+        # a search reads its day & the next one (connections)
+        self.search()
+        self.search(date="2025-03-12")
+
+        self.assertEqual(len(flight_index._days), 2)
+        self.assertEqual(flight_index._flight_days, {})
+        # codes of airports & both days loaded again
+        with self.assertNumQueries(4):
+            self.search()
+
+    def test_index_is_updated_incrementally(self):
+        self.search()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_flight("fast", "KBP", "LIS", (6, 0), (9, 0))
+            flight = self.flights["direct"]
+            flight.departure_time = datetime(2025, 3, 10, 12, 0)
+            flight.save()
+            self.flights["fra-lis"].delete()
+
+        # only airport codes are queried, flights come from the index
+        with self.assertNumQueries(2):
+            itineraries = self.search(max_stops=1)
+        self.assertEqual(
+            itineraries,
+            [["direct"], ["fast"], ["kbp-waw", "waw-lis"],
+             ["kbp-waw", "waw-lis late"]],
+        )
+
+    def test_flight_moved_to_other_day(self):
+        self.search()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flight = self.flights["direct"]
+            flight.departure_time = datetime(2025, 3, 11, 10, 0)
+            flight.arrival_time = datetime(2025, 3, 11, 14, 30)
+            flight.save()
+
+        self.assertNotIn(["direct"], self.search())
+        self.assertFalse(
+            Flight.objects.filter(name="direct", departure_time_utc__day=10)
+        )
+
+    def test_unknown_airport_and_missing_params(self):
+        self.assertEqual(self.search(destination="OPO"), [])
+
+        response = self.client.get(ITINERARIES_URL, {"source": "KBP"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
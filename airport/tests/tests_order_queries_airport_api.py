@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import City, Country, Order, SEAT_LETTERS, Ticket
+from airport.tests.urls_and_sample_functions import (
+    ORDER_URL,
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+    utc,
+)
+from airport.time_zones import flight_zones
+
+
+def detail_url(order_id):
+    return reverse("airport:order-detail", args=[order_id])
+
+
+class OrderQueriesTests(TestCase):
+    """Queries of order list & retrieve do not depend on tickets"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        airplane = sample_airplane()
+        kyiv = sample_airport(
+            name="Boryspil",
+            cod_iata="KBP",
+            closest_big_city=City.objects.create(
+                name="Kyiv", country=Country.objects.create(name="Ukraine")
+            ),
+        )
+        route = sample_route()
+        self.flights = [
+            sample_flight(route=route, airplane=airplane),
+            sample_flight(
+                name="KBP - 1",
+                route=sample_route(
+                    source=kyiv, destination=route.destination
+                ),
+                airplane=airplane,
+                departure_time=utc(2025, 1, 9, 8, 0),
+                arrival_time=utc(2025, 1, 9, 16, 30),
+            ),
+        ]
+        self.tickets = 0
+
+    def sample_order(self, tickets: int) -> Order:
+        """Order of tickets of both flights, seats taken one by one"""
+        order = Order.objects.create(user=self.user)
+        seats = self.flights[0].airplane.seats_in_row
+        numbers = range(self.tickets, self.tickets + tickets)
+        self.tickets += tickets
+        Ticket.objects.bulk_create([
+            Ticket(
+                order=order,
+                flight=self.flights[number % 2],
+                row=number // 2 // seats + 1,
+                seat=SEAT_LETTERS[number // 2 % seats],
+            )
+            for number in numbers
+        ])
+        return order
+
+    def test_retrieve(self):
+        small = self.sample_order(1)
+        large = self.sample_order(50)
+
+        for order, tickets in ((small, 1), (large, 50)):
+            # order & tickets with flights, routes, airports & airplanes
+            with self.assertNumQueries(2):
+                response = self.client.get(detail_url(order.id))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["tickets"]), tickets)
+
+        self.assertEqual(
+            {
+                ticket["flight"]["route"]["source"]
+                for ticket in response.data["tickets"]
+            },
+            {
+                "EZE: Eseiza (Buenos Aires - Argentina)",
+                "KBP: Boryspil (Kyiv - Ukraine)",
+            },
+        )
+        self.assertEqual(
+            response.data["tickets"][0]["flight"]["airline_company"],
+            "Aerolineas Argentinas",
+        )
+
+    def test_list(self):
+        self.sample_order(1)
+        with self.assertNumQueries(3):
+            self.client.get(ORDER_URL)
+
+        for _ in range(3):
+            self.sample_order(50)
+
+        # count, page of orders & their tickets
+        with self.assertNumQueries(3):
+            response = self.client.get(ORDER_URL)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(len(response.data["results"][0]["tickets"]), 50)
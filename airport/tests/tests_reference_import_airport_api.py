@@ -0,0 +1,235 @@
+import io
+import json
+import tempfile
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.importer import import_reference_data
+from airport.models import (
+    Airplane,
+    Airport,
+    AirlineCompany,
+    City,
+    Country,
+    AirportTimeZone,
+    Flight,
+)
+from airport.tests.urls_and_sample_functions import (
+    sample_airplane,
+    sample_airport,
+    sample_route,
+)
+from airport.time_zones import flight_zones
+
+
+def import_url(kind):
+    return reverse("airport:reference-import", args=[kind])
+
+
+def airports_csv(count, name="Airport"):
+    lines = ["cod_iata,name,city,country,time_zone,latitude,longitude"]
+    for number in range(count):
+        code = "".join(chr(65 + number // 26 ** i % 26) for i in (2, 1, 0))
+        lines.append(
+            f"{code},{name} {code},City {number % 3},Country {number % 2},"
+            f"Europe/Lisbon,38.7,-9.1"
+        )
+    return "\n".join(lines) + "\n"
+
+
+class ReferenceImportTests(TestCase):
+    def setUp(self):
+        flight_zones.clear()
+
+    def test_import_airports(self):
+        importer = import_reference_data(
+            "airports", io.StringIO(airports_csv(30)), "csv", chunk_size=10
+        )
+
+        self.assertEqual(Airport.objects.count(), 30)
+        self.assertEqual(City.objects.count(), 6)
+        self.assertEqual(Country.objects.count(), 2)
+        self.assertEqual(AirportTimeZone.objects.count(), 1)
+        self.assertEqual((importer.created, importer.updated), (30 + 9, 0))
+
+        importer = import_reference_data(
+            "airports",
+            io.StringIO(airports_csv(30, name="Updated")),
+            "csv",
+            chunk_size=10,
+        )
+
+        self.assertEqual((importer.created, importer.updated), (0, 30))
+        self.assertEqual(Airport.objects.filter(name="Updated AAA").count(), 1)
+        self.assertEqual(Airport.objects.count(), 30)
+
+    def test_queries_do_not_depend_on_rows(self):
+        import_reference_data(
+            "airports", io.StringIO(airports_csv(100)), "csv"
+        )
+
+        # savepoint, maps of cities, countries, time zones & airports,
+        # upsert, release
+        with self.assertNumQueries(7):
+            import_reference_data(
+                "airports", io.StringIO(airports_csv(2)), "csv"
+            )
+        with self.assertNumQueries(7):
+            import_reference_data(
+                "airports", io.StringIO(airports_csv(100)), "csv"
+            )
+
+    def test_time_zone_from_coordinates_and_recompute(self):
+        airport = sample_airport(
+            cod_iata="LIS",
+            time_zone=AirportTimeZone.objects.create(name="Europe/Kyiv"),
+        )
+        flight = Flight.objects.create(
+            name="TP - 1",
+            route=sample_route(source=airport),
+            airplane=sample_airplane(),
+            departure_time=datetime(2025, 1, 7, 10, 0),
+            arrival_time=datetime(2025, 1, 7, 14, 0),
+        )
+        rows = {
+            "cod_iata": "LIS",
+            "name": "Humberto Delgado",
+            "city": "Lisbon",
+            "country": "Portugal",
+            "latitude": 38.774167,
+            "longitude": -9.134167,
+        }
+
+        import_reference_data(
+            "airports", io.StringIO(json.dumps(rows)), "jsonl"
+        )
+
+        airport.refresh_from_db()
+        flight.refresh_from_db()
+        self.assertEqual(airport.time_zone.name, "Europe/Lisbon")
+        self.assertEqual(flight.departure_time_utc.hour, 10)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile(
+                "w", suffix=".csv", delete=False
+        ) as data:
+            data.write("name,country\nTAP,Portugal\nLOT,Poland\n")
+        out = io.StringIO()
+
+        call_command(
+            "import_reference_data", "airline_companies", data.name, stdout=out
+        )
+
+        self.assertIn("Created 4, updated 0", out.getvalue())
+        self.assertEqual(
+            AirlineCompany.objects.get(name="LOT").registration_country.name,
+            "Poland",
+        )
+        with self.assertRaisesMessage(
+                CommandError, "row 1: airline_company, airplane_type"
+        ):
+            call_command(
+                "import_reference_data",
+                "airplanes",
+                data.name,
+                stdout=out,
+            )
+
+
+class ReferenceImportApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, kind, name, content):
+        return self.client.post(
+            import_url(kind),
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_import_airplanes(self):
+        self.upload(
+            "airline_companies",
+            "companies.jsonl",
+            '{"name": "TAP", "country": "Portugal"}\n',
+        )
+        content = "\n".join(
+            json.dumps({
+                "name": f"A320 #{number}",
+                "airline_company": "TAP",
+                "airplane_type": "Passenger Jets",
+                "rows": 30,
+                "seats_in_row": 6,
+            })
+            for number in range(3)
+        )
+
+        response = self.upload("airplanes", "airplanes.jsonl", content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"created": 4, "updated": 0})
+        self.assertEqual(
+            Airplane.objects.filter(airline_company__name="TAP").count(), 3
+        )
+
+        response = self.upload(
+            "airplanes", "airplanes.jsonl", content.replace("30", "31")
+        )
+        self.assertEqual(response.data, {"created": 0, "updated": 3})
+        self.assertEqual(Airplane.objects.filter(rows=31).count(), 3)
+
+    def test_invalid_file_is_not_imported(self):
+        response = self.upload(
+            "airports",
+            "airports.csv",
+            airports_csv(3) + "kb1,Bad,Kyiv,Ukraine,Europe/Kyiv,,\n",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row 4", response.data["file"])
+        self.assertFalse(Airport.objects.exists())
+
+        for kind, content, error in (
+                (
+                    "airports",
+                    airports_csv(2).replace("Lisbon", "Lisbom"),
+                    "row 1: unknown time zone Europe/Lisbom",
+                ),
+                (
+                    "time_zones",
+                    "name\nEurope/Kyiv\nEurope/Kyiw\n",
+                    "row 2: unknown time zone Europe/Kyiw",
+                ),
+        ):
+            response = self.upload(kind, f"{kind}.csv", content)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn(error, response.data["file"])
+        self.assertFalse(AirportTimeZone.objects.exists())
+
+        response = self.upload("flights", "flights.csv", "name\n")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_import_forbidden_for_users(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="test12345"
+        )
+        self.client.force_authenticate(user=user)
+
+        response = self.upload("countries", "countries.csv", "name\nPeru\n")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,114 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from airport.distances import airport_distances, haversine_km, geodesic_km
+from airport.models import Airport, Route
+from airport.tests.urls_and_sample_functions import sample_airport
+
+# (latitude, longitude)
+KBP = (50.345, 30.894722)
+LIS = (38.774167, -9.134167)
+JFK = (40.639722, -73.778889)
+
+
+class RouteDistanceTests(TestCase):
+    def setUp(self):
+        airport_distances.clear()
+        self.kyiv = sample_airport(
+            name="Boryspil", cod_iata="KBP", latitude=KBP[0], longitude=KBP[1]
+        )
+        self.lisbon = sample_airport(
+            name="Humberto Delgado",
+            cod_iata="LIS",
+            latitude=LIS[0],
+            longitude=LIS[1],
+        )
+        self.new_york = sample_airport(
+            name="John F. Kennedy",
+            cod_iata="JFK",
+            latitude=JFK[0],
+            longitude=JFK[1],
+        )
+
+    def test_haversine_is_close_to_geodesic(self):
+        latitude1, longitude1 = zip(KBP, KBP, LIS)
+        latitude2, longitude2 = zip(LIS, JFK, JFK)
+        haversine = haversine_km(latitude1, longitude1, latitude2, longitude2)
+        geodesic = geodesic_km(latitude1, longitude1, latitude2, longitude2)
+
+        self.assertEqual(round(geodesic[0]), 3380)
+        for fast, precise in zip(haversine, geodesic):
+            self.assertAlmostEqual(fast / precise, 1, delta=0.005)
+
+    def test_route_save_fills_distance(self):
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lisbon
+        )
+        self.assertEqual(route.distance, 3380)
+
+        # cached in both directions
+        with self.assertNumQueries(1):
+            back = Route.objects.create(
+                source=self.lisbon, destination=self.kyiv
+            )
+        self.assertEqual(back.distance, 3380)
+
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.new_york, distance=7600
+        )
+        self.assertEqual(route.distance, 7600)
+
+    def test_distances_expire(self):
+        Route.objects.create(source=self.kyiv, destination=self.lisbon)
+        # coordinates changed by another process (no signals here)
+        Airport.objects.filter(id=self.lisbon.id).update(
+            latitude=JFK[0], longitude=JFK[1]
+        )
+
+        with mock.patch("airport.distances.PAIR_CACHE_TTL", 0):
+            route = Route.objects.create(
+                source=self.lisbon, destination=self.kyiv
+            )
+
+        self.assertEqual(
+            route.distance,
+            round(geodesic_km([JFK[0]], [JFK[1]], [KBP[0]], [KBP[1]])[0]),
+        )
+
+    def test_route_without_coordinates(self):
+        route = Route.objects.create(
+            source=self.kyiv,
+            destination=sample_airport(),
+        )
+        self.assertIsNone(route.distance)
+
+    def test_backfill_command(self):
+        routes = Route.objects.bulk_create([
+            Route(source=source, destination=destination)
+            for source, destination in (
+                (self.kyiv, self.lisbon),
+                (self.kyiv, self.new_york),
+                (self.lisbon, self.new_york),
+            )
+        ] + [Route(source=self.lisbon, destination=self.kyiv, distance=1)])
+
+        out = StringIO()
+        call_command("backfill_route_distances", batch_size=2, stdout=out)
+
+        self.assertIn("Updated distances of 3 routes", out.getvalue())
+        distances = dict(Route.objects.values_list("id", "distance"))
+        self.assertAlmostEqual(distances[routes[0].id], 3380, delta=17)
+        self.assertEqual(distances[routes[3].id], 1)
+
+        call_command(
+            "backfill_route_distances",
+            "--all",
+            method="geodesic",
+            stdout=out,
+        )
+        distances = dict(Route.objects.values_list("id", "distance"))
+        self.assertEqual(distances[routes[0].id], 3380)
+        self.assertEqual(distances[routes[3].id], 3380)
@@ -0,0 +1,165 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import AirportTimeZone, Route
+from airport.route_planner import route_graph
+from airport.tests.urls_and_sample_functions import (
+    ROUTE_URL,
+    sample_airplane,
+    sample_airport,
+    sample_flight,
+    sample_route,
+)
+from airport.versions import bump_versions
+
+PLAN_URL = ROUTE_URL + "plan/"
+
+
+class RoutePlannerTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        route_graph.clear()
+
+        time_zone = AirportTimeZone.objects.create(name="UTC")
+        airports = {
+            code: sample_airport(
+                name=f"Airport {code}", cod_iata=code, time_zone=time_zone
+            )
+            for code in ("KBP", "WAW", "FRA", "LIS", "OPO")
+        }
+        self.airplane = airplane = sample_airplane()
+        self.routes = {}
+        for source, destination, distance, hours in (
+            ("KBP", "LIS", 3400, 6),
+            ("KBP", "WAW", 700, 1.5),
+            ("WAW", "LIS", 2800, 4),
+            ("KBP", "FRA", 1700, 2.5),
+            ("FRA", "LIS", 1900, 3.5),
+            ("WAW", "FRA", None, 1),
+        ):
+            route = sample_route(
+                source=airports[source],
+                destination=airports[destination],
+                distance=distance,
+            )
+            self.routes[source + destination] = route
+            sample_flight(
+                route=route,
+                airplane=airplane,
+                departure_time=datetime(2025, 3, 10, 6, 0),
+                arrival_time=datetime(
+                    2025, 3, 10, 6 + int(hours), int(hours % 1 * 60)
+                ),
+            )
+
+    def plan(self, **params):
+        response = self.client.get(
+            PLAN_URL, {"source": "KBP", "destination": "LIS", **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_shortest_by_distance(self):
+        route_plan = self.plan()
+
+        self.assertEqual(route_plan["airports"], ["KBP", "LIS"])
+        self.assertEqual(route_plan["routes"], [self.routes["KBPLIS"].id])
+        self.assertEqual(route_plan["distance"], 3400)
+        self.assertEqual(route_plan["duration"], "6h 0m")
+        self.assertEqual(route_plan["stops"], 0)
+
+    def test_shortest_by_duration(self):
+        route_plan = self.plan(weight="duration")
+
+        self.assertEqual(route_plan["airports"], ["KBP", "WAW", "LIS"])
+        self.assertEqual(route_plan["distance"], 3500)
+        self.assertEqual(route_plan["duration"], "5h 30m")
+
+    def test_graph_is_cached_and_invalidated(self):
+        self.plan()
+        with self.assertNumQueries(0):
+            self.plan(weight="duration")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.routes["KBPLIS"].delete()
+            route = self.routes["WAWFRA"]
+            route.distance = 800
+            route.save()
+
+        route_plan = self.plan()
+        self.assertEqual(route_plan["airports"], ["KBP", "WAW", "FRA", "LIS"])
+        self.assertEqual(route_plan["distance"], 3400)
+
+    def test_durations_of_changed_route_only(self):
+        self.plan(weight="duration")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sample_flight(
+                route=self.routes["KBPWAW"],
+                airplane=self.airplane,
+                departure_time=datetime(2025, 3, 11, 6, 0),
+                arrival_time=datetime(2025, 3, 11, 10, 30),
+            )
+
+        with CaptureQueriesContext(connection) as queries:
+            route_plan = self.plan(
+                source="KBP", destination="WAW", weight="duration"
+            )
+        # average of 1h 30m & 4h 30m
+        self.assertEqual(route_plan["duration"], "3h 0m")
+        self.assertEqual(len(queries), 1)
+        self.assertIn(
+            f"IN ({self.routes['KBPWAW'].id})", queries[0]["sql"]
+        )
+
+    def test_routes_changed_by_other_process(self):
+        self.plan()
+
+        # bulk update (ex. backfill_route_distances) of another process
+        Route.objects.filter(id=self.routes["KBPLIS"].id).update(
+            distance=9000
+        )
+        self.assertEqual(self.plan()["distance"], 3400)
+        bump_versions(Route)
+
+        route_plan = self.plan()
+        self.assertEqual(route_plan["airports"], ["KBP", "WAW", "LIS"])
+        self.assertEqual(route_plan["distance"], 3500)
+
+    def test_route_without_distance_is_skipped(self):
+        response = self.client.get(
+            PLAN_URL, {"source": "WAW", "destination": "FRA"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        route_plan = self.plan(source="WAW", destination="FRA",
+                               weight="duration")
+        self.assertEqual(route_plan["distance"], None)
+        self.assertEqual(route_plan["duration"], "1h 0m")
+
+    def test_invalid_params(self):
+        for params in (
+            {"source": "XXX", "destination": "LIS"},
+            {"source": "KBP", "destination": "KBP"},
+            {"source": "KBP", "destination": "LIS", "weight": "price"},
+        ):
+            response = self.client.get(PLAN_URL, params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+        response = self.client.get(
+            PLAN_URL, {"source": "LIS", "destination": "OPO"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
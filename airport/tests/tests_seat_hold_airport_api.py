@@ -0,0 +1,166 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.booking import release_expired_holds
+from airport.models import Order, Ticket, SeatHold, HeldSeat
+from airport.tests.urls_and_sample_functions import (
+    HOLD_URL,
+    ORDER_URL,
+    sample_flight,
+)
+
+
+class SeatHoldTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="other12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.flight = sample_flight()
+
+    def hold(self, seats, minutes=10, user=None):
+        client = self.client
+        if user is not None:
+            client = APIClient()
+            client.force_authenticate(user=user)
+        return client.post(
+            HOLD_URL,
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+                "minutes": minutes,
+            },
+            format="json",
+        )
+
+    def expire(self, hold_id):
+        SeatHold.objects.filter(id=hold_id).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+    def test_create_hold(self):
+        response = self.hold([(1, "A"), (1, "B")], minutes=5)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hold = SeatHold.objects.get(pk=response.data["id"])
+        self.assertEqual(hold.user, self.user)
+        self.assertEqual(hold.seats.count(), 2)
+        self.assertAlmostEqual(
+            hold.expires_at,
+            timezone.now() + timedelta(minutes=5),
+            delta=timedelta(seconds=10),
+        )
+
+    def test_hold_too_long(self):
+        response = self.hold([(1, "A")], minutes=24 * 60)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("minutes", response.data)
+
+    def test_held_seat_cannot_be_held_or_ordered_by_other_user(self):
+        self.hold([(2, "C")])
+
+        response = self.hold([(2, "C")], user=self.other_user)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seats", response.data)
+
+        client = APIClient()
+        client.force_authenticate(user=self.other_user)
+        response = client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 2, "seat": "C", "flight": self.flight.id}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_expired_hold_does_not_block_seat(self):
+        hold_id = self.hold([(2, "C")]).data["id"]
+        self.expire(hold_id)
+
+        response = self.hold([(2, "C")], user=self.other_user)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.filter(id=hold_id).exists())
+
+    def test_order_of_own_held_seats_releases_them(self):
+        self.hold([(3, "A"), (3, "B")])
+        response = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"row": 3, "seat": "A", "flight": self.flight.id}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(HeldSeat.objects.values_list("row", "seat")), [(3, "B")]
+        )
+
+    def test_confirm_hold(self):
+        hold_id = self.hold([(4, "A"), (4, "B")]).data["id"]
+
+        response = self.client.post(HOLD_URL + f"{hold_id}/confirm/")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.tickets.count(), 2)
+        self.assertFalse(SeatHold.objects.exists())
+
+    def test_confirm_expired_hold_of_taken_seats(self):
+        hold_id = self.hold([(5, "A")]).data["id"]
+        self.expire(hold_id)
+        Ticket.objects.create(
+            row=5,
+            seat="A",
+            flight=self.flight,
+            order=Order.objects.create(user=self.other_user),
+        )
+
+        response = self.client.post(HOLD_URL + f"{hold_id}/confirm/")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            response.data["seats"],
+            [{"flight": self.flight.id, "row": 5, "seat": "A"}],
+        )
+
+    def test_holds_of_other_users_are_hidden(self):
+        hold_id = self.hold([(6, "A")], user=self.other_user).data["id"]
+
+        response = self.client.get(HOLD_URL + f"{hold_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_release_expired_holds(self):
+        for row in range(1, 6):
+            hold = SeatHold.objects.create(
+                flight=self.flight,
+                user=self.user,
+                expires_at=timezone.now() + timedelta(
+                    minutes=-1 if row % 2 else 10
+                ),
+            )
+            HeldSeat.objects.create(
+                hold=hold, flight=self.flight, row=row, seat="F"
+            )
+
+        self.assertEqual(release_expired_holds(batch_size=2), 3)
+        self.assertEqual(SeatHold.objects.count(), 2)
+        self.assertEqual(HeldSeat.objects.count(), 2)
+
+        call_command("release_expired_holds", stdout=StringIO())
+        self.assertEqual(SeatHold.objects.count(), 2)
@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Order, Ticket, SeatHold, HeldSeat
+from airport.seat_map import SeatMap
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airplane,
+    sample_flight,
+)
+
+
+class SeatMapTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        self.flight = sample_flight(
+            airplane=sample_airplane(rows=3, seats_in_row=4)
+        )
+        self.order = Order.objects.create(user=self.user)
+        for row, seat in ((1, "A"), (2, "D"), (3, "B")):
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=self.order
+            )
+
+    def test_seat_map_bitmap(self):
+        seat_map = SeatMap(flight_id=1, rows=3, seats_in_row=4)
+        seat_map.mark(1, "A")
+        seat_map.mark(2, "D")
+        seat_map.mark(4, "A")  # out of range - ignored
+
+        self.assertTrue(seat_map.is_taken(1, "A"))
+        self.assertTrue(seat_map.is_taken(2, "D"))
+        self.assertFalse(seat_map.is_taken(1, "B"))
+        self.assertEqual(seat_map.taken, 2)
+        self.assertEqual(seat_map.available, 10)
+        self.assertEqual(seat_map.to_hex(), "8100")
+        self.assertEqual(seat_map.to_rows(), ["XBCD", "ABCX", "ABCD"])
+
+    def test_flight_seats(self):
+        url = FLIGHT_URL + f"{self.flight.id}/seats/"
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["flight"], self.flight.id)
+        self.assertEqual(response.data["seat_letters"], ["A", "B", "C", "D"])
+        self.assertEqual(response.data["capacity"], 12)
+        self.assertEqual(response.data["taken"], 3)
+        self.assertEqual(response.data["available"], 9)
+        self.assertEqual(
+            response.data["seat_map"], ["XBCD", "ABCX", "AXCD"]
+        )
+
+    def test_flight_seats_with_holds(self):
+        for minutes, row, seat in ((10, 1, "B"), (-1, 1, "C"), (10, 1, "A")):
+            hold = SeatHold.objects.create(
+                flight=self.flight,
+                user=self.user,
+                expires_at=timezone.now() + timedelta(minutes=minutes),
+            )
+            HeldSeat.objects.create(
+                hold=hold, flight=self.flight, row=row, seat=seat
+            )
+        url = FLIGHT_URL + f"{self.flight.id}/seats/"
+        response = self.client.get(url)
+
+        # expired hold (1C) is free, booked seat (1A) is not held
+        self.assertEqual(response.data["seat_map"][0], "XHCD")
+        self.assertEqual(response.data["taken"], 3)
+        self.assertEqual(response.data["held"], 1)
+        self.assertEqual(response.data["available"], 8)
+
+    def test_flight_seats_not_found(self):
+        url = FLIGHT_URL + f"{self.flight.id + 1}/seats/"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_flight_seats_unauthorized(self):
+        self.client.force_authenticate(user=None)
+        url = FLIGHT_URL + f"{self.flight.id}/seats/"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
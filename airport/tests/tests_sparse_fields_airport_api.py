@@ -0,0 +1,103 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport.models import Crew, Role
+from airport.tests.urls_and_sample_functions import (
+    FLIGHT_URL,
+    sample_airplane,
+    sample_flight,
+    sample_route,
+)
+from airport.time_zones import flight_zones
+
+
+def detail_url(flight_id):
+    return reverse("airport:flight-detail", args=[flight_id])
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+        flight_zones.clear()
+
+        role = Role.objects.create(name="Pilot")
+        crew = Crew.objects.create(
+            first_name="Ann", last_name="Lee", role=role
+        )
+        self.flight = sample_flight(
+            route=sample_route(), airplane=sample_airplane()
+        )
+        self.flight.crew_members.add(crew)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in queries]
+
+    def test_fields(self):
+        response, sqls = self.get(
+            FLIGHT_URL, {"fields": "id,name,departure_time"}
+        )
+
+        self.assertEqual(response.data["results"], [{
+            "id": self.flight.id,
+            "name": "AB - 007",
+            "departure_time": "2025-01-07T20:55:00Z",
+        }])
+        # count & page of flights, no joins & no crew
+        self.assertEqual(len(sqls), 2)
+        for sql in sqls:
+            self.assertNotIn("JOIN", sql)
+
+    def test_omit(self):
+        response, sqls = self.get(FLIGHT_URL, {"omit": "crew_members"})
+
+        item = response.data["results"][0]
+        self.assertNotIn("crew_members", item)
+        self.assertEqual(item["source"], "Buenos Aires")
+        self.assertEqual(item["airline_company"], "Aerolineas Argentinas")
+        self.assertEqual(len(sqls), 2)
+
+    def test_only_joins_of_fields(self):
+        _, sqls = self.get(FLIGHT_URL, {"fields": "id,airline_company"})
+
+        self.assertIn("airport_airlinecompany", sqls[-1])
+        self.assertNotIn("airport_route", sqls[-1])
+
+    def test_all_fields_by_default(self):
+        response, sqls = self.get(FLIGHT_URL)
+
+        item = response.data["results"][0]
+        self.assertEqual(item["crew_members"], ["Ann Lee: Pilot"])
+        self.assertEqual(item["destination"], "Barcelona")
+        # count & page (crew names are aggregated on PostgreSQL),
+        # or count, page, crew & roles
+        self.assertEqual(
+            len(sqls), 2 if connection.vendor == "postgresql" else 4
+        )
+
+    def test_retrieve_fields(self):
+        response, _ = self.get(
+            detail_url(self.flight.id), {"fields": "id,duration"}
+        )
+
+        self.assertEqual(
+            response.data, {"id": self.flight.id, "duration": "18h 50m"}
+        )
+
+    def test_unknown_field(self):
+        response = self.client.get(FLIGHT_URL, {"fields": "id,price"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("price", str(response.data["fields"]))
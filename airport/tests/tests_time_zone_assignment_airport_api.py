@@ -0,0 +1,141 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from airport import time_zones
+from airport.models import Airport, AirportTimeZone, City
+from airport.tests.urls_and_sample_functions import (
+    AIRPORT_URL,
+    sample_airport,
+    sample_country,
+)
+
+
+class TimeZoneAssignmentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@test.com",
+            password="test12345",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_time_zone_name_is_memoized_by_rounded_coordinates(self):
+        time_zones._rounded_time_zone_name.cache_clear()
+        with mock.patch.object(
+                time_zones, "_time_zone_at", wraps=time_zones._time_zone_at
+        ) as time_zone_at:
+            self.assertEqual(
+                time_zones.time_zone_name(50.3450001, 30.894722),
+                "Europe/Kyiv",
+            )
+            self.assertEqual(
+                time_zones.time_zone_name(50.3449999, 30.8947),
+                "Europe/Kyiv",
+            )
+        time_zone_at.assert_called_once_with(50.345, 30.895)
+
+    def test_create_airport_with_coordinates(self):
+        existing = AirportTimeZone.objects.create(name="Europe/Lisbon")
+        city = City.objects.create(name="Lisbon", country=sample_country())
+
+        response = self.client.post(
+            AIRPORT_URL,
+            {
+                "name": "Humberto Delgado",
+                "cod_iata": "LIS",
+                "closest_big_city": city.id,
+                "latitude": 38.774167,
+                "longitude": -9.134167,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["time_zone"], existing.id)
+
+        response = self.client.post(
+            AIRPORT_URL,
+            {
+                "name": "Boryspil",
+                "cod_iata": "KBP",
+                "closest_big_city": city.id,
+                "latitude": 50.345,
+                "longitude": 30.894722,
+            },
+        )
+        airport = Airport.objects.get(cod_iata="KBP")
+        self.assertEqual(airport.time_zone.name, "Europe/Kyiv")
+
+    def test_create_airport_without_time_zone_and_coordinates(self):
+        city = City.objects.create(name="Lisbon", country=sample_country())
+
+        response = self.client.post(
+            AIRPORT_URL,
+            {
+                "name": "Portela",
+                "cod_iata": "LIS",
+                "closest_big_city": city.id,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("time_zone", response.data)
+
+    def test_admin_form_without_time_zone_and_coordinates(self):
+        client = Client()
+        client.force_login(self.user)
+        city = City.objects.create(name="Lisbon", country=sample_country())
+
+        response = client.post(
+            reverse("admin:airport_airport_add"),
+            {
+                "name": "Portela",
+                "cod_iata": "LIS",
+                "closest_big_city": city.id,
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "time zone or coordinates are required",
+            response.context["adminform"].form.errors["time_zone"],
+        )
+        self.assertFalse(Airport.objects.exists())
+
+    def test_assign_time_zones_command(self):
+        typo = AirportTimeZone.objects.create(name="Europe/Kiev ")
+        kyiv = sample_airport(
+            name="Boryspil",
+            cod_iata="KBP",
+            latitude=50.345,
+            longitude=30.894722,
+            time_zone=typo,
+        )
+        lisbon = sample_airport(
+            name="Humberto Delgado",
+            cod_iata="LIS",
+            latitude=38.774167,
+            longitude=-9.134167,
+            time_zone=typo,
+        )
+        without_coordinates = sample_airport(time_zone=typo)
+
+        out = StringIO()
+        # batch, time zones, new time zones, airports, next batch
+        # + airports & their routes to recompute flight times
+        with self.assertNumQueries(5 + 5):
+            call_command("assign_time_zones", stdout=out)
+
+        self.assertIn("Updated time zones of 2 airports", out.getvalue())
+        kyiv.refresh_from_db()
+        lisbon.refresh_from_db()
+        without_coordinates.refresh_from_db()
+        self.assertEqual(kyiv.time_zone.name, "Europe/Kyiv")
+        self.assertEqual(lisbon.time_zone.name, "Europe/Lisbon")
+        self.assertEqual(without_coordinates.time_zone, typo)
@@ -1,11 +1,19 @@
+from datetime import datetime, timezone as dt_timezone
+
 from rest_framework.reverse import reverse
 
 from airport.models import (
     Country,
+    City,
     AirportTimeZone,
+    Airport,
     AirplaneType,
+    AirlineCompany,
+    Airplane,
     Facility,
-    Role
+    Role,
+    Route,
+    Flight,
 )
 
 COUNTRY_URL = reverse("airport:country-list")
@@ -21,6 +29,11 @@ CREW_URL = reverse("airport:crew-list")
 ROUTE_URL = reverse("airport:route-list")
 FLIGHT_URL = reverse("airport:flight-list")
 ORDER_URL = reverse("airport:order-list")
+HOLD_URL = reverse("airport:seathold-list")
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
 
 
 def sample_country(**params):
@@ -61,3 +74,78 @@ def sample_role(**params):
     }
     defaults.update(params)
     return Role.objects.create(**defaults)
+
+
+def sample_airport(**params):
+    defaults = {
+        "name": "Eseiza",
+        "cod_iata": "EZE",
+    }
+    defaults.update(params)
+    if "closest_big_city" not in defaults:
+        defaults["closest_big_city"] = City.objects.get_or_create(
+            name="Buenos Aires",
+            country=Country.objects.get_or_create(name="Argentina")[0],
+        )[0]
+    if "time_zone" not in defaults:
+        defaults["time_zone"] = AirportTimeZone.objects.get_or_create(
+            name="America/Argentina/Buenos_Aires"
+        )[0]
+    return Airport.objects.create(**defaults)
+
+
+def sample_route(**params):
+    defaults = {
+        "distance": 10560,
+    }
+    defaults.update(params)
+    if "source" not in defaults:
+        defaults["source"] = sample_airport()
+    if "destination" not in defaults:
+        defaults["destination"] = sample_airport(
+            name="El Prat",
+            cod_iata="BCN",
+            closest_big_city=City.objects.get_or_create(
+                name="Barcelona",
+                country=Country.objects.get_or_create(name="Spain")[0],
+            )[0],
+            time_zone=AirportTimeZone.objects.get_or_create(
+                name="Europe/Madrid"
+            )[0],
+        )
+    return Route.objects.create(**defaults)
+
+
+def sample_airplane(**params):
+    defaults = {
+        "name": "Boeing 747",
+        "rows": 24,
+        "seats_in_row": 6,
+    }
+    defaults.update(params)
+    if "airplane_type" not in defaults:
+        defaults["airplane_type"] = AirplaneType.objects.get_or_create(
+            name="Passenger Jets"
+        )[0]
+    if "airline_company" not in defaults:
+        defaults["airline_company"] = AirlineCompany.objects.get_or_create(
+            name="Aerolineas Argentinas",
+            registration_country=Country.objects.get_or_create(
+                name="Argentina"
+            )[0],
+        )[0]
+    return Airplane.objects.create(**defaults)
+
+
+def sample_flight(**params):
+    defaults = {
+        "name": "AB - 007",
+        "departure_time": datetime(2025, 1, 7, 20, 55, 0),
+        "arrival_time": datetime(2025, 1, 8, 19, 45, 0),
+    }
+    defaults.update(params)
+    if "route" not in defaults:
+        defaults["route"] = sample_route()
+    if "airplane" not in defaults:
+        defaults["airplane"] = sample_airplane()
+    return Flight.objects.create(**defaults)
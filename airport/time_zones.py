@@ -0,0 +1,181 @@
+import threading
+import time as time_module
+from datetime import date, datetime
+from functools import lru_cache
+
+import pytz
+from timezonefinder import TimezoneFinder
+
+# ~100 m, airports closer than that share a time zone
+COORDINATE_DIGITS = 3
+
+_finder = None
+_finder_lock = threading.Lock()
+
+
+def _time_zone_at(latitude: float, longitude: float):
+    """
+    The finder loads its polygon data on creation (slow),
+    so one instance is created lazily and kept for the process
+    """
+    global _finder
+    with _finder_lock:
+        if _finder is None:
+            _finder = TimezoneFinder()
+        return _finder.timezone_at(lat=latitude, lng=longitude)
+
+
+@lru_cache(maxsize=65536)
+def _rounded_time_zone_name(latitude: float, longitude: float):
+    return _time_zone_at(latitude, longitude)
+
+
+def is_time_zone_name(name: str) -> bool:
+    """Name of a time zone of the IANA database (known to pytz)"""
+    return name in pytz.all_timezones_set
+
+
+def time_zone_name(latitude: float, longitude: float):
+    """IANA time zone name at the coordinates (None if not found)"""
+    return _rounded_time_zone_name(
+        round(latitude, COORDINATE_DIGITS), round(longitude, COORDINATE_DIGITS)
+    )
+
+
+# zones of routes changed by other processes are seen after it
+ZONE_CACHE_TTL = 300
+
+
+def to_utc(wall_clock: datetime, zone) -> datetime:
+    """
+    Digits of wall_clock are local time of the zone (its tzinfo is
+    ignored), DST is taken into account: ambiguous time (clocks back)
+    is read as standard time, non-existent (clocks forward) is shifted
+    """
+    local = zone.localize(wall_clock.replace(tzinfo=None))
+    return zone.normalize(local).astimezone(pytz.utc)
+
+
+def local_date(wall_clock: datetime) -> date:
+    """Local date of wall_clock (its digits are local time)"""
+    return wall_clock.replace(tzinfo=None).date()
+
+
+def offset_intervals(zone, start: datetime, end: datetime) -> list:
+    """
+    Wall-clock intervals [since, until) of the zone overlapping
+    [start, end] (naive) with the UTC offset to_utc() applies to times
+    inside them (None - unbounded). A transition starts at its wall-clock
+    time in the new offset, same as to_utc() resolves skipped & repeated
+    times of DST changes
+    """
+    transitions = getattr(zone, "_utc_transition_times", None)
+    if not transitions:
+        return [(None, None, zone.utcoffset(None))]
+
+    starts = []
+    for position, (utc_time, (offset, *_)) in enumerate(
+            zip(transitions, zone._transition_info)
+    ):
+        # first transition is at datetime.min (LMT)
+        since = utc_time + offset if position else None
+        if since is not None:
+            if since > end:
+                break
+            if since <= start:
+                starts.clear()
+        starts.append((since, offset))
+    untils = [since for since, _ in starts[1:]] + [None]
+    return [
+        (since, until, offset)
+        for (since, offset), until in zip(starts, untils)
+    ]
+
+
+class FlightZones:
+    """
+    Time zones of routes (source, destination), kept per process:
+    zone objects by AirportTimeZone id & zone ids by route id.
+    Dropped by Route/Airport/AirportTimeZone signals and every
+    ZONE_CACHE_TTL seconds
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._zones = {}
+        self._routes = {}
+        self._loaded_at = time_module.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._zones.clear()
+            self._routes.clear()
+            self._loaded_at = time_module.monotonic()
+
+    def forget(self, route_id: int = None, time_zone_id: int = None) -> None:
+        with self._lock:
+            self._routes.pop(route_id, None)
+            self._zones.pop(time_zone_id, None)
+
+    def route_zones(self, route_ids) -> dict:
+        """route id -> (source zone, destination zone), one query if missing"""
+        from airport.models import Route
+
+        with self._lock:
+            if time_module.monotonic() - self._loaded_at >= ZONE_CACHE_TTL:
+                self._zones.clear()
+                self._routes.clear()
+                self._loaded_at = time_module.monotonic()
+            missing = set(route_ids) - self._routes.keys()
+            if missing:
+                for route_id, *time_zones in Route.objects.filter(
+                        id__in=missing
+                ).values_list(
+                    "id",
+                    "source__time_zone_id",
+                    "source__time_zone__name",
+                    "destination__time_zone_id",
+                    "destination__time_zone__name",
+                ):
+                    (
+                        source_id,
+                        source_name,
+                        destination_id,
+                        destination_name,
+                    ) = time_zones
+                    self._zones.setdefault(
+                        source_id, pytz.timezone(source_name)
+                    )
+                    self._zones.setdefault(
+                        destination_id, pytz.timezone(destination_name)
+                    )
+                    self._routes[route_id] = (source_id, destination_id)
+            return {
+                route_id: (
+                    self._zones[self._routes[route_id][0]],
+                    self._zones[self._routes[route_id][1]],
+                )
+                for route_id in route_ids
+            }
+
+    def set_times_utc(self, flights) -> list:
+        """
+        Fill departure_time_utc & arrival_time_utc (and local dates)
+        of flights, for bulk_create (no save()) & Flight.save
+        """
+        zones = self.route_zones({flight.route_id for flight in flights})
+        for flight in flights:
+            source_zone, destination_zone = zones[flight.route_id]
+            # digits are local time, the date does not depend on the zone
+            flight.departure_local_date = local_date(flight.departure_time)
+            flight.arrival_local_date = local_date(flight.arrival_time)
+            flight.departure_time_utc = to_utc(
+                flight.departure_time, source_zone
+            )
+            flight.arrival_time_utc = to_utc(
+                flight.arrival_time, destination_zone
+            )
+        return flights
+
+
+flight_zones = FlightZones()
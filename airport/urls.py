@@ -13,8 +13,12 @@ from airport.views import (
     AirplaneViewSet,
     RouteViewSet,
     FlightViewSet,
+    FlightScheduleViewSet,
     OrderViewSet,
     AirportTimeZoneViewSet,
+    SeatHoldViewSet,
+    ReferenceImportView,
+    airport_board_events,
 )
 
 router = routers.DefaultRouter()
@@ -30,9 +34,23 @@ router.register("facilities", FacilityViewSet)
 router.register("airplanes", AirplaneViewSet)
 router.register("routes", RouteViewSet)
 router.register("flights", FlightViewSet)
+router.register("flight_schedules", FlightScheduleViewSet)
 router.register("orders", OrderViewSet)
+router.register("holds", SeatHoldViewSet)
 
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("", include(router.urls)),
+    path(
+        "import/<str:kind>/",
+        ReferenceImportView.as_view(),
+        name="reference-import",
+    ),
+    path(
+        "airports/<int:pk>/board/events/",
+        airport_board_events,
+        name="airport-board-events",
+    ),
+]
 
 app_name = "airport"
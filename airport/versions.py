@@ -0,0 +1,37 @@
+import time
+
+from django.core.cache import cache
+
+# versions are kept until changed (the cache must be shared
+# by all processes, see CACHES)
+VERSION_TIMEOUT = None
+
+
+def _key(model) -> str:
+    return f"airport:version:{model._meta.label_lower}"
+
+
+def _new_version() -> int:
+    # a lost counter (cache restart, eviction) starts from a value
+    # never used before, so old ETags do not match it
+    return time.time_ns()
+
+
+def bump_versions(*models) -> None:
+    """Mark data of the models as changed (save, delete, bulk queries)"""
+    for model in models:
+        try:
+            cache.incr(_key(model))
+        except ValueError:
+            cache.set(_key(model), _new_version(), VERSION_TIMEOUT)
+
+
+def model_versions(models) -> list:
+    """Current versions of the models, one cache query"""
+    keys = [_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), VERSION_TIMEOUT)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
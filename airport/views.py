@@ -1,8 +1,22 @@
+import io
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets, status
+from rest_framework import viewsets, status, mixins
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
 
 from airport.models import (
     Country,
@@ -16,8 +30,11 @@ from airport.models import (
     Airplane,
     Route,
     Flight,
+    FlightSchedule,
     Order,
+    Ticket,
     AirportTimeZone,
+    SeatHold,
 )
 from airport.serializers import (
     CountrySerializer,
@@ -25,6 +42,7 @@ from airport.serializers import (
     CityListSerializer,
     AirportSerializer,
     AirportListSerializer,
+    AirportBoardSerializer,
     RoleSerializer,
     CrewSerializer,
     CrewListSerializer,
@@ -42,17 +60,99 @@ from airport.serializers import (
     OrderListSerializer,
     OrderRetrieveSerializer,
     AirportTimeZoneSerializer, AirlineCompanyLogoSerializer,
+    FlightSeatMapSerializer,
+    SeatHoldSerializer,
+    ItinerarySerializer,
+    RoutePlanSerializer,
+    FlightScheduleSerializer,
+    sparse_fields,
 )
-
-
-class CountryViewSet(viewsets.ModelViewSet):
+from airport.board_events import event_stream
+from airport.boards import (
+    BOARD_DIRECTIONS,
+    BOARD_SIZE,
+    airport_boards,
+    board_rows,
+)
+from airport.booking import confirm_hold
+from airport.etags import ConditionalGetMixin
+from airport.exports import (
+    CONTENT_TYPES,
+    EXPORT_OUTPUTS,
+    FLIGHT_COLUMNS,
+    export_lines,
+    export_rows,
+)
+from airport.flight_rows import (
+    flight_row_data,
+    flight_rows,
+    flight_rows_supported,
+)
+from airport.importer import (
+    FORMATS,
+    KINDS,
+    ImportDataError,
+    import_reference_data,
+)
+from airport.itineraries import flight_index
+from airport.pagination import (
+    CURSOR_MAX_PAGE_SIZE,
+    CursorPaginationMixin,
+    FlightCursorPagination,
+    OrderCursorPagination,
+)
+from airport.route_planner import route_graph, WEIGHTS
+from airport.schedules import expand_schedule
+from airport.seat_map import SeatMap
+
+CURSOR_PARAMETERS = [
+    OpenApiParameter(
+        "pagination",
+        type=str,
+        enum=("cursor",),
+        description="Cursor pagination instead of limit & offset, "
+                    "next & previous pages by links (ex. /?pagination=cursor)"
+    ),
+    OpenApiParameter(
+        "cursor",
+        type=str,
+        description="Position of the page (from next & previous links)"
+    ),
+    OpenApiParameter(
+        "page_size",
+        type=int,
+        description="Cursor pagination page size "
+                    f"(up to {CURSOR_MAX_PAGE_SIZE})"
+    ),
+]
+
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type={"type": "list", "items": {"type": "string"}},
+        description="Only these fields in the response "
+                    "(ex. /?fields=id,name,departure_time)"
+    ),
+    OpenApiParameter(
+        "omit",
+        type={"type": "list", "items": {"type": "string"}},
+        description="All fields but these (ex. /?omit=crew_members)"
+    ),
+]
+
+
+class CountryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
+    etag_models = (Country,)
+    cache_responses = True
 
 
-class CityViewSet(viewsets.ModelViewSet):
+class CityViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = City.objects.all()
     serializer_class = CitySerializer
+    etag_models = (City, Country)
+    cache_responses = True
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -64,18 +164,27 @@ class CityViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class AirportTimeZoneViewSet(viewsets.ModelViewSet):
+class AirportTimeZoneViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = AirportTimeZone.objects.all()
     serializer_class = AirportTimeZoneSerializer
+    etag_models = (AirportTimeZone,)
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
+    etag_models = (Airport, City, Country, AirportTimeZone)
+    cache_responses = True
+    # terminal screens poll boards, no user is loaded
+    stateless_actions = ("board",)
+    # rate of board polls (ScopedRateThrottle of the action)
+    throttle_scope = "board"
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return AirportListSerializer
+        if self.action == "board":
+            return AirportBoardSerializer
         return AirportSerializer
 
     def get_queryset(self):
@@ -84,10 +193,76 @@ class AirportViewSet(viewsets.ModelViewSet):
         )
         return queryset
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "direction",
+                type=str,
+                enum=tuple(BOARD_DIRECTIONS),
+                description="Departures (default) or arrivals"
+            ),
+            OpenApiParameter(
+                "date",
+                type=str,
+                description="Flights of the local date of the airport "
+                            "(ex. /?date=2025-01-07), "
+                            f"next {BOARD_SIZE} flights by default"
+            ),
+        ]
+    )
+    @action(
+        methods=["get"],
+        detail=True,
+        url_path="board",
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def board(self, request, pk=None):
+        """
+        Get departures or arrivals of airport: next flights (cached,
+        updated on save of a flight) or flights of a local day
+        """
+        direction = request.query_params.get("direction", "departures")
+        if direction not in BOARD_DIRECTIONS:
+            raise ValidationError({
+                "direction": f"must be one of {list(BOARD_DIRECTIONS)}"
+            })
+        query_string = request.query_params.get("date")
+        if not query_string:
+            try:
+                board = airport_boards.next_flights(int(pk), direction)
+            except ValueError:
+                board = None
+            if board is None:
+                raise NotFound("No Airport matches the given query.")
+            cod_iata, flights = board
+            day = None
+        else:
+            try:
+                day = parse_date(query_string)
+            except ValueError:
+                day = None
+            if day is None:
+                raise ValidationError(
+                    {"date": f"invalid date: {query_string}"}
+                )
+            airport = self.get_object()
+            cod_iata = airport.cod_iata
+            flights = board_rows(airport.id, direction, day)
+
+        serializer = self.get_serializer({
+            "airport": cod_iata,
+            "direction": direction,
+            "date": day,
+            "flights": flights,
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
+    etag_models = (Role,)
+    cache_responses = True
 
 
 class CrewViewSet(viewsets.ModelViewSet):
@@ -104,9 +279,11 @@ class CrewViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
+    etag_models = (AirplaneType,)
+    cache_responses = True
 
 
 class AirlineCompanyViewSet(viewsets.ModelViewSet):
@@ -138,9 +315,11 @@ class AirlineCompanyViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class FacilityViewSet(viewsets.ModelViewSet):
+class FacilityViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Facility.objects.all()
     serializer_class = FacilitySerializer
+    etag_models = (Facility,)
+    cache_responses = True
 
 
 class AirplaneViewSet(viewsets.ModelViewSet):
@@ -169,6 +348,8 @@ class RouteViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return RouteListSerializer
+        if self.action == "plan":
+            return RoutePlanSerializer
         return RouteSerializer
 
     def get_queryset(self):
@@ -178,43 +359,204 @@ class RouteViewSet(viewsets.ModelViewSet):
         )
         return queryset
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "source",
+                type=str,
+                required=True,
+                description="Code IATA of source airport (ex. KBP)"
+            ),
+            OpenApiParameter(
+                "destination",
+                type=str,
+                required=True,
+                description="Code IATA of destination airport (ex. LIS)"
+            ),
+            OpenApiParameter(
+                "weight",
+                type=str,
+                enum=WEIGHTS,
+                description="Shortest by route distance (default) "
+                            "or by scheduled duration of flights"
+            ),
+        ]
+    )
+    @action(methods=["get"], detail=False, url_path="plan")
+    def plan(self, request):
+        """Get the shortest chain of routes between two airports"""
+        params = request.query_params
+        airport_ids = {}
+        for name in ("source", "destination"):
+            code = params.get(name, "").upper()
+            airport_ids[name] = route_graph.airport_id(code)
+            if airport_ids[name] is None:
+                raise ValidationError({name: f"unknown code IATA: {code}"})
+        if airport_ids["source"] == airport_ids["destination"]:
+            raise ValidationError(
+                {"destination": "destination must differ from source"}
+            )
+        weight = params.get("weight", WEIGHTS[0])
+        if weight not in WEIGHTS:
+            raise ValidationError({"weight": f"one of {', '.join(WEIGHTS)}"})
+
+        route_plan = route_graph.shortest_path(
+            airport_ids["source"], airport_ids["destination"], weight
+        )
+        if route_plan is None:
+            raise NotFound("no routes between these airports")
+        serializer = self.get_serializer(route_plan)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+MIN_CONNECTION_MINUTES = 45
+MAX_ITINERARIES = 50
+
+# fields of FlightListSerializer -> select_related paths they read
+FLIGHT_LIST_JOINS = {
+    "airline_company": ("airplane__airline_company",),
+    "source": ("route__source__closest_big_city",),
+    "destination": ("route__destination__closest_big_city",),
+    "airplane_name": ("airplane",),
+}
 
-class FlightViewSet(viewsets.ModelViewSet):
+
+class FlightViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    cursor_pagination_class = FlightCursorPagination
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return FlightListSerializer
+        if self.action == "seats":
+            return FlightSeatMapSerializer
+        if self.action == "itineraries":
+            return ItinerarySerializer
         return FlightSerializer
 
     @staticmethod
     def _params_to_ints(query_string: str) -> list:
         return [int(str_id) for str_id in query_string.split(",")]
 
+    @staticmethod
+    def _params_to_datetime(name: str, query_string: str) -> datetime:
+        """Datetime or date (start of the day), UTC if without offset"""
+        try:
+            value = parse_datetime(query_string)
+            if value is None and parse_date(query_string):
+                value = datetime.combine(parse_date(query_string), time.min)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError(
+                {name: f"invalid date or datetime: {query_string}"}
+            )
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        return value
+
+    @staticmethod
+    def _filter_companies(queryset, airline_companies_ids: list):
+        """
+        Flights of airplanes of the companies: the join by foreign keys
+        (flight -> airplane) can not repeat flights, so no DISTINCT
+        is needed (the airplane is joined for the list anyway)
+        """
+        return queryset.filter(
+            airplane__airline_company_id__in=airline_companies_ids
+        )
+
+    @staticmethod
+    def _upcoming(queryset):
+        """
+        Not completed flights departing from now, by departure (UTC):
+        served by the index of upcoming flights, completed history
+        is not read
+        """
+        return queryset.filter(
+            is_completed=False,
+            departure_time_utc__gte=timezone.now(),
+        ).order_by("departure_time_utc", "id")
+
+    @classmethod
+    def _search(cls, queryset, query_params):
+        """
+        Filter by source & destination airports (code IATA)
+        and departure time (UTC), served by the route/departure indexes
+        """
+        source = query_params.get("source")
+        if source:
+            queryset = queryset.filter(
+                route__source__cod_iata=source.upper()
+            )
+        destination = query_params.get("destination")
+        if destination:
+            queryset = queryset.filter(
+                route__destination__cod_iata=destination.upper()
+            )
+        date = query_params.get("date")
+        if date:
+            day_start = cls._params_to_datetime("date", date)
+            queryset = queryset.filter(
+                departure_time_utc__gte=day_start,
+                departure_time_utc__lt=day_start + timedelta(days=1),
+            )
+        departure_after = query_params.get("departure_after")
+        if departure_after:
+            queryset = queryset.filter(
+                departure_time_utc__gte=cls._params_to_datetime(
+                    "departure_after", departure_after
+                )
+            )
+        departure_before = query_params.get("departure_before")
+        if departure_before:
+            queryset = queryset.filter(
+                departure_time_utc__lt=cls._params_to_datetime(
+                    "departure_before", departure_before
+                )
+            )
+        return queryset
+
     def get_queryset(self):
         queryset = self.queryset
 
+        if self.action == "seats":
+            return queryset.select_related("airplane")
+
         if self.request.method == "GET":
             airline_companies_ids = self.request.query_params.get("companies")
             if airline_companies_ids:
                 airline_companies_ids = self._params_to_ints(
                     airline_companies_ids
                 )
-                queryset = queryset.filter(
-                    airplane__airline_company__id__in=airline_companies_ids
+                queryset = self._filter_companies(
+                    queryset, airline_companies_ids
                 )
+            queryset = self._search(queryset, self.request.query_params)
+            upcoming = self.request.query_params.get("upcoming", "")
+            if upcoming.lower() in ("true", "1"):
+                queryset = self._upcoming(queryset)
+
+        if self.action == "export":
+            return queryset.order_by("id")
 
-        if self.request.method in ("GET", "POST"):
-            queryset = queryset.select_related(
-                "route__source__closest_big_city",
-                "route__destination__closest_big_city",
-                "airplane__airplane_type",
-                "airplane__airline_company__registration_country",
+        if self.action in ("list", "retrieve"):
+            # only joins & prefetches of the fields in the response
+            fields = sparse_fields(
+                self.request.query_params, FlightListSerializer.Meta.fields
             )
-            queryset = queryset.prefetch_related("crew_members__role")
+            joins = {
+                path
+                for field in fields
+                for path in FLIGHT_LIST_JOINS.get(field, ())
+            }
+            if joins:
+                queryset = queryset.select_related(*joins)
+            if "crew_members" in fields:
+                queryset = queryset.prefetch_related("crew_members__role")
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -223,30 +565,242 @@ class FlightViewSet(viewsets.ModelViewSet):
                 type={"type": "list", "items": {"type": "number"}},
                 description="Filter by airline_company id "
                             "(ex. /?companies=1,3)"
-            )
+            ),
+            OpenApiParameter(
+                "source",
+                type=str,
+                description="Filter by code IATA of source airport "
+                            "(ex. /?source=KBP)"
+            ),
+            OpenApiParameter(
+                "destination",
+                type=str,
+                description="Filter by code IATA of destination airport "
+                            "(ex. /?destination=WAW)"
+            ),
+            OpenApiParameter(
+                "date",
+                type=str,
+                description="Filter by departure date, UTC "
+                            "(ex. /?date=2025-01-07)"
+            ),
+            OpenApiParameter(
+                "departure_after",
+                type=str,
+                description="Departure (UTC) from date or datetime "
+                            "(ex. /?departure_after=2025-01-07T06:00)"
+            ),
+            OpenApiParameter(
+                "departure_before",
+                type=str,
+                description="Departure (UTC) before date or datetime "
+                            "(ex. /?departure_before=2025-01-08)"
+            ),
+            OpenApiParameter(
+                "upcoming",
+                type=bool,
+                description="Only not completed flights departing from now, "
+                            "by departure (ex. /?upcoming=true)"
+            ),
+            *CURSOR_PARAMETERS,
+            *SPARSE_FIELDS_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         """
-        Get list of flights (optional: filtered by airline_company)
+        Get list of flights (optional: filtered by airline_company,
+        source & destination airports and departure time)
         """
         #  This is reflex in api-doc of list flights
-        return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if not flight_rows_supported(queryset):
+            return super().list(request, *args, **kwargs)
 
+        # rows of values() instead of model instances & the serializer
+        fields = sparse_fields(
+            request.query_params, FlightListSerializer.Meta.fields
+        )
+        rows = flight_rows(queryset, fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(flight_row_data(page, fields))
+        return Response(flight_row_data(rows, fields))
+
+    @extend_schema(parameters=SPARSE_FIELDS_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        """Get flight (optional: only some fields)"""
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(methods=["get"], detail=True, url_path="seats")
+    def seats(self, request, pk=None):
+        """
+        Get seat map of flight: taken, held & available seats
+        (bitmaps: one bit per seat, row-major, 1 - taken/held)
+        """
+        flight = self.get_object()
+        serializer = self.get_serializer(SeatMap.for_flight(flight))
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-class OrderViewSet(viewsets.ModelViewSet):
-    queryset = Order.objects.select_related(
-        "user", "tickets",
-        "tickets__flight",
-        "tickets__flight__airplane__airline_company__registration_country",
-        "tickets__flight__route__source",
-        "tickets__flight__route__destination",
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "source",
+                type=str,
+                required=True,
+                description="Code IATA of source airport (ex. KBP)"
+            ),
+            OpenApiParameter(
+                "destination",
+                type=str,
+                required=True,
+                description="Code IATA of destination airport (ex. LIS)"
+            ),
+            OpenApiParameter(
+                "date",
+                type=str,
+                required=True,
+                description="Departure date, UTC (ex. 2025-01-07)"
+            ),
+            OpenApiParameter(
+                "min_connection",
+                type=int,
+                description="Minimal connection time, minutes "
+                            f"(default {MIN_CONNECTION_MINUTES})"
+            ),
+            OpenApiParameter(
+                "max_stops",
+                type=int,
+                description="Maximal number of stops: 0, 1 or 2 (default 2)"
+            ),
+        ]
     )
+    @action(methods=["get"], detail=False, url_path="itineraries")
+    def itineraries(self, request):
+        """
+        Get direct flights & connections with up to 2 stops
+        departing on the date, ordered by total duration
+        """
+        params = request.query_params
+        codes = {}
+        for name in ("source", "destination"):
+            if not params.get(name):
+                raise ValidationError({name: "code IATA is required"})
+            codes[name] = params[name].upper()
+        if not params.get("date"):
+            raise ValidationError({"date": "date is required"})
+        day = self._params_to_datetime("date", params["date"]).date()
+        numbers = {}
+        for name, default in (
+                ("min_connection", MIN_CONNECTION_MINUTES),
+                ("max_stops", 2),
+        ):
+            try:
+                numbers[name] = int(params.get(name, default))
+            except ValueError:
+                raise ValidationError({name: "must be an integer"})
+        # a connection never departs before the arrival
+        min_connection = max(numbers["min_connection"], 0)
+        max_stops = min(max(numbers["max_stops"], 0), 2)
+
+        airport_ids = dict(
+            Airport.objects.filter(
+                cod_iata__in=codes.values()
+            ).values_list("cod_iata", "id")
+        )
+        itineraries = []
+        if len(airport_ids) == len(set(codes.values())):
+            itineraries = flight_index.find_itineraries(
+                airport_ids[codes["source"]],
+                airport_ids[codes["destination"]],
+                day,
+                timedelta(minutes=min_connection),
+                max_stops,
+            )[:MAX_ITINERARIES]
+
+        airport_codes = dict(
+            Airport.objects.filter(id__in={
+                airport_id
+                for itinerary in itineraries
+                for leg in itinerary.legs
+                for airport_id in (leg.source_id, leg.destination_id)
+            }).values_list("id", "cod_iata")
+        )
+        serializer = self.get_serializer(
+            itineraries,
+            many=True,
+            context={**self.get_serializer_context(),
+                     "airport_codes": airport_codes},
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                type=str,
+                enum=EXPORT_OUTPUTS,
+                description="ndjson (default, one JSON object per line) "
+                            "or csv; filters are the same as of the list"
+            ),
+        ],
+        responses={200: str},
+    )
+    @action(methods=["get"], detail=False, url_path="export")
+    def export(self, request):
+        """
+        Export all flights (optional: filtered as the list) at once,
+        streamed in chunks without pagination
+        """
+        output = request.query_params.get("output", "ndjson")
+        if output not in EXPORT_OUTPUTS:
+            raise ValidationError(
+                {"output": f"one of: {', '.join(EXPORT_OUTPUTS)}"}
+            )
+        rows = export_rows(self.get_queryset(), FLIGHT_COLUMNS)
+        response = StreamingHttpResponse(
+            export_lines(output, rows, FLIGHT_COLUMNS),
+            content_type=CONTENT_TYPES[output],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="flights.{output}"'
+        )
+        return response
+
+
+class FlightScheduleViewSet(viewsets.ModelViewSet):
+    queryset = FlightSchedule.objects.prefetch_related("crew_members")
+    serializer_class = FlightScheduleSerializer
+
+    @extend_schema(request=None, responses={201: dict})
+    @action(methods=["post"], detail=True, url_path="expand")
+    def expand(self, request, pk=None):
+        """
+        Create flights of the schedule (flights created before are kept)
+        """
+        created = expand_schedule(self.get_object())
+        return Response({"created": created}, status=status.HTTP_201_CREATED)
+
+
+class OrderViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
+    cursor_pagination_class = OrderCursorPagination
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        queryset = self.queryset.filter(user=self.request.user)
+        # tickets of all orders in one query, with everything
+        # the serializer shows joined: queries do not depend on tickets
+        if self.action == "retrieve":
+            return queryset.prefetch_related(Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "flight__airplane__airline_company",
+                    "flight__route__source__closest_big_city__country",
+                    "flight__route__destination__closest_big_city__country",
+                ),
+            ))
+        return queryset.prefetch_related("tickets")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -257,3 +811,132 @@ class OrderViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @extend_schema(parameters=CURSOR_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        """Get list of orders of the user, the newest first"""
+        return super().list(request, *args, **kwargs)
+
+
+class SeatHoldViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Hold seats of a flight for some minutes before ordering,
+    confirm hold to convert it into an order
+    """
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return SeatHold.objects.filter(
+            user=self.request.user
+        ).prefetch_related("seats")
+
+    def get_serializer_class(self):
+        if self.action == "confirm":
+            return OrderSerializer
+        return SeatHoldSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @action(methods=["post"], detail=True, url_path="confirm")
+    def confirm(self, request, pk=None):
+        order = confirm_hold(self.get_object())
+        serializer = self.get_serializer(order)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ReferenceImportView(APIView):
+    """
+    Create or update reference data from uploaded CSV (with header)
+    or JSON lines file, rows are matched by natural keys
+    (country name, city & country, cod_iata, company name, ...)
+    """
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "kind",
+                type=str,
+                location=OpenApiParameter.PATH,
+                enum=tuple(KINDS),
+            ),
+        ],
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "file": {"type": "string", "format": "binary"},
+                    "data_format": {"type": "string", "enum": FORMATS},
+                },
+            }
+        },
+        responses={200: dict},
+    )
+    def post(self, request, kind):
+        if kind not in KINDS:
+            raise NotFound(f"unknown kind of data: {kind}")
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "file is required"})
+        data_format = request.data.get("data_format") or (
+            upload.name.rsplit(".", 1)[-1].lower()
+        )
+        if data_format not in FORMATS:
+            raise ValidationError(
+                {"data_format": f"one of {', '.join(FORMATS)}"}
+            )
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        try:
+            importer = import_reference_data(kind, stream, data_format)
+        except ImportDataError as error:
+            raise ValidationError({"file": str(error)})
+        return Response(
+            {"created": importer.created, "updated": importer.updated},
+            status=status.HTTP_200_OK,
+        )
+
+
+@require_GET
+async def airport_board_events(request, pk: int):
+    """
+    Live board of airport (ASGI): Server-Sent Events of its flights
+    saved or deleted in this process (times, completion, moves).
+    The access token is sent in the Authorization header or in the
+    "token" parameter (EventSource can not send headers), it is
+    checked without loading the user; the stream ends when it expires
+    """
+    header = request.headers.get("Authorization", "").split()
+    raw_token = (
+        header[1] if len(header) == 2 and header[0] == "Bearer"
+        else request.GET.get("token", "")
+    )
+    try:
+        token = AccessToken(raw_token)
+    except TokenError:
+        return JsonResponse(
+            {"detail": "Given token not valid for any token type"},
+            status=status.HTTP_401_UNAUTHORIZED,
+        )
+    if not await Airport.objects.filter(id=pk).aexists():
+        return JsonResponse(
+            {"detail": "No Airport matches the given query."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    response = StreamingHttpResponse(
+        event_stream(pk, token["exp"]), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # no buffering by nginx
+    response["X-Accel-Buffering"] = "no"
+    return response
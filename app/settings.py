@@ -161,7 +161,12 @@ REST_FRAMEWORK = {
         "rest_framework.throttling.AnonRateThrottle",
         "rest_framework.throttling.UserRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/day",
+        "user": "30/day",
+        # boards are polled by terminal screens (every few seconds)
+        "board": "60/min",
+    },
 
     "DEFAULT_PERMISSION_CLASSES": (
         "airport.permissions.IsAdminAllOrIfAuthenticatedReadOnly",
@@ -183,6 +188,29 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Shared cache (ex. Redis) in production: versions of reference data
+# (ETags) & cached responses must be seen by all processes
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+# Rendered responses of reference data (countries, cities, airports...)
+# are cached for the seconds, 0 - not cached
+RESPONSE_CACHE_SECONDS = int(os.environ.get("RESPONSE_CACHE_SECONDS", 0))
+
+# Boards of next flights of airports are kept in the cache for the seconds
+# (updated on save of a flight, the timeout refreshes names & others)
+BOARD_CACHE_SECONDS = int(os.environ.get("BOARD_CACHE_SECONDS", 30))
+
+# Seat holds: default and max time to keep seats before order (minutes)
+SEAT_HOLD_MINUTES = 10
+SEAT_HOLD_MAX_MINUTES = 30
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),